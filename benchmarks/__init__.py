@@ -0,0 +1,3 @@
+"""
+Headless performance benchmarks - run with python -m benchmarks.<name> from the repo root
+"""
@@ -0,0 +1,160 @@
+"""
+Activity window check - sleeping off-screen entities must not change the game
+
+Every level, a generated one and a wide hand-laid one crowded with enemies
+are played at every difficulty twice from the same seeded input script: once with everything awake
+(activity_margin=None) and once with the default ACTIVITY_MARGIN. The
+player's position, health and the game state are folded into a running
+hash each tick, and the runs must also end on the same state_digest().
+Ticks/sec of both runs are reported alongside. Generated levels only
+stream in the chunks near the camera, so the wide level, which has every
+enemy loaded at once, is the one that shows what sleeping saves.
+
+The patrol fast-forward is also checked on its own: random enemies are
+advanced many ticks at once with EnemyPool._advance and compared with the
+same enemies stepped one EnemyPool.update() at a time.
+
+    python -m benchmarks.activity                  # check and time everything
+    python -m benchmarks.activity --ticks 6000 --patrols 50000
+"""
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+
+# Set before pygame is imported
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+DIFFICULTIES = ("EASY", "MEDIUM", "HARD")
+DEFAULT_TICKS = 3000
+DEFAULT_PATROLS = 1000
+GENERATED_WIDTH = 30000
+WIDE_WIDTH = 40000
+WIDE_ENEMY_SPACING = 40  # A thousand enemies across WIDE_WIDTH
+PATROL_COLUMNS = ("x", "direction", "attack_cooldown", "is_attacking",
+                  "attack_timer", "is_charging", "charge_timer")
+
+
+def play(level_num, difficulty, margin, ticks, seed=0, spec=None):
+    """Play one level with the given activity margin; (trace hash, final digest, ticks/sec)"""
+    from benchmarks.scenarios import scripted_inputs
+    from src.simulation import Simulation
+
+    sim = Simulation(difficulty)
+    sim.level.activity_margin = margin
+    if spec is not None:
+        sim.level.load_spec(spec)
+        level_num = None
+    sim.restart(level_num)
+    inputs = scripted_inputs(seed)
+    trace = hashlib.sha1()
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if sim.state != "PLAYING":
+            # Died or finished: start the level over, as the scenarios do
+            sim.restart(level_num)
+        sim.step(next(inputs))
+        trace.update(repr((sim.player.rect.topleft, sim.player.health, sim.state)).encode())
+    elapsed = time.perf_counter() - start
+    return trace.hexdigest(), sim.state_digest(), ticks / elapsed
+
+
+def wide_level(difficulty):
+    """LevelSpec of a long flat level with an enemy every WIDE_ENEMY_SPACING pixels"""
+    from src.constants import SCREEN_HEIGHT
+    from src.enemy import Enemy
+    from src.level_loader import compile_spec
+
+    ground = SCREEN_HEIGHT - 40
+    abilities = list(Enemy.TYPE_SETTINGS)
+    enemies = [{"x": x, "y": ground - 60, "patrol": [x - 100, x + 100],
+                "ability": abilities[i % len(abilities)]}
+               for i, x in enumerate(range(1000, WIDE_WIDTH - 500, WIDE_ENEMY_SPACING))]
+    data = {"name": "Wide", "width": WIDE_WIDTH,
+            "platforms": [[0, ground, WIDE_WIDTH, 40]] +
+                         [[x, ground - 120, 150, 20] for x in range(600, WIDE_WIDTH, 700)],
+            "enemies": enemies,
+            "checkpoints": [[x, ground - 64] for x in range(2000, WIDE_WIDTH, 2000)],
+            "goal": [WIDE_WIDTH - 150, ground - 40, 40, 40]}
+    return compile_spec(data, difficulty=difficulty)
+
+
+def check_patrols(trials, seed=0):
+    """Number of random enemies whose fast-forward disagrees with ticking them one by one"""
+    from src.enemy import Enemy
+    from src.enemy_pool import EnemyPool
+
+    rng = random.Random(seed)
+    mismatches = 0
+    for _ in range(trials):
+        left = rng.randint(-300, 400)
+        right = left + rng.randint(-20, 400)
+        x = rng.randint(left - 80, right + 40)
+        enemy = dict(patrol_left=left, patrol_right=right, difficulty=rng.choice(DIFFICULTIES),
+                     ability_type=rng.choice(list(Enemy.TYPE_SETTINGS)))
+        state = dict(direction=rng.choice([1, -1]), attack_cooldown=rng.randint(0, 90),
+                     is_attacking=rng.random() < 0.5, attack_timer=rng.randint(0, 35),
+                     is_charging=rng.random() < 0.4, charge_timer=rng.randint(-2, 30))
+        stepped, advanced = EnemyPool(), EnemyPool()
+        for pool in (stepped, advanced):
+            pool.add(Enemy(x, 300, **enemy))
+            for column, value in state.items():
+                pool.set(column, 0, value)
+        ticks = rng.choice([1, 2, 3, 17, 250, rng.randint(1, 5000)])
+        for _ in range(ticks):
+            stepped.update()
+        advanced._advance(0, ticks)
+        if [stepped.get(c, 0) for c in PATROL_COLUMNS] != [advanced.get(c, 0) for c in PATROL_COLUMNS]:
+            mismatches += 1
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS, help="ticks per level")
+    parser.add_argument("--seed", type=int, default=0, help="input script and patrol seed")
+    parser.add_argument("--patrols", type=int, default=DEFAULT_PATROLS,
+                        help="random enemies for the fast-forward check (0 to skip)")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from src.constants import ACTIVITY_MARGIN
+    from src.level_loader import level_count
+    from src.procgen import generated_level
+
+    runs = [(f"level{n}-{d}", n, d, None) for n in range(1, level_count() + 1) for d in DIFFICULTIES]
+    runs += [(f"generated-{d}", None, d, generated_level(args.seed, GENERATED_WIDTH, d))
+             for d in DIFFICULTIES]
+    runs += [(f"wide-{d}", None, d, wide_level(d)) for d in DIFFICULTIES]
+
+    print(f"{'level':<20}{'awake t/s':>11}{'window t/s':>12}{'speedup':>9}  result")
+    failed = []
+    for name, level_num, difficulty, spec in runs:
+        awake = play(level_num, difficulty, None, args.ticks, args.seed, spec)
+        window = play(level_num, difficulty, ACTIVITY_MARGIN, args.ticks, args.seed, spec)
+        same = awake[:2] == window[:2]
+        if not same:
+            failed.append(name)
+        print(f"{name:<20}{awake[2]:>11.0f}{window[2]:>12.0f}{window[2] / awake[2]:>8.2f}x  "
+              f"{'same' if same else 'DIFFERENT'}", flush=True)
+
+    if args.patrols:
+        mismatches = check_patrols(args.patrols, args.seed)
+        print(f"patrol fast-forward: {mismatches} of {args.patrols} random enemies differ")
+        if mismatches:
+            failed.append("patrol fast-forward")
+
+    if failed:
+        print(f"Activity window changed the game: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
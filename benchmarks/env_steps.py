@@ -0,0 +1,60 @@
+"""
+Environment throughput - env-steps per second of VectorEnv, in-process and with worker processes
+
+Random actions drive N environments for a fixed number of vector steps;
+finished episodes reset themselves as they would in training.
+
+    python -m benchmarks.env_steps                       # 8 envs, in-process and 1..cpu workers
+    python -m benchmarks.env_steps --envs 32 --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+
+# Set before pygame is imported, here and in every worker process
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+DEFAULT_ENVS = 8
+DEFAULT_STEPS = 1000
+
+
+def measure(num_envs, workers, steps, level=1, difficulty="MEDIUM", seed=0):
+    """env-steps/sec over `steps` vector steps"""
+    import numpy as np
+    from src.env import VectorEnv, ACTIONS
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, len(ACTIONS), size=(steps, num_envs))
+    with VectorEnv(num_envs, {"level": level, "difficulty": difficulty}, workers=workers) as env:
+        env.reset()
+        start = time.perf_counter()
+        for a in actions:
+            env.step(a)
+        elapsed = time.perf_counter() - start
+    return steps * num_envs / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--envs", type=int, default=DEFAULT_ENVS, help="environments")
+    parser.add_argument("--steps", type=int, default=DEFAULT_STEPS, help="vector steps to time")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        help="worker process counts to try, 0 for in-process (default: 0 and 1..cpus)")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--difficulty", default="MEDIUM")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    worker_counts = args.workers or [0] + sorted({1, os.cpu_count() // 2 or 1, os.cpu_count()})
+    print(f"{'workers':<10}{'env-steps/s':>12}")
+    for workers in worker_counts:
+        rate = measure(args.envs, workers, args.steps, args.level, args.difficulty)
+        print(f"{workers or 'in-proc':<10}{rate:>12.0f}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Batch episodes - thousands of headless level attempts across a process pool, for balance tuning
+
+Every level is attempted at every difficulty by automatic agents. Each
+episode starts from the level's first tick and ends at the goal, at a game
+over, or after --max-ticks. The summary answers the questions tuning
+DIFFICULTY_SETTINGS, Enemy.TYPE_SETTINGS or boss health raises: how often
+is the level finished, what kills the player, how long until the boss
+shows up, and how long the fight lasts.
+
+Agents:
+    scripted  mostly runs right, jumping and attacking on a rhythm
+              (the input script the scenario benchmarks use)
+    random    random walk: holds a random direction for a random while,
+              biased to the right, with random jumps and attacks
+
+    python -m benchmarks.episodes                          # 100 per level x difficulty
+    python -m benchmarks.episodes --episodes 1000 --agent random
+    python -m benchmarks.episodes --levels 3 --difficulties HARD --json hard3.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+
+# Set before pygame is imported, here and in every worker process
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+AGENTS = ("scripted", "random")
+DIFFICULTIES = ("EASY", "MEDIUM", "HARD")
+DEFAULT_EPISODES = 100  # Per level x difficulty x agent
+DEFAULT_MAX_TICKS = 60 * 180  # Three minutes of game time
+RANDOM_WALK_RIGHT = 0.7  # Chance a random-walk stretch heads right
+
+
+def random_walk_inputs(seed):
+    """Endless random input: held directions of random length, random presses"""
+    from src.inputs import InputState
+    rng = random.Random(seed)
+    while True:
+        roll = rng.random()
+        right = roll < RANDOM_WALK_RIGHT
+        left = not right and roll < RANDOM_WALK_RIGHT + (1 - RANDOM_WALK_RIGHT) * 0.7
+        for _ in range(rng.randint(5, 60)):
+            yield InputState(left=left, right=right,
+                             jump=rng.random() < 0.05, attack=rng.random() < 0.05)
+
+
+def agent_inputs(agent, seed):
+    if agent == "scripted":
+        from benchmarks.scenarios import scripted_inputs
+        return scripted_inputs(seed)
+    return random_walk_inputs(seed)
+
+
+# Simulations kept by each worker process, one per difficulty, and warm
+# restarted for every episode instead of rebuilt
+_sims = {}
+
+
+def _simulation(difficulty):
+    sim = _sims.get(difficulty)
+    if sim is None:
+        from src.simulation import Simulation
+        # Episodes end at the goal, so building the next level would be wasted
+        sim = _sims[difficulty] = Simulation(difficulty, preload=False)
+    return sim
+
+
+def run_episode(task):
+    """Play one episode in this process; task is (level, difficulty, agent, seed, max_ticks)"""
+    from src.constants import SCREEN_WIDTH
+    level_num, difficulty, agent, seed, max_ticks = task
+    sim = _simulation(difficulty)
+    sim.restart(level_num)
+    inputs = agent_inputs(agent, seed)
+    boss = sim.level.boss
+    boss_seen = boss_defeated = None  # Ticks at which each happened
+
+    state = "PLAYING"
+    while state == "PLAYING" and sim.tick < max_ticks:
+        state = sim.step(next(inputs))
+        if boss:
+            if boss_seen is None and boss.rect.left < sim.camera_x + SCREEN_WIDTH:
+                boss_seen = sim.tick
+            if boss_defeated is None and boss.is_defeated():
+                boss_defeated = sim.tick
+
+    if state in ("LOADING", "GAME_COMPLETE"):
+        outcome = "complete"
+    elif state == "GAME_OVER":
+        outcome = "death"
+    else:
+        outcome = "timeout"
+    return {
+        "level": level_num,
+        "difficulty": difficulty,
+        "agent": agent,
+        "seed": seed,
+        "outcome": outcome,
+        "ticks": sim.tick,
+        "death_cause": sim.death_cause,
+        "time_to_boss": boss_seen,
+        "boss_fight": boss_defeated - boss_seen if boss_seen is not None and boss_defeated else None,
+    }
+
+
+def tasks(levels, difficulties, agents, episodes, max_ticks, seed=0):
+    """One task per episode; episode seeds are distinct and reproducible"""
+    result = []
+    for level_num in levels:
+        for difficulty in difficulties:
+            for agent in agents:
+                for i in range(episodes):
+                    result.append((level_num, difficulty, agent, seed * 1_000_003 + i, max_ticks))
+    return result
+
+
+def _median(values):
+    return statistics.median(values) if values else None
+
+
+def summarize(results):
+    """Aggregate episodes into one row per (level, difficulty, agent), in that order"""
+    groups = {}
+    for r in results:
+        groups.setdefault((r["level"], r["difficulty"], r["agent"]), []).append(r)
+    rows = []
+    for (level_num, difficulty, agent), episodes in sorted(
+            groups.items(), key=lambda item: (item[0][0], DIFFICULTIES.index(item[0][1]), item[0][2])):
+        outcomes = Counter(r["outcome"] for r in episodes)
+        rows.append({
+            "level": level_num,
+            "difficulty": difficulty,
+            "agent": agent,
+            "episodes": len(episodes),
+            "completion_rate": outcomes["complete"] / len(episodes),
+            "timeout_rate": outcomes["timeout"] / len(episodes),
+            "deaths": dict(Counter(r["death_cause"] for r in episodes if r["outcome"] == "death")),
+            "median_ticks_to_complete": _median([r["ticks"] for r in episodes if r["outcome"] == "complete"]),
+            "median_time_to_boss": _median([r["time_to_boss"] for r in episodes
+                                            if r["time_to_boss"] is not None]),
+            "median_boss_fight": _median([r["boss_fight"] for r in episodes
+                                          if r["boss_fight"] is not None]),
+        })
+    return rows
+
+
+def _seconds(ticks):
+    from src.constants import SIM_DT
+    return "-" if ticks is None else f"{ticks * SIM_DT:.1f}"
+
+
+def format_table(rows, causes):
+    lines = [f"{'level':<6}{'diff':<8}{'agent':<10}{'eps':>6}{'done':>7}{'t/out':>7}"
+             + "".join(f"{cause:>9}" for cause in causes)
+             + f"{'finish s':>10}{'boss s':>8}{'fight s':>9}"]
+    for row in rows:
+        lines.append(f"{row['level']:<6}{row['difficulty']:<8}{row['agent']:<10}{row['episodes']:>6}"
+                     f"{row['completion_rate']:>7.0%}{row['timeout_rate']:>7.0%}"
+                     + "".join(f"{row['deaths'].get(cause, 0):>9}" for cause in causes)
+                     + f"{_seconds(row['median_ticks_to_complete']):>10}"
+                     f"{_seconds(row['median_time_to_boss']):>8}{_seconds(row['median_boss_fight']):>9}")
+    return lines
+
+
+def run(task_list, workers):
+    """Run every task across `workers` processes; returns results in task order"""
+    ctx = multiprocessing.get_context("spawn")
+    chunksize = max(1, len(task_list) // (workers * 8))
+    with ctx.Pool(workers) as pool:
+        return pool.map(run_episode, task_list, chunksize=chunksize)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--episodes", type=int, default=DEFAULT_EPISODES,
+                        help="episodes per level, difficulty and agent")
+    parser.add_argument("--agent", choices=AGENTS + ("all",), default="all")
+    parser.add_argument("--levels", type=int, nargs="+", help="level numbers (default: all)")
+    parser.add_argument("--difficulties", nargs="+", choices=DIFFICULTIES, default=list(DIFFICULTIES))
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS,
+                        help="ticks before an episode counts as a timeout")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="base seed for the episodes' agents")
+    parser.add_argument("--json", metavar="PATH", help="also write the summary and every episode to PATH")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from src.enemy import Enemy
+    from src.level_loader import level_count
+
+    levels = args.levels or range(1, level_count() + 1)
+    agents = AGENTS if args.agent == "all" else (args.agent,)
+    task_list = tasks(levels, args.difficulties, agents, args.episodes, args.max_ticks, args.seed)
+    print(f"{len(task_list)} episodes on {args.workers} workers", flush=True)
+
+    start = time.perf_counter()
+    results = run(task_list, args.workers)
+    elapsed = time.perf_counter() - start
+
+    rows = summarize(results)
+    causes = list(Enemy.TYPE_SETTINGS) + ["boss"]
+    print("\n".join(format_table(rows, causes)))
+    total_ticks = sum(r["ticks"] for r in results)
+    print(f"{total_ticks} ticks in {elapsed:.1f} s ({total_ticks / elapsed:.0f} ticks/s)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": rows, "episodes": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
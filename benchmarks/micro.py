@@ -0,0 +1,290 @@
+"""
+Microbenchmarks - isolated timings of the functions that run per entity per tick
+
+Each case builds its fixture from level 1 at MEDIUM (the SDL dummy driver
+means no window is opened) and times one function. The function is called
+`number` times per round, for `repeat` rounds. Cases that change their own
+inputs, such as a collision that moves the player, restore them before
+every call. Those calls are timed one at a time, and the measured timer
+overhead is subtracted. Results are nanoseconds per call, summarised as
+min/median/mean/stdev over rounds.
+
+    python -m benchmarks.micro                  # table
+    python -m benchmarks.micro --json out.json  # machine-readable
+    python -m benchmarks.micro --filter Player
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# Set before pygame is imported
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+DEFAULT_NUMBER = 2000
+DEFAULT_REPEAT = 7
+DRAW_NUMBER = 200  # Level.draw is ~1000x slower than the rest
+CAMERA_OFFSETS = (0, 700, 1400, 2200)
+
+
+class Case:
+    """One benchmark: setup() returns (fn, reset); reset may be None"""
+    def __init__(self, name, setup, number=DEFAULT_NUMBER):
+        self.name = name
+        self.setup = setup
+        self.number = number
+
+
+def _timer_overhead(samples=20000):
+    """Median cost of an empty perf_counter_ns pair, in ns"""
+    clock = time.perf_counter_ns
+    costs = []
+    for _ in range(samples):
+        t0 = clock()
+        costs.append(clock() - t0)
+    return statistics.median(costs)
+
+
+def _round(fn, reset, number, overhead):
+    """Mean ns per call over one round"""
+    clock = time.perf_counter_ns
+    if reset is None:
+        t0 = clock()
+        for _ in range(number):
+            fn()
+        return (clock() - t0) / number
+    total = 0
+    for _ in range(number):
+        reset()
+        t0 = clock()
+        fn()
+        total += clock() - t0
+    return max(0.0, total / number - overhead)
+
+
+def measure(case, repeat=DEFAULT_REPEAT, overhead=0.0):
+    fn, reset = case.setup()
+    _round(fn, reset, max(1, case.number // 10), overhead)  # Warm up caches
+    rounds = [_round(fn, reset, case.number, overhead) for _ in range(repeat)]
+    return {
+        "name": case.name,
+        "number": case.number,
+        "repeat": repeat,
+        "min_ns": min(rounds),
+        "median_ns": statistics.median(rounds),
+        "mean_ns": statistics.fmean(rounds),
+        "stdev_ns": statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+    }
+
+
+# ---------------------------------------------------------------- fixtures
+
+def _world():
+    from src.level import Level
+    from src.player import Player
+    return Level("MEDIUM"), Player(64, 300, "MEDIUM")
+
+
+def _collision_case(topleft, velocity):
+    """Player.check_collision against a 200x20 platform at (100, 300)"""
+    def setup():
+        from src.platform import Platform
+        _, player = _world()
+        platform = Platform(100, 300, 200, 20)
+
+        def reset():
+            player.rect.topleft = topleft
+            player.velocity_x, player.velocity_y = velocity
+        return (lambda: player.check_collision(platform)), reset
+    return setup
+
+
+# Player is 32x32: each position/velocity pair reaches a different branch
+COLLISION_CASES = {
+    "land_from_above": ((150, 273), (0, 5)),
+    "hit_from_below": ((150, 315), (0, -5)),
+    "side_moving_left": ((72, 294), (-5, 0)),
+    "side_moving_right": ((296, 294), (5, 0)),
+    "overlap_unresolved": ((72, 294), (0, 0)),
+    "no_overlap": ((500, 100), (0, 5)),
+}
+
+
+def _player_update_case(velocity, on_ground=False, facing_right=True, attacking=False):
+    def setup():
+        _, player = _world()
+
+        def reset():
+            player.rect.topleft = (400, 300)
+            player.velocity_x, player.velocity_y = velocity
+            player.on_ground = on_ground
+            player.facing_right = facing_right
+            player.attacking = attacking
+        return player.update, reset
+    return setup
+
+
+PLAYER_STATES = {
+    "idle": dict(velocity=(0, 0), on_ground=True),
+    "running_right": dict(velocity=(5, 0), on_ground=True),
+    "running_left": dict(velocity=(-5, 0), on_ground=True, facing_right=False),
+    "jumping": dict(velocity=(0, -10)),
+    "falling": dict(velocity=(0, 5)),
+    "attacking": dict(velocity=(0, 0), on_ground=True, attacking=True),
+}
+
+
+def _enemy_update_case(direction):
+    def setup():
+        from src.enemy import Enemy
+        enemy = Enemy(500, 300, patrol_left=0, patrol_right=5000)
+
+        def reset():
+            enemy.rect.x = 500
+            enemy.direction = direction
+        return enemy.update, reset
+    return setup
+
+
+def _attack_rect_case(ability, attacking, charging=False):
+    def setup():
+        from src.enemy import Enemy
+        enemy = Enemy(500, 300, ability_type=ability)
+        enemy.is_attacking = attacking
+        enemy.is_charging = charging
+        return enemy.get_attack_rect, None
+    return setup
+
+
+def _pool_update_case(count, awake=None):
+    """EnemyPool.update, the batched path the game actually runs, for count enemies.
+
+    With awake, an activity window leaves only that many of them awake.
+    """
+    def setup():
+        from src.enemy import Enemy
+        from src.enemy_pool import EnemyPool
+        pool = EnemyPool()
+        for i in range(count):
+            x = 100 + i * 40
+            if awake is None:
+                pool.add(Enemy(x, 300, patrol_left=0, patrol_right=100000, enemy_type=i))
+            else:
+                pool.add(Enemy(x, 300, patrol_left=x - 10, patrol_right=x + 50, enemy_type=i))
+        if awake is not None:
+            pool.set_window(0, 100 + awake * 40 - 64)
+        return pool.update, None
+    return setup
+
+
+def _projectile_update_case(live):
+    """ProjectilePool.update with `live` shots in flight through the level"""
+    def setup():
+        import numpy as np
+        from src.projectile import ProjectilePool
+        level, _ = _world()
+        pool = ProjectilePool()
+        for i in range(live):
+            pool.spawn(200 + (i * 37) % 700, 80 + (i * 13) % 100, direction=1 if i % 2 else -1, speed=4)
+        saved = {name: getattr(pool, name).copy() for name in ("x", "lifetime", "alive")}
+        free = list(pool._free)
+
+        def reset():
+            for name, values in saved.items():
+                np.copyto(getattr(pool, name), values)
+            pool._free[:] = free
+        return (lambda: pool.update(0, level.platform_index)), reset
+    return setup
+
+
+def _level_draw_case(camera_offset):
+    def setup():
+        import pygame
+        from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+        level, _ = _world()
+        surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        return (lambda: level.draw(surface, camera_offset=camera_offset)), None
+    return setup
+
+
+def _observer_case(kind):
+    """One observation of level 1 at MEDIUM, a few seconds into a run to the right"""
+    def setup():
+        import numpy as np
+        from src.env import PlatformerEnv, StateObserver, RIGHT
+        from src.grid_observer import GridObserver
+        observer = GridObserver() if kind == "grid" else StateObserver()
+        env = PlatformerEnv(level=1, observer=observer)
+        env.reset()
+        for _ in range(200):
+            env.step(RIGHT)
+        out = np.zeros(observer.shape, dtype=observer.dtype)
+        return (lambda: observer.observe(env.sim, out)), None
+    return setup
+
+
+def cases():
+    result = [Case(f"Player.check_collision[{name}]", _collision_case(*args))
+              for name, args in COLLISION_CASES.items()]
+    result += [Case(f"Player.update[{name}]", _player_update_case(**kwargs))
+               for name, kwargs in PLAYER_STATES.items()]
+    result += [Case("Enemy.update[right]", _enemy_update_case(1)),
+               Case("Enemy.update[left]", _enemy_update_case(-1))]
+    result += [Case("Enemy.get_attack_rect[idle]", _attack_rect_case("melee", False)),
+               Case("Enemy.get_attack_rect[melee]", _attack_rect_case("melee", True)),
+               Case("Enemy.get_attack_rect[ranged]", _attack_rect_case("ranged", True)),
+               Case("Enemy.get_attack_rect[charging]", _attack_rect_case("charger", True, True))]
+    result += [Case(f"EnemyPool.update[{n}]", _pool_update_case(n)) for n in (1, 100, 1000)]
+    result += [Case("EnemyPool.update[1000, 32 awake]", _pool_update_case(1000, 32))]
+    result += [Case(f"ProjectilePool.update[{n}]", _projectile_update_case(n)) for n in (1, 16, 256)]
+    result += [Case(f"Level.draw[camera={x}]", _level_draw_case(x), DRAW_NUMBER)
+               for x in CAMERA_OFFSETS]
+    result += [Case("StateObserver.observe", _observer_case("state")),
+               Case("GridObserver.observe", _observer_case("grid"), DRAW_NUMBER)]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="rounds per case")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply calls per round")
+    parser.add_argument("--json", metavar="PATH", help="write results to PATH")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import pygame
+    from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+    pygame.display.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    overhead = _timer_overhead()
+    print(f"{'case':<40}{'min ns':>11}{'median ns':>11}{'stdev':>9}")
+    results = []
+    for case in cases():
+        if args.filter not in case.name:
+            continue
+        case.number = max(1, int(case.number * args.scale))
+        result = measure(case, args.repeat, overhead)
+        results.append(result)
+        print(f"{case.name:<40}{result['min_ns']:>11.0f}{result['median_ns']:>11.0f}"
+              f"{result['stdev_ns']:>9.0f}", flush=True)
+
+    if args.json:
+        report = {"python": sys.version.split()[0], "pygame": pygame.version.ver,
+                  "machine": platform.machine(), "timer_overhead_ns": overhead,
+                  "results": results}
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
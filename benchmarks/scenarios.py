@@ -0,0 +1,258 @@
+"""
+Scenario benchmarks - whole-game runs from scripted input, compared against a baseline
+
+Every level is played at every difficulty from a seeded input script, with
+the SDL dummy video driver and no frame cap. Each tick also renders a
+frame, so Level.draw and the HUD are measured too. Stress variants
+multiply the level's enemies and platforms by 10x and 100x. Enemy
+projectiles scale with the enemies, and the projectile pool grows with
+them so no shots are dropped.
+
+Each scenario runs in its own process so peak memory is per scenario.
+
+    python -m benchmarks.scenarios                      # run and report
+    python -m benchmarks.scenarios --save-baseline      # record a baseline
+    python -m benchmarks.scenarios --threshold 0.1      # fail on >10% slowdown
+    python -m benchmarks.scenarios --replay session.rec # time a recorded session
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Set before pygame is imported, here and in every worker process
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_TICKS = 1200
+DEFAULT_THRESHOLD = 0.15  # Fractional ticks/sec drop that counts as a regression
+STRESS_FACTORS = (10, 100)
+STRESS_DIFFICULTY = "MEDIUM"
+
+
+def scenarios(levels, difficulties=("EASY", "MEDIUM", "HARD")):
+    """(name, level, difficulty, stress factor) for every scenario, in run order"""
+    result = [(f"level{n}-{d}", n, d, 1) for n in levels for d in difficulties]
+    result += [(f"level{n}-{STRESS_DIFFICULTY}-x{f}", n, STRESS_DIFFICULTY, f)
+               for f in STRESS_FACTORS for n in levels]
+    return result
+
+
+def scripted_inputs(seed):
+    """Endless deterministic input: mostly running right, jumping and attacking"""
+    from src.inputs import InputState
+    rng = random.Random(seed)
+    tick = 0
+    while True:
+        # Occasionally back off for a moment, as a player dodging would
+        retreat = rng.random() < 0.1
+        for _ in range(rng.randint(10, 40)):
+            yield InputState(left=retreat, right=not retreat,
+                             jump=tick % 45 == 0 or rng.random() < 0.02,
+                             attack=tick % 20 == 0)
+            tick += 1
+
+
+def apply_stress(level, factor):
+    """Reload a freshly loaded level with its enemies and platforms multiplied by factor"""
+    if factor <= 1:
+        return
+    from src.projectile import ProjectilePool
+    from src.level_loader import compile_level, EnemySpec, PlatformSpec
+    from src.constants import MAX_PROJECTILES
+
+    spec = compile_level(level.current_level, level.difficulty)
+    enemies = list(spec.enemies)
+    platforms = list(spec.platforms)
+    for k in range(1, factor):
+        enemies += [EnemySpec(e.x + (k % 8) * 5, e.y, e.patrol_left, e.patrol_right, e.ability_type)
+                    for e in spec.enemies]
+        platforms += [PlatformSpec(p.x + (k * 29) % 400, p.y, p.width, p.height, p.material)
+                      for p in spec.platforms[1:]]  # The ground stays single
+    # A bigger pool, so extra ranged enemies add projectiles instead of drops
+    level.projectiles = ProjectilePool(MAX_PROJECTILES * factor)
+    # Built like any other level; restarts of it keep the extra entities
+    level.load_spec(spec._replace(enemies=tuple(enemies), platforms=tuple(platforms)))
+
+
+def run_scenario(level_num, difficulty, factor=1, ticks=DEFAULT_TICKS, seed=0):
+    """Play one scenario in this process and return its measurements"""
+    import pygame
+    from src.game import Game
+    from src.profiler import FrameProfiler
+
+    pygame.display.init()
+    pygame.font.init()
+    game = Game(render_fps=0)
+    game.profiler = FrameProfiler(capacity=ticks)
+    inputs = scripted_inputs(seed)
+    restarts = 0
+    stressed = set()  # (level, number) pairs already multiplied
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if game.game_state != "PLAYING":
+            # Died or finished: start the scenario's level over
+            if game.sim:
+                restarts += 1
+            game.start_game(difficulty)
+            game.level.load_level(level_num)
+            game.player.reset()
+        if (game.level, game.level.current_level) not in stressed:
+            apply_stress(game.level, factor)
+            stressed.add((game.level, game.level.current_level))
+        game.inputs = next(inputs)
+        game.update()
+        game.draw()
+        game.profiler.end_frame(game.level.entity_count())
+    elapsed = time.perf_counter() - start
+    return _report(game, ticks, elapsed, restarts)
+
+
+def run_recording(path):
+    """Play back a recorded session (see src/replay.py) uncapped and measure it"""
+    import pygame
+    from src.game import Game
+    from src.profiler import FrameProfiler
+    from src.replay import read_header, read_events
+
+    with open(path, "rb") as f:
+        read_header(f)
+        ticks = sum(1 for kind, _ in read_events(f) if kind == "tick")
+    pygame.display.init()
+    pygame.font.init()
+    game = Game(render_fps=0, replay_path=path)
+    game.profiler = FrameProfiler(capacity=max(1, ticks))
+    restarts = -1  # The first start isn't a restart
+
+    start = time.perf_counter()
+    while game.replay_events is not None:
+        sim = game.sim
+        game.update()
+        if game.sim is not sim:
+            restarts += 1
+        game.draw()
+        game.profiler.end_frame(game.level.entity_count() if game.sim else 0)
+    elapsed = time.perf_counter() - start
+    return _report(game, ticks, elapsed, max(restarts, 0))
+
+
+def _report(game, ticks, elapsed, restarts):
+    import pygame
+    from src.profiler import PHASES
+
+    profiler = game.profiler
+    phase_ms = {name: profiler.times[:, i].mean() * 1000 for i, name in enumerate(PHASES)}
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None
+    if sys.platform == "darwin" and peak_kb:
+        peak_kb //= 1024  # macOS reports bytes
+    pygame.quit()
+    return {
+        "ticks": ticks,
+        "seconds": elapsed,
+        "ticks_per_sec": ticks / elapsed,
+        "phase_ms": phase_ms,
+        "peak_rss_mb": peak_kb / 1024 if peak_kb else None,
+        "peak_entities": int(profiler.entities.max()),
+        "restarts": restarts,
+    }
+
+
+def _run_isolated(fn, args):
+    """Run a scenario in a fresh process so peak memory is its own"""
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(fn, args)
+
+
+def compare(results, baseline, threshold):
+    """Names of scenarios whose ticks/sec fell more than threshold below baseline"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before and result["ticks_per_sec"] < before["ticks_per_sec"] * (1 - threshold):
+            regressions.append(name)
+    return regressions
+
+
+def format_row(name, result, baseline=None):
+    phases = result["phase_ms"]
+    row = (f"{name:<22}{result['ticks_per_sec']:>9.0f}"
+           f"{phases['player_update'] + phases['level_update'] + phases['boss_update']:>8.3f}"
+           f"{phases['check_collisions']:>8.3f}{phases['level_draw']:>8.3f}{phases['present']:>8.3f}"
+           f"{result['peak_rss_mb'] or 0:>8.1f}{result['peak_entities']:>7}")
+    if baseline and name in baseline:
+        change = result["ticks_per_sec"] / baseline[name]["ticks_per_sec"] - 1
+        row += f"{change:>+8.1%}"
+    return row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS, help="ticks per scenario")
+    parser.add_argument("--seed", type=int, default=0, help="input script seed")
+    parser.add_argument("--filter", default="", help="only run scenarios whose name contains this")
+    parser.add_argument("--no-stress", action="store_true", help="skip the 10x/100x variants")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="ticks/sec drop versus baseline that fails the run")
+    parser.add_argument("--json", metavar="PATH", help="also write results to PATH")
+    parser.add_argument("--replay", metavar="PATH", nargs="+", default=[],
+                        help="also time recorded sessions (made with main.py --record)")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(BENCH_DIR))
+    from src.level_loader import level_count
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["scenarios"]
+
+    print(f"{'scenario':<22}{'ticks/s':>9}{'update':>8}{'collide':>8}{'draw':>8}{'present':>8}"
+          f"{'rss MB':>8}{'ents':>7}" + (f"{'vs base':>8}" if baseline else ""))
+    results = {}
+    for name, level_num, difficulty, factor in scenarios(range(1, level_count() + 1)):
+        if args.filter not in name or (args.no_stress and factor > 1):
+            continue
+        result = _run_isolated(run_scenario, (level_num, difficulty, factor, args.ticks, args.seed))
+        results[name] = result
+        print(format_row(name, result, baseline), flush=True)
+    for path in args.replay:
+        name = "replay-" + os.path.splitext(os.path.basename(path))[0]
+        result = _run_isolated(run_recording, (path,))
+        results[name] = result
+        print(format_row(name, result, baseline), flush=True)
+
+    report = {"ticks": args.ticks, "seed": args.seed, "scenarios": results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"Regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,55 @@
 """
 Platformer Game - Mario-like game built with Pygame
 """
-import pygame
+import time
+STARTED = time.perf_counter()  # Before the other imports, for --trace-startup
+import argparse
 import sys
+import pygame
+IMPORTED_PYGAME = time.perf_counter()
 from src.game import Game
+from src.profiler import StartupTrace
+from src.constants import FPS
 
 def main():
-    # Initialize Pygame
-    pygame.init()
+    parser = argparse.ArgumentParser(description="Mario-like platformer")
+    parser.add_argument("--fps", type=int, default=FPS,
+                        help="render rate in frames per second, 0 for uncapped "
+                             "(the simulation always runs at a fixed rate)")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="present only changed screen areas instead of "
+                             "flipping the whole window every frame")
+    parser.add_argument("--profile-csv", metavar="PATH",
+                        help="write per-phase frame timings to PATH on exit")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record every tick's input to PATH for later replay")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="play back a recording instead of taking input")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="number stored in recording headers; does not affect gameplay")
+    parser.add_argument("--trace-startup", action="store_true",
+                        help="print import, init and time-to-first-frame timings")
+    args = parser.parse_args()
+    
+    trace = None
+    if args.trace_startup:
+        trace = StartupTrace(STARTED)
+        trace.marks.append(("import pygame", IMPORTED_PYGAME - STARTED))
+        trace.mark("import game")
+    
+    # Only the subsystems the game uses; pygame.init() would also bring up
+    # audio, joysticks and the rest, which costs startup time for nothing
+    pygame.display.init()
+    pygame.font.init()
+    if trace:
+        trace.mark("init")
     
     # Create and run the game
-    game = Game()
+    game = Game(render_fps=args.fps, dirty_rects=args.dirty_rects,
+                profile_csv=args.profile_csv, record_path=args.record,
+                replay_path=args.replay, seed=args.seed, startup_trace=trace)
+    if trace:
+        trace.mark("create game")
     game.run()
     
     pygame.quit()
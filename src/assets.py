@@ -0,0 +1,221 @@
+"""
+Asset registry - decodes every image file once and shares the frames
+"""
+import os
+import threading
+import pygame
+
+ASSET_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TransformCache:
+    """Horizontally mirrored copies of shared frames.
+
+    Mirrored copies of every sliced sprite-sheet frame are built up front and
+    kept for as long as the frame itself, so facing left never allocates in
+    the update loop. A standalone image is mirrored the first time it is
+    asked for flipped and kept the same way. Misses are serialised, since
+    the level preload thread builds enemies too.
+    """
+    def __init__(self):
+        self._mirrored = {}  # frame -> horizontally flipped frame
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def prime(self, frames):
+        """Precompute the mirrored copy of every frame."""
+        with self._lock:
+            for frame in frames:
+                if frame not in self._mirrored:
+                    self._mirrored[frame] = pygame.transform.flip(frame, True, False)
+
+    def get(self, frame, flip=False):
+        """Return frame, or its mirrored copy with flip, building that only on a miss."""
+        if not flip:
+            self.hits += 1
+            return frame
+        mirrored = self._mirrored.get(frame)
+        if mirrored is not None:
+            self.hits += 1
+            return mirrored
+        with self._lock:
+            mirrored = self._mirrored.get(frame)
+            if mirrored is None:
+                self.misses += 1
+                mirrored = self._mirrored[frame] = pygame.transform.flip(frame, True, False)
+            return mirrored
+
+    def surfaces(self):
+        return list(self._mirrored.values())
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "mirrored": len(self._mirrored),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._mirrored.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class AssetRegistry:
+    """Process-wide cache of decoded images and sliced sprite sheets.
+
+    Entities ask the registry for their art instead of calling
+    pygame.image.load themselves, so each file is read from disk at most once
+    and every instance shares the same Surface objects and frame lists.
+    Shared surfaces must be treated as read-only: never draw on them or
+    change their alpha. Lookups are safe from a background loading thread;
+    misses are serialised so a file is still decoded only once.
+    """
+    def __init__(self, base_dir=ASSET_DIR):
+        self.base_dir = base_dir
+        self._images = {}     # filename -> Surface (None if missing/unreadable)
+        self._sheets = {}     # (filename, layout) -> list of frames (None on failure)
+        self._generated = {}  # key -> Surface built by a factory
+        self.transforms = TransformCache()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+
+    def _decode(self, filename):
+        path = os.path.join(self.base_dir, filename)
+        image = pygame.image.load(path)
+        # convert_alpha needs a video mode; headless runs keep the raw surface
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        return image
+
+    def image(self, filename):
+        """Return the decoded image for filename, or None if it can't be loaded."""
+        if filename in self._images:
+            self.hits += 1
+            return self._images[filename]
+        with self._lock:
+            if filename in self._images:
+                return self._images[filename]
+            self.misses += 1
+            try:
+                image = self._decode(filename)
+            except Exception:
+                image = None
+            self._images[filename] = image
+            return image
+
+    def first_image(self, filenames):
+        """Return the first loadable image out of several candidate filenames."""
+        for filename in filenames:
+            image = self.image(filename)
+            if image:
+                return image
+        return None
+
+    def strip(self, filename, frame_size):
+        """Slice a horizontal sprite strip into frames of frame_size."""
+        return self._sheet(filename, ("strip", frame_size))
+
+    def grid(self, filename, columns, rows):
+        """Slice a sheet laid out as columns x rows equally sized frames."""
+        return self._sheet(filename, ("grid", columns, rows))
+
+    def _sheet(self, filename, layout):
+        key = (filename, layout)
+        if key in self._sheets:
+            self.hits += 1
+            return self._sheets[key]
+        with self._lock:
+            if key in self._sheets:
+                return self._sheets[key]
+            self.misses += 1
+            sheet = self.image(filename)
+            frames = None
+            if sheet:
+                frames = self._slice(sheet, layout) or None
+            if frames:
+                self.transforms.prime(frames)
+            self._sheets[key] = frames
+            return frames
+
+    @staticmethod
+    def _slice(sheet, layout):
+        if layout[0] == "strip":
+            frame_width, frame_height = layout[1]
+            cells = [(i * frame_width, 0) for i in range(sheet.get_width() // frame_width)]
+        else:
+            columns, rows = layout[1], layout[2]
+            frame_width = sheet.get_width() // columns
+            frame_height = sheet.get_height() // rows
+            cells = [(col * frame_width, row * frame_height)
+                     for row in range(rows) for col in range(columns)]
+
+        frames = []
+        for x, y in cells:
+            frame = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
+            frame.blit(sheet, (0, 0), (x, y, frame_width, frame_height))
+            frames.append(frame)
+        return frames
+
+    def generated(self, key, factory):
+        """Return a procedurally built surface, calling factory() only the first time."""
+        if key in self._generated:
+            self.hits += 1
+            return self._generated[key]
+        with self._lock:
+            if key in self._generated:
+                return self._generated[key]
+            self.misses += 1
+            surface = factory()
+            self._generated[key] = surface
+            return surface
+
+    def _surfaces(self):
+        seen = {}
+        for image in self._images.values():
+            if image is not None:
+                seen[id(image)] = image
+        for frames in self._sheets.values():
+            for frame in frames or ():
+                seen[id(frame)] = frame
+        for surface in self._generated.values():
+            seen[id(surface)] = surface
+        for surface in self.transforms.surfaces():
+            seen[id(surface)] = surface
+        return seen.values()
+
+    def resident_bytes(self):
+        """Approximate pixel memory held by every cached surface."""
+        return sum(s.get_width() * s.get_height() * s.get_bytesize() for s in self._surfaces())
+
+    def stats(self):
+        """Return hit/miss counters and memory usage for the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "images": len(self._images),
+            "sheets": len(self._sheets),
+            "generated": len(self._generated),
+            "resident_bytes": self.resident_bytes(),
+            "transforms": self.transforms.stats(),
+        }
+
+    def clear(self):
+        """Drop every cached surface and reset the counters."""
+        self._images.clear()
+        self._sheets.clear()
+        self._generated.clear()
+        self.transforms.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Shared by every entity class
+registry = AssetRegistry()
@@ -2,7 +2,7 @@
 Boss class - represents boss enemies with health and special mechanics
 """
 import pygame
-import os
+from src.assets import registry
 from src.constants import SCREEN_HEIGHT, DIFFICULTY_SETTINGS
 
 class Boss(pygame.sprite.Sprite):
@@ -31,8 +31,8 @@ class Boss(pygame.sprite.Sprite):
         self.height = 64
         
         # Load sprite sheets for animations
-        self.appearing_sprites = self._load_sprite_sheet("Appearing (96x96).png", (96, 96))  # 7 frames
-        self.disappearing_sprites = self._load_sprite_sheet("Desappearing (96x96).png", (96, 96))  # 7 frames
+        self.appearing_sprites = registry.strip("Appearing (96x96).png", (96, 96))  # 7 frames
+        self.disappearing_sprites = registry.strip("Desappearing (96x96).png", (96, 96))  # 7 frames
         
         # Boss animation state
         self.animation_frame = 0
@@ -40,7 +40,7 @@ class Boss(pygame.sprite.Sprite):
         self.boss_state = "idle"  # appearing, idle, disappearing, defeated
         
         # Create boss sprite
-        self.image = self._create_boss_sprite()
+        self.image = registry.generated(("boss", level), self._create_boss_sprite)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -64,26 +64,6 @@ class Boss(pygame.sprite.Sprite):
         self.velocity_y = 0
         self.gravity = 0.4
     
-    def _load_sprite_sheet(self, filename, frame_size):
-        """Load a sprite sheet and split it into individual frames"""
-        try:
-            path = os.path.join(os.path.dirname(os.path.dirname(__file__)), filename)
-            sheet = pygame.image.load(path).convert_alpha()
-            
-            frames = []
-            frame_width, frame_height = frame_size
-            num_frames = sheet.get_width() // frame_width
-            
-            for i in range(num_frames):
-                frame = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
-                frame.blit(sheet, (0, 0), (i * frame_width, 0, frame_width, frame_height))
-                frames.append(frame)
-            
-            return frames if frames else None
-        except Exception as e:
-            print(f"Could not load {filename}: {e}")
-            return None
-    
     def _create_boss_sprite(self):
         """Create a boss sprite that gets bigger with level"""
         image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
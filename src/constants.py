@@ -7,10 +7,20 @@ SCREEN_WIDTH = 1000
 SCREEN_HEIGHT = 600
 
 # World dimensions (for side-scrolling)
-WORLD_WIDTH = 3000  # Much wider for exploration
+WORLD_WIDTH = 3000  # Default level width; a level file can set its own
 
 # Game settings
-FPS = 60
+FPS = 60  # Default render rate
+
+# Fixed simulation rate. Physics constants below (GRAVITY, JUMP_POWER, speeds)
+# are per simulation tick, so gameplay speed never depends on the render rate.
+SIM_RATE = 60
+SIM_DT = 1.0 / SIM_RATE
+MAX_FRAME_TIME = 0.25  # Longest frame the accumulator will catch up on
+
+# Entities that move further than this in one tick (respawns, level loads)
+# snap to their new position instead of being interpolated
+INTERPOLATION_SNAP_DISTANCE = 64
 
 # Difficulty settings
 DIFFICULTY_SETTINGS = {
@@ -43,6 +53,41 @@ PLAYER_SPEED = 5
 JUMP_POWER = 10
 ENEMY_SPEED = 2
 
+# Instantiating a compiled level (with assets already cached) should fit
+# comfortably inside one frame
+LEVEL_LOAD_BUDGET_MS = 8
+
+# Width of the pre-rendered strips static level geometry is baked into
+CHUNK_WIDTH = 512
+# Chunks of at most this many plain color pieces are filled straight onto
+# the screen instead: a few fills beat blitting a whole baked strip
+DIRECT_FILL_PIECES = 32
+
+# Generated levels (src/procgen.py) are built and dropped in chunks of this
+# width (a multiple of CHUNK_WIDTH), keeping those within STREAM_MARGIN of
+# the screen loaded
+GEN_CHUNK_WIDTH = 1024
+STREAM_MARGIN = 1024
+
+# Enemies and checkpoints further than this beyond the screen's edges sleep.
+# Keep it well above an enemy's detection range (250), so that sleeping
+# never changes what happens.
+ACTIVITY_MARGIN = 512
+
+# Projectiles
+MAX_PROJECTILES = 256  # Level-wide pool capacity; extra shots are dropped
+PROJECTILE_LIFETIME = 300  # Ticks before a projectile disappears
+PROJECTILE_CULL_MARGIN = 200  # How far outside the camera a projectile survives
+
+# Profiling
+PROFILE_HISTORY = 600  # Frames kept for the profiler overlay and CSV export
+CPROFILE_FRAMES = 300  # Frames captured when cProfile is started from the game
+
+# Grid observations for agents (src/grid_observer.py)
+GRID_CELL = 16  # Pixels per cell side
+GRID_COLUMNS = 64  # Cells across the window around the player
+GRID_ROWS = 40  # Cells down it
+
 # Colors
 COLOR_PLATFORM = (100, 200, 100)
 COLOR_PLAYER = (255, 0, 0)
@@ -0,0 +1,43 @@
+"""
+DirtyRectPresenter class - pushes only the changed parts of the screen to the display
+"""
+import pygame
+
+
+class DirtyRectPresenter:
+    """Presents frames with display.update(rects) instead of a full flip.
+
+    The caller reports the rects it drew this frame. Each frame presents
+    those plus last frame's (which were erased), so anything that moved or
+    disappeared is refreshed. A full flip is used whenever invalidate() was
+    called, e.g. on a state change, a camera scroll or a window expose.
+    With enabled=False every present() is a plain flip.
+    """
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.previous = []  # Rects drawn last frame, erased this frame
+        self.needs_full = True
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def invalidate(self):
+        """Force the next frame to redraw and flip the whole screen"""
+        self.needs_full = True
+        self.previous = []
+
+    @property
+    def full(self):
+        """True when this frame must be drawn in full"""
+        return self.needs_full or not self.enabled
+
+    def present(self, rects=()):
+        """Show the frame; rects are the screen areas drawn to since the last present"""
+        rects = list(rects)
+        if self.full:
+            pygame.display.flip()
+            self.full_frames += 1
+        elif rects or self.previous:
+            pygame.display.update(self.previous + rects)
+            self.partial_frames += 1
+        self.needs_full = False
+        self.previous = rects
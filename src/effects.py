@@ -1,5 +1,4 @@
-import pygame
-import os
+from src.assets import registry
 
 class HitEffect:
     """Transient hit effect using available hit images (hit.png).
@@ -15,13 +14,9 @@ class HitEffect:
         self.active = True
 
     def _load_frames(self, filename):
-        try:
-            path = os.path.join(os.path.dirname(os.path.dirname(__file__)), filename)
-            img = pygame.image.load(path).convert_alpha()
-            # If single image, return single-frame list
-            return [img]
-        except Exception:
-            return []
+        img = registry.image(filename)
+        # If single image, return single-frame list
+        return [img] if img else []
 
     def update(self):
         self.timer += 1
@@ -2,10 +2,26 @@
 Enemy class - represents enemies that move around with different types and abilities
 """
 import pygame
-import os
+from src.assets import registry
 from src.constants import COLOR_ENEMY, DIFFICULTY_SETTINGS
 
 
+def _pooled(name):
+    """Attribute stored on the instance, or in the EnemyPool arrays while pooled"""
+    def getter(self):
+        if self.pool is None:
+            return self.__dict__[name]
+        return self.pool.get(name, self.pool_index)
+
+    def setter(self, value):
+        if self.pool is None:
+            self.__dict__[name] = value
+        else:
+            self.pool.set(name, self.pool_index, value)
+
+    return property(getter, setter)
+
+
 class Enemy(pygame.sprite.Sprite):
     # Enemy type constants
     MELEE = "melee"
@@ -37,9 +53,33 @@ class Enemy(pygame.sprite.Sprite):
         },
     }
     
+    # Per-tick state that lives in the arrays once the enemy joins an EnemyPool
+    direction = _pooled("direction")
+    attack_cooldown = _pooled("attack_cooldown")
+    attack_timer = _pooled("attack_timer")
+    is_attacking = _pooled("is_attacking")
+    is_charging = _pooled("is_charging")
+    charge_timer = _pooled("charge_timer")
+    
+    @property
+    def prev_pos(self):
+        """Top-left before the current tick, used for interpolated drawing"""
+        if self.pool is None:
+            return self.__dict__.get("prev_pos")
+        return self.pool.previous_pos(self.pool_index)
+    
+    @prev_pos.setter
+    def prev_pos(self, value):
+        if self.pool is None:
+            self.__dict__["prev_pos"] = value
+        else:
+            self.pool.set("prev_x", self.pool_index, value[0])
+    
     def __init__(self, x, y, width=32, height=32, speed=2, patrol_left=None, patrol_right=None, 
                  difficulty="MEDIUM", enemy_type=0, ability_type=MELEE):
         super().__init__()
+        self.pool = None  # EnemyPool this enemy belongs to, if any
+        self.pool_index = None
         
         # Enemy ability type
         if ability_type not in self.TYPE_SETTINGS:
@@ -90,8 +130,8 @@ class Enemy(pygame.sprite.Sprite):
         self.attack_duration = 30  # How long the attack animation lasts
         self.attack_timer = 0
         
-        # For ranged enemies: projectiles
-        self.projectiles = []
+        # For ranged enemies: the level-wide ProjectilePool, set when added to a level
+        self.projectiles = None
         
         # For charger enemies: charging state
         self.is_charging = False
@@ -99,27 +139,8 @@ class Enemy(pygame.sprite.Sprite):
         self.charge_duration = 30
     
     def _load_sprite_sheet(self, filename):
-        """Load and parse enemy sprite sheet."""
-        try:
-            path = os.path.join(os.path.dirname(os.path.dirname(__file__)), filename)
-            sheet = pygame.image.load(path).convert_alpha()
-            # Try to extract 20 enemies (630x500 sheet, so roughly 63x250 per enemy)
-            # The sheet appears to be arranged in 10 columns x 2 rows
-            sprites = []
-            frame_width = sheet.get_width() // 10  # 63 pixels
-            frame_height = sheet.get_height() // 2   # 250 pixels
-            
-            for row in range(2):
-                for col in range(10):
-                    x = col * frame_width
-                    y = row * frame_height
-                    frame_surf = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
-                    frame_surf.blit(sheet, (0, 0), (x, y, frame_width, frame_height))
-                    sprites.append(frame_surf)
-            
-            return sprites if sprites else None
-        except Exception:
-            return None
+        """Return the shared enemy frames (the sheet is 10 columns x 2 rows)."""
+        return registry.grid(filename, 10, 2)
     
     def update(self):
         """Update enemy position"""
@@ -137,11 +158,10 @@ class Enemy(pygame.sprite.Sprite):
         if self.rect.left <= self.patrol_left or self.rect.right >= self.patrol_right:
             self.direction *= -1
         
-        # Flip sprite based on direction
-        if self.direction == -1:
-            self.image = pygame.transform.flip(self.sprite_sheet[self.sprite_index], True, False) if self.sprite_sheet else self.image
-        else:
-            self.image = self.sprite_sheet[self.sprite_index] if self.sprite_sheet else self.image
+        # Flip sprite based on direction (mirrored frames are precomputed)
+        if self.sprite_sheet:
+            frame = self.sprite_sheet[self.sprite_index]
+            self.image = registry.transforms.get(frame, flip=True) if self.direction == -1 else frame
         
         # Update attack timing
         if self.attack_cooldown > 0:
@@ -175,14 +195,14 @@ class Enemy(pygame.sprite.Sprite):
     
     def _fire_projectile(self):
         """Fire a projectile at the player (for ranged enemies)."""
-        from src.projectile import Projectile
-        projectile = Projectile(
+        if self.projectiles is None:
+            return
+        self.projectiles.spawn(
             self.rect.centerx,
             self.rect.centery,
             direction=self.direction,
             speed=4
         )
-        self.projectiles.append(projectile)
     
     def get_attack_rect(self):
         """Return the rect for attack collision."""
@@ -202,10 +222,16 @@ class Enemy(pygame.sprite.Sprite):
         return attack_rect
     
     def kill(self):
-        """Remove enemy from game"""
-        if self.sprite_sheet:
-            self.image.set_alpha(0)
-        self.rect.x = -1000  # Move off screen
+        """Remove enemy from game.
+
+        A pooled enemy stops acting immediately and is swap-removed from its
+        pool at the end of the tick; a standalone one is moved off screen.
+        """
+        super().kill()
+        if self.pool is not None:
+            self.pool.despawn(self)
+        else:
+            self.rect.x = -1000  # Move off screen
     
     def draw(self, surface):
         """Draw enemy on screen"""
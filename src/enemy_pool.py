@@ -0,0 +1,538 @@
+"""
+EnemyPool class - struct-of-arrays enemy storage with batched AI updates
+"""
+import math
+import numpy as np
+from src.assets import registry
+from src.enemy import Enemy
+
+# Ability types as small integer codes for the arrays
+TYPE_CODES = {Enemy.MELEE: 0, Enemy.RANGED: 1, Enemy.CHARGER: 2}
+MELEE_CODE = TYPE_CODES[Enemy.MELEE]
+RANGED_CODE = TYPE_CODES[Enemy.RANGED]
+CHARGER_CODE = TYPE_CODES[Enemy.CHARGER]
+
+# set_window widens its range to multiples of this, so that it only has to
+# look at the enemies again once the camera has moved some way
+WINDOW_STEP = 64
+
+
+def _round_half_away(values):
+    """Round the way pygame.Rect does when a float is assigned to it"""
+    return np.trunc(values + np.copysign(0.5, values))
+
+
+def _patrol_step(x, direction, speed, patrol_left, patrol_right, width):
+    """One tick of EnemyPool.update's movement for a single enemy, in plain floats"""
+    moved = x + speed * direction
+    x = int(math.trunc(moved + math.copysign(0.5, moved)))
+    if x <= patrol_left or x + width >= patrol_right:
+        direction = -direction
+    return x, direction
+
+
+def _patrol_run(x, direction, speed, patrol_left, patrol_right, width, ticks):
+    """Up to `ticks` of _patrol_step at once, stopping after the next turn.
+
+    Returns (x, direction, ticks taken). Rounding moves x by the same whole
+    step every tick while x + speed * direction keeps its sign, so the ticks
+    until a bound is reached follow from one division.
+    """
+    start = x
+    x, turned = _patrol_step(x, direction, speed, patrol_left, patrol_right, width)
+    step = x - start
+    if turned != direction or step == 0 or ticks == 1:
+        return x, turned, 1
+    # Further steps before the one that reaches a bound
+    if step > 0:
+        more = math.ceil((patrol_right - width - x) / step) - 1
+    else:
+        more = math.ceil((x - patrol_left) / -step) - 1
+    more = max(0, min(more, ticks - 1))
+    # The last of those must still round the same way
+    if (start + speed * direction >= 0) != (x + (more - 1) * step + speed * direction >= 0):
+        return x, turned, 1
+    return x + more * step, direction, 1 + more
+
+
+class EnemyPool:
+    """All of a level's enemies, stored as parallel NumPy arrays.
+
+    Position, direction, patrol bounds, cooldowns and per-type settings live
+    in arrays indexed by slot, and patrol movement, turn-around, player
+    detection and attack triggering run as whole-array operations each
+    tick. The Enemy objects stay around for drawing and projectiles; their
+    rect.x and image are refreshed after every batched update, and their
+    state attributes read and write through to the arrays.
+
+    set_window() puts enemies whose patrol lies outside an x range to
+    sleep: batched updates, player detection, hit tests and syncing then
+    skip them. An enemy wakes once its patrol reaches into the range, and is
+    fast-forwarded through the ticks it slept. Far from the player nothing
+    but its patrol and timers changes, so the result is what it would have
+    been had it never slept.
+    """
+    # name -> dtype for every per-enemy column
+    FIELDS = {
+        "x": np.int64,
+        "prev_x": np.int64,  # x before the current tick, for interpolated drawing
+        "y": np.int64,
+        "width": np.int64,
+        "height": np.int64,
+        "speed": np.float64,
+        "direction": np.int64,
+        "patrol_left": np.float64,
+        "patrol_right": np.float64,
+        "type_code": np.int8,
+        "detection_range": np.int64,
+        "attack_range": np.int64,
+        "attack_delay": np.int64,
+        "attack_duration": np.int64,
+        "charge_duration": np.int64,
+        "attack_cooldown": np.int64,
+        "attack_timer": np.int64,
+        "is_attacking": np.bool_,
+        "is_charging": np.bool_,
+        "charge_timer": np.int64,
+        "awake": np.bool_,  # Inside the activity window (see set_window)
+        "slept_at": np.int64,  # Pool tick at which a sleeping enemy fell asleep
+    }
+
+    # Enemy attributes that are stored in the pool while an enemy belongs to it
+    STATE_FIELDS = ("direction", "attack_cooldown", "attack_timer",
+                    "is_attacking", "is_charging", "charge_timer")
+
+    def __init__(self, capacity=32):
+        self.enemies = []  # Enemy objects, index-aligned with the arrays
+        self._facing_frames = []  # (right, left) frames per enemy, or None without a sheet
+        self.capacity = max(1, capacity)
+        for name, dtype in self.FIELDS.items():
+            setattr(self, "_" + name, np.zeros(self.capacity, dtype=dtype))
+        self._drawn_direction = np.zeros(self.capacity, dtype=np.int64)
+        self._dead = np.zeros(self.capacity, dtype=bool)  # Despawned, awaiting removal
+        self._despawn_queue = []
+        self._tick = 0  # update() calls so far
+        self._awake_index = None  # Slots of awake enemies, or None when all are awake
+        self._window = None  # Range of the last set_window that looked at the enemies
+        self._fast_forward = True
+
+    def __len__(self):
+        return len(self.enemies)
+
+    def __iter__(self):
+        return iter(self.enemies)
+
+    def __getitem__(self, index):
+        return self.enemies[index]
+
+    def column(self, name):
+        """Return a view of the live part of one column"""
+        return getattr(self, "_" + name)[:len(self.enemies)]
+
+    def _columns(self):
+        return list(self.FIELDS) + ["drawn_direction", "dead"]
+
+    def _grow(self):
+        self.capacity *= 2
+        for name in self._columns():
+            old = getattr(self, "_" + name)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, "_" + name, new)
+
+    def add(self, enemy):
+        """Copy an enemy's state into the arrays and bind it to its slot"""
+        if len(self.enemies) == self.capacity:
+            self._grow()
+        i = len(self.enemies)
+        values = {
+            "x": enemy.rect.x,
+            "prev_x": enemy.rect.x,
+            "y": enemy.rect.y,
+            "width": enemy.rect.width,
+            "height": enemy.rect.height,
+            "speed": enemy.speed,
+            "patrol_left": enemy.patrol_left,
+            "patrol_right": enemy.patrol_right,
+            "type_code": TYPE_CODES[enemy.ability_type],
+            "detection_range": enemy.detection_range,
+            "attack_range": enemy.attack_range,
+            "attack_delay": enemy.attack_delay,
+            "attack_duration": enemy.attack_duration,
+            "charge_duration": enemy.charge_duration,
+            "awake": True,
+            "slept_at": 0,
+        }
+        for name in self.STATE_FIELDS:
+            values[name] = getattr(enemy, name)
+        for name, value in values.items():
+            getattr(self, "_" + name)[i] = value
+        self._drawn_direction[i] = values["direction"]
+        self._dead[i] = False
+        self.enemies.append(enemy)
+        self._facing_frames.append(self._frames_for(enemy))
+        enemy.pool = self
+        enemy.pool_index = i
+        if self._awake_index is not None:
+            self._awake_index = np.append(self._awake_index, i)
+        return i
+
+    @staticmethod
+    def _frames_for(enemy):
+        if not enemy.sprite_sheet:
+            return None
+        frame = enemy.sprite_sheet[enemy.sprite_index]
+        return (frame, registry.transforms.get(frame, flip=True))
+
+    def get(self, name, index):
+        return getattr(self, "_" + name)[index].item()
+
+    def set(self, name, index, value):
+        getattr(self, "_" + name)[index] = value
+
+    def remove(self, enemy):
+        """Swap-remove an enemy: the last slot moves into the hole, O(1)"""
+        i = enemy.pool_index
+        last = len(self.enemies) - 1
+        self._unbind(enemy, i)
+        if i != last:
+            for name in self._columns():
+                column = getattr(self, "_" + name)
+                column[i] = column[last]
+            moved = self.enemies[last]
+            self.enemies[i] = moved
+            self._facing_frames[i] = self._facing_frames[last]
+            moved.pool_index = i
+        self.enemies.pop()
+        self._facing_frames.pop()
+        if self._awake_index is not None:
+            self._refresh_awake()
+
+    def despawn(self, enemy):
+        """Mark an enemy dead now and remove it at the end of the tick"""
+        if enemy.pool is self and not self._dead[enemy.pool_index]:
+            self._dead[enemy.pool_index] = True
+            self._despawn_queue.append(enemy)
+
+    def flush_despawns(self):
+        """Remove every enemy despawned this tick"""
+        for enemy in self._despawn_queue:
+            self.remove(enemy)
+        self._despawn_queue.clear()
+
+    def clear(self):
+        for i, enemy in enumerate(self.enemies):
+            self._unbind(enemy, i)
+        self.enemies.clear()
+        self._facing_frames.clear()
+        self._despawn_queue.clear()
+        self._awake_index = None
+        self._window = None
+
+    def snapshot(self):
+        """Capture the pool's enemies and every column, for restore()"""
+        self.wake_all()
+        n = len(self.enemies)
+        columns = {name: getattr(self, "_" + name)[:n].copy() for name in self._columns()}
+        return list(self.enemies), list(self._facing_frames), columns
+
+    def restore(self, snapshot):
+        """Return to a snapshot in place, re-adding enemies despawned since"""
+        enemies, facing_frames, columns = snapshot
+        n = len(enemies)
+        while self.capacity < n:
+            self._grow()
+        for name, values in columns.items():
+            getattr(self, "_" + name)[:n] = values
+        self.enemies[:] = enemies
+        self._facing_frames[:] = facing_frames
+        for i, enemy in enumerate(enemies):
+            enemy.pool = self
+            enemy.pool_index = i
+        self._despawn_queue.clear()
+        self._refresh_awake()
+        self._window = None
+        # Images may show either facing by now; force a full refresh
+        self._drawn_direction[:n] = 0
+        self.sync()
+
+    def _unbind(self, enemy, i):
+        """Hand an enemy's state back to the object before it leaves the pool"""
+        state = {name: self.get(name, i) for name in self.STATE_FIELDS}
+        enemy.pool = None
+        enemy.pool_index = None
+        for name, value in state.items():
+            setattr(enemy, name, value)
+
+    def _active(self):
+        """Index for the awake part of every column: a slice when all are awake"""
+        if self._awake_index is None:
+            return slice(0, len(self.enemies))
+        return self._awake_index
+
+    def _refresh_awake(self):
+        awake = self._awake[:len(self.enemies)]
+        self._awake_index = None if awake.all() else np.flatnonzero(awake)
+
+    def awake_enemies(self):
+        """Enemies inside the activity window, in pool order"""
+        if self._awake_index is None:
+            return self.enemies
+        enemies = self.enemies
+        return [enemies[i] for i in self._awake_index.tolist()]
+
+    def set_window(self, left, right, fast_forward=True):
+        """Sleep enemies that can't leave [left, right) and wake the rest.
+
+        Pass a range that reaches well past the player's detection range on
+        both sides of the screen. Without fast_forward, woken enemies resume
+        from where they fell asleep, as if time had stopped for them.
+        """
+        n = len(self.enemies)
+        if n == 0:
+            return
+        self._fast_forward = fast_forward
+        left = left // WINDOW_STEP * WINDOW_STEP
+        right = -(-right // WINDOW_STEP) * WINDOW_STEP
+        if (left, right) == self._window:
+            # Sleeping enemies haven't moved, so none of them can need waking.
+            # Awake ones that left stay awake a little longer.
+            return
+        self._window = (left, right)
+        x = self._x[:n]
+        # Anywhere a sleeping enemy's patrol can take it, plus one charging step
+        reach = self._speed[:n] * 2 + 1
+        low = np.minimum(x, self._patrol_left[:n]) - reach
+        high = np.maximum(x + self._width[:n], self._patrol_right[:n]) + reach
+        inside = (high > left) & (low < right)
+        was_awake = self._awake[:n]
+        if np.array_equal(inside, was_awake):
+            return
+        self._slept_at[:n][was_awake & ~inside] = self._tick
+        for i in np.flatnonzero(inside & ~was_awake).tolist():
+            self._wake(i)
+        was_awake[:] = inside
+        self._refresh_awake()
+
+    def wake_all(self):
+        """Wake every sleeping enemy, e.g. before reading the whole pool's state"""
+        if self._awake_index is None:
+            return
+        n = len(self.enemies)
+        for i in np.flatnonzero(~self._awake[:n]).tolist():
+            self._wake(i)
+        self._awake[:n] = True
+        self._awake_index = None
+        self._window = None
+
+    def _wake(self, i):
+        if self._fast_forward:
+            self._advance(i, self._tick - int(self._slept_at[i]))
+        x = int(self._x[i])
+        self._prev_x[i] = x
+        self.enemies[i].rect.x = x
+
+    def _advance(self, i, ticks):
+        """Apply `ticks` of update() to one enemy, as if it had stayed awake.
+
+        Timers are counted down in one go, and patrol legs are crossed in one
+        go each. Patrolling is periodic, so at most a lap of it is walked
+        however long the enemy slept.
+        """
+        if ticks <= 0:
+            return
+        self._attack_cooldown[i] = max(0, int(self._attack_cooldown[i]) - ticks)
+        if self._is_attacking[i]:
+            remaining = max(int(self._attack_duration[i] - self._attack_timer[i]), 1)
+            if ticks >= remaining:
+                self._is_attacking[i] = False
+                self._attack_timer[i] = 0
+            else:
+                self._attack_timer[i] += ticks
+
+        x, direction = int(self._x[i]), int(self._direction[i])
+        speed = float(self._speed[i])
+        bounds = (float(self._patrol_left[i]), float(self._patrol_right[i]), int(self._width[i]))
+        if self._is_charging[i]:
+            # A charge in progress runs out at double speed first
+            charge = int(self._charge_timer[i])
+            steps = min(ticks, max(charge, 1))
+            for _ in range(steps):
+                x, direction = _patrol_step(x, direction, speed * 2, *bounds)
+            ticks -= steps
+            self._charge_timer[i] = charge - steps
+            self._is_charging[i] = charge - steps > 0
+        seen = {}  # (x, direction) -> ticks left when it was last seen
+        while ticks:
+            state = (x, direction)
+            if state in seen:
+                ticks %= seen[state] - ticks  # Skip whole laps
+                seen.clear()
+                if not ticks:
+                    break
+            seen[state] = ticks
+            x, direction, taken = _patrol_run(x, direction, speed, *bounds, ticks)
+            ticks -= taken
+        self._x[i] = x
+        self._direction[i] = direction
+
+    def previous_pos(self, index):
+        return self._prev_x[index].item(), self._y[index].item()
+
+    def store_previous_positions(self):
+        n = len(self.enemies)
+        self._prev_x[:n] = self._x[:n]
+
+    def update(self):
+        """Batched Enemy.update: charging, patrol movement, turn-around and timers"""
+        self._tick += 1
+        n = len(self.enemies)
+        if n == 0:
+            return
+        a = self._active()
+        x = self._x[a]
+        direction = self._direction[a]
+        charging = self._is_charging[a]
+        charge_timer = self._charge_timer[a]
+
+        # Chargers move at double speed for the rest of their charge
+        speed = self._speed[a]
+        speed = np.where(charging, speed * 2, speed)
+        charge_timer -= charging
+        charging &= charge_timer > 0
+
+        x[:] = _round_half_away(x + speed * direction)
+
+        # Turn around at patrol boundaries
+        turn = (x <= self._patrol_left[a]) | (x + self._width[a] >= self._patrol_right[a])
+        direction[turn] *= -1
+
+        # Update attack timing
+        cooldown = self._attack_cooldown[a]
+        cooldown -= cooldown > 0
+        attacking = self._is_attacking[a]
+        attack_timer = self._attack_timer[a]
+        attack_timer += attacking
+        finished = attacking & (attack_timer >= self._attack_duration[a])
+        attacking &= ~finished
+        attack_timer[finished] = 0
+
+        if self._awake_index is not None:
+            # Fancy indexing gave copies; write them back
+            self._x[a] = x
+            self._direction[a] = direction
+            self._is_charging[a] = charging
+            self._charge_timer[a] = charge_timer
+            self._attack_cooldown[a] = cooldown
+            self._is_attacking[a] = attacking
+            self._attack_timer[a] = attack_timer
+
+        self.sync()
+
+    def steer_and_attack(self, player_rect):
+        """Batched detect_player: face a detected player and attack when in range"""
+        n = len(self.enemies)
+        if n == 0:
+            return
+        a = self._active()
+        centerx = self._x[a] + self._width[a] // 2
+        offset = player_rect.centerx - centerx
+        distance = np.abs(offset)
+
+        detected = (distance < self._detection_range[a]) & ~self._dead[a]
+        direction = self._direction[a]
+        direction[detected] = np.where(offset[detected] > 0, 1, -1)
+        self._direction[a] = direction
+
+        triggered = detected & (distance < self._attack_range[a]) & (self._attack_cooldown[a] <= 0)
+        if triggered.any():
+            # Slots, in pool order, of the enemies that attack
+            slots = np.flatnonzero(triggered)
+            if self._awake_index is not None:
+                slots = self._awake_index[slots]
+            self._is_attacking[slots] = True
+            self._attack_timer[slots] = 0
+            self._attack_cooldown[slots] = self._attack_delay[slots]
+
+            type_code = self._type_code[slots]
+            chargers = slots[type_code == CHARGER_CODE]
+            self._is_charging[chargers] = True
+            self._charge_timer[chargers] = self._charge_duration[chargers]
+
+            # Ranged enemies fire projectiles
+            for i in slots[type_code == RANGED_CODE].tolist():
+                self.enemies[i]._fire_projectile()
+
+        self._sync_images()
+
+    def _overlaps(self, rect, left, top, right, bottom):
+        """Mask of boxes overlapping rect, with pygame.Rect.colliderect semantics"""
+        return ((left < rect.right) & (right > rect.left)
+                & (top < rect.bottom) & (bottom > rect.top)
+                & (right > left) & (bottom > top))
+
+    def body_hits(self, rect):
+        """Indices of enemies whose body overlaps rect, in pool order"""
+        n = len(self.enemies)
+        if n == 0:
+            return []
+        a = self._active()
+        left = self._x[a]
+        top = self._y[a]
+        hits = self._overlaps(rect, left, top, left + self._width[a], top + self._height[a]) & ~self._dead[a]
+        hits = np.flatnonzero(hits)
+        if self._awake_index is not None:
+            hits = self._awake_index[hits]
+        return hits.tolist()
+
+    def melee_hits(self, rect):
+        """Mask of enemies whose attack box (see Enemy.get_attack_rect) overlaps rect"""
+        n = len(self.enemies)
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+        a = self._active()
+        type_code = self._type_code[a]
+        charging = self._is_charging[a]
+        # Charging chargers lunge with a wide box, others swing a small one
+        lunge = (type_code == CHARGER_CODE) & charging
+        pad_x = np.where(lunge, 30, 10)
+        pad_y = np.where(lunge, 20, 10)
+        active = self._is_attacking[a] & ((type_code != RANGED_CODE) | lunge) & ~self._dead[a]
+        x, y = self._x[a], self._y[a]
+        left = x - pad_x
+        top = y - pad_y
+        right = x + self._width[a] + pad_x
+        bottom = y + self._height[a] + pad_y
+        hits = active & self._overlaps(rect, left, top, right, bottom)
+        if self._awake_index is None:
+            return hits
+        mask = np.zeros(n, dtype=bool)
+        mask[self._awake_index] = hits
+        return mask
+
+    def sync(self):
+        """Copy array positions and facing of awake enemies back onto the Enemy objects"""
+        enemies = self.enemies
+        if self._awake_index is None:
+            for enemy, x in zip(enemies, self._x[:len(enemies)].tolist()):
+                enemy.rect.x = x
+        else:
+            a = self._awake_index
+            for i, x in zip(a.tolist(), self._x[a].tolist()):
+                enemies[i].rect.x = x
+        self._sync_images()
+
+    def _sync_images(self):
+        a = self._active()
+        direction = self._direction[a]
+        changed = np.flatnonzero(direction != self._drawn_direction[a])
+        if len(changed) == 0:
+            return
+        enemies = self.enemies
+        facing = self._facing_frames
+        slots = changed if self._awake_index is None else self._awake_index[changed]
+        for i, d in zip(slots.tolist(), direction[changed].tolist()):
+            frames = facing[i]
+            if frames:
+                enemies[i].image = frames[d < 0]
+        self._drawn_direction[slots] = direction[changed]
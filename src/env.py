@@ -0,0 +1,357 @@
+"""
+PlatformerEnv class - a Gym-style environment over the headless Simulation, plus a vectorized wrapper
+
+    env = PlatformerEnv(level=2, difficulty="HARD")
+    obs, info = env.reset()
+    obs, reward, terminated, truncated, info = env.step(RIGHT_JUMP)
+
+Actions are indices into ACTIONS. Observations come from an observer
+object (StateObserver by default) that writes into a caller-supplied array,
+which lets VectorEnv workers fill shared memory directly. Rewards are the
+sum of the RewardHooks methods; subclass it to shape them.
+
+Gym itself is not required; the API follows gymnasium's reset()/step()
+signatures so agents written against it work unchanged. The game has no
+randomness: an episode is decided by its actions alone, so there is
+nothing to seed.
+"""
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from src.simulation import Simulation
+from src.inputs import InputState
+from src.enemy_pool import TYPE_CODES
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, FPS
+
+# Discrete actions: what the agent holds or presses for one tick
+NOOP, LEFT, RIGHT, JUMP, ATTACK, LEFT_JUMP, RIGHT_JUMP, RIGHT_ATTACK = range(8)
+ACTIONS = (
+    InputState(),
+    InputState(left=True),
+    InputState(right=True),
+    InputState(jump=True),
+    InputState(attack=True),
+    InputState(left=True, jump=True),
+    InputState(right=True, jump=True),
+    InputState(right=True, attack=True),
+)
+ACTION_NAMES = ("noop", "left", "right", "jump", "attack", "left_jump", "right_jump", "right_attack")
+
+DEFAULT_MAX_TICKS = FPS * 180  # Three minutes of game time
+
+
+class RewardHooks:
+    """Per-tick reward terms; the step reward is their sum.
+
+    Each hook gets the change in one quantity since the previous tick.
+    Override any of them to shape rewards differently.
+    """
+    def __init__(self, progress=0.01, damage=-1.0, boss_hit=1.0, complete=10.0, death=-5.0):
+        self.progress_weight = progress
+        self.damage_weight = damage
+        self.boss_hit_weight = boss_hit
+        self.complete_bonus = complete
+        self.death_penalty = death
+
+    def progress(self, pixels):
+        """pixels: how far the player got beyond their previous best x"""
+        return self.progress_weight * pixels
+
+    def damage(self, health_lost):
+        return self.damage_weight * health_lost
+
+    def boss_hit(self, boss_health_lost):
+        return self.boss_hit_weight * boss_health_lost
+
+    def outcome(self, state):
+        """Bonus or penalty for how the episode ended, if it just did"""
+        if state in ("LOADING", "GAME_COMPLETE"):
+            return self.complete_bonus
+        if state == "GAME_OVER":
+            return self.death_penalty
+        return 0.0
+
+
+class StateObserver:
+    """Compact feature vector: the player, goal, boss and nearest threats.
+
+    All positions are relative to the player and scaled to roughly [-1, 1].
+    """
+    NEAREST_ENEMIES = 4
+    NEAREST_PROJECTILES = 2
+    dtype = np.float32
+
+    def __init__(self):
+        self.shape = (13 + 4 * self.NEAREST_ENEMIES + 3 * self.NEAREST_PROJECTILES,)
+
+    def reset(self, sim):
+        """Called after each reset, e.g. to cache per-level data"""
+
+    def observe(self, sim, out):
+        out[:] = 0
+        player = sim.player
+        px, py = player.rect.center
+        level = sim.level
+        out[0] = px / level.width
+        out[1] = py / SCREEN_HEIGHT
+        out[2] = player.velocity_x / 10
+        out[3] = player.velocity_y / 20
+        out[4] = player.health / player.max_health
+        out[5] = min(player.ammo, 10) / 10
+        out[6] = player.on_ground
+        if level.goal:
+            out[7] = (level.goal.centerx - px) / SCREEN_WIDTH
+            out[8] = (level.goal.centery - py) / SCREEN_HEIGHT
+        boss = level.boss
+        if boss and not boss.is_defeated():
+            out[9] = 1
+            out[10] = (boss.rect.centerx - px) / SCREEN_WIDTH
+            out[11] = (boss.rect.centery - py) / SCREEN_HEIGHT
+            out[12] = boss.health / boss.max_health
+        i = 13
+
+        pool = level.enemy_pool
+        if len(pool):
+            dx = pool.column("x") + pool.column("width") // 2 - px
+            dy = pool.column("y") + pool.column("height") // 2 - py
+            nearest = np.argsort(np.abs(dx))[:self.NEAREST_ENEMIES]
+            block = out[i:i + 4 * len(nearest)].reshape(-1, 4)
+            block[:, 0] = 1
+            block[:, 1] = dx[nearest] / SCREEN_WIDTH
+            block[:, 2] = dy[nearest] / SCREEN_HEIGHT
+            block[:, 3] = pool.column("type_code")[nearest] / (len(TYPE_CODES) - 1)
+        i += 4 * self.NEAREST_ENEMIES
+
+        shots = level.projectiles
+        live = shots.live_slots()
+        if len(live):
+            dx = shots.x[live] - px
+            nearest = live[np.argsort(np.abs(dx))[:self.NEAREST_PROJECTILES]]
+            block = out[i:i + 3 * len(nearest)].reshape(-1, 3)
+            block[:, 0] = 1
+            block[:, 1] = (shots.x[nearest] - px) / SCREEN_WIDTH
+            block[:, 2] = (shots.y[nearest] - py) / SCREEN_HEIGHT
+        return out
+
+
+class PlatformerEnv:
+    """One game as an episodic environment: an episode is one attempt at one level.
+
+    The episode terminates at the goal or on game over, and is truncated
+    after max_ticks. Observations are written to one array that the next
+    reset() or step() overwrites, unless an out array is passed.
+    """
+    def __init__(self, level=1, difficulty="MEDIUM", max_ticks=DEFAULT_MAX_TICKS,
+                 rewards=None, observer=None):
+        self.level_num = level
+        self.max_ticks = max_ticks
+        self.rewards = rewards or RewardHooks()
+        self.observer = observer or StateObserver()
+        self.observation_shape = self.observer.shape
+        self.observation_dtype = self.observer.dtype
+        self.action_count = len(ACTIONS)
+        # Episodes end at the goal, so the next level is never needed
+        self.sim = Simulation(difficulty, preload=False)
+        self._obs = np.zeros(self.observation_shape, dtype=self.observation_dtype)
+        self._best_x = 0
+        self._health = 0
+        self._boss_health = 0
+
+    def reset(self, seed=None, out=None):
+        """Start a new episode; returns (observation, info).
+
+        With out, the observation is written there instead of a buffer
+        owned by the environment. seed is accepted for gymnasium
+        compatibility and ignored, since the game is deterministic.
+        """
+        sim = self.sim
+        sim.restart(self.level_num)
+        self._best_x = sim.player.rect.x
+        self._health = sim.player.health
+        self._boss_health = sim.level.boss.health if sim.level.boss else 0
+        self.observer.reset(sim)
+        out = self._obs if out is None else out
+        return self.observer.observe(sim, out), {"level": self.level_num}
+
+    def step(self, action, out=None):
+        """Advance one tick; returns (observation, reward, terminated, truncated, info)"""
+        sim = self.sim
+        state = sim.step(ACTIONS[action])
+        player = sim.player
+        boss = sim.level.boss
+
+        rewards = self.rewards
+        reward = 0.0
+        if player.rect.x > self._best_x:
+            reward += rewards.progress(player.rect.x - self._best_x)
+            self._best_x = player.rect.x
+        if player.health < self._health:
+            reward += rewards.damage(self._health - player.health)
+        self._health = player.health
+        if boss:
+            if boss.health < self._boss_health:
+                reward += rewards.boss_hit(self._boss_health - boss.health)
+            self._boss_health = boss.health
+        reward += rewards.outcome(state)
+
+        terminated = state != "PLAYING"
+        truncated = not terminated and sim.tick >= self.max_ticks
+        out = self._obs if out is None else out
+        info = {"tick": sim.tick, "state": state}
+        if state == "GAME_OVER":
+            info["death_cause"] = sim.death_cause
+        return self.observer.observe(sim, out), reward, terminated, truncated, info
+
+
+class VectorEnv:
+    """N PlatformerEnvs stepped together, with batched observations and rewards.
+
+    With workers=0 every environment runs in this process. Otherwise the
+    environments are split across worker processes which write their
+    observations, rewards and done flags into shared-memory arrays and are
+    signalled with a single byte per step, so nothing is pickled while
+    stepping. Finished environments reset themselves: the observation
+    returned for them is the first of their next episode.
+
+    env_kwargs is a dict of PlatformerEnv arguments for all environments, or
+    a list with one dict per environment.
+    """
+    def __init__(self, num_envs, env_kwargs=None, workers=0):
+        self.num_envs = num_envs
+        if env_kwargs is None or isinstance(env_kwargs, dict):
+            env_kwargs = [dict(env_kwargs or {}) for _ in range(num_envs)]
+        self._kwargs = env_kwargs
+        probe = self._kwargs[0].get("observer") or StateObserver()
+        self.observation_shape = probe.shape
+        self.observation_dtype = probe.dtype
+        self.action_count = len(ACTIONS)
+        self.workers = min(workers, num_envs)
+        self._shm = []
+        self._procs = []
+        self._conns = []
+
+        if self.workers:
+            self.observations = self._shared((num_envs, *self.observation_shape), self.observation_dtype)
+            self.actions = self._shared((num_envs,), np.int64)
+            self.rewards = self._shared((num_envs,), np.float32)
+            self.terminated = self._shared((num_envs,), np.bool_)
+            self.truncated = self._shared((num_envs,), np.bool_)
+            self._start_workers()
+        else:
+            self.observations = np.zeros((num_envs, *self.observation_shape), self.observation_dtype)
+            self.actions = np.zeros(num_envs, np.int64)
+            self.rewards = np.zeros(num_envs, np.float32)
+            self.terminated = np.zeros(num_envs, np.bool_)
+            self.truncated = np.zeros(num_envs, np.bool_)
+            self.envs = [PlatformerEnv(**kwargs) for kwargs in self._kwargs]
+
+    def _shared(self, shape, dtype):
+        size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        self._shm.append(shm)
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    def _start_workers(self):
+        ctx = multiprocessing.get_context("spawn")
+        names = [shm.name for shm in self._shm]
+        bounds = np.linspace(0, self.num_envs, self.workers + 1).astype(int)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_worker, daemon=True,
+                               args=(child, names, self.num_envs, self.observation_shape,
+                                     self.observation_dtype, start, stop, self._kwargs[start:stop]))
+            proc.start()
+            child.close()
+            self._procs.append(proc)
+            self._conns.append(parent)
+        for conn in self._conns:
+            conn.recv_bytes()  # Worker is up and its environments are built
+
+    def _command(self, code):
+        for conn in self._conns:
+            conn.send_bytes(code)
+        for conn in self._conns:
+            reply = conn.recv_bytes()
+            if reply != b"k":
+                raise RuntimeError(f"environment worker failed: {reply.decode()}")
+
+    def reset(self):
+        """Reset every environment; returns the (num_envs, *shape) observations"""
+        if self.workers:
+            self._command(b"r")
+        else:
+            for i, env in enumerate(self.envs):
+                env.reset(out=self.observations[i])
+        return self.observations
+
+    def step(self, actions):
+        """Step every environment with its action; returns
+        (observations, rewards, terminated, truncated) arrays.
+
+        The arrays are reused by the next call; copy them to keep them.
+        """
+        self.actions[:] = actions
+        if self.workers:
+            self._command(b"s")
+        else:
+            _step_all(self.envs, self.actions, self.observations, self.rewards,
+                      self.terminated, self.truncated)
+        return self.observations, self.rewards, self.terminated, self.truncated
+
+    def close(self):
+        if self._conns:
+            for conn in self._conns:
+                try:
+                    conn.send_bytes(b"q")
+                except (BrokenPipeError, OSError):
+                    pass
+            for proc in self._procs:
+                proc.join(timeout=5)
+            self._conns = []
+        for shm in self._shm:
+            shm.close()
+            shm.unlink()
+        self._shm = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _step_all(envs, actions, observations, rewards, terminated, truncated):
+    """Step and auto-reset a run of environments, writing results in place"""
+    for i, env in enumerate(envs):
+        obs = observations[i]
+        _, rewards[i], terminated[i], truncated[i], _ = env.step(actions[i], out=obs)
+        if terminated[i] or truncated[i]:
+            env.reset(out=obs)
+
+
+def _worker(conn, names, num_envs, shape, dtype, start, stop, env_kwargs):
+    """Worker process body: runs environments start..stop of a VectorEnv"""
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    shapes = ((num_envs, *shape),) + ((num_envs,),) * 4
+    dtypes = (dtype, np.int64, np.float32, np.bool_, np.bool_)
+    observations, actions, rewards, terminated, truncated = (
+        np.ndarray(s, dtype=d, buffer=shm.buf)[start:stop] for shm, s, d in zip(blocks, shapes, dtypes))
+    envs = [PlatformerEnv(**kwargs) for kwargs in env_kwargs]
+    conn.send_bytes(b"k")
+    try:
+        while True:
+            code = conn.recv_bytes()
+            try:
+                if code == b"s":
+                    _step_all(envs, actions, observations, rewards, terminated, truncated)
+                elif code == b"r":
+                    for i, env in enumerate(envs):
+                        env.reset(out=observations[i])
+                else:
+                    return
+            except Exception as e:
+                conn.send_bytes(f"{type(e).__name__}: {e}".encode())
+                raise
+            conn.send_bytes(b"k")
+    except (EOFError, KeyboardInterrupt):
+        pass
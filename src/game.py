@@ -1,105 +1,188 @@
 """
 Main Game class that handles the game loop and state
 """
+import time
 import pygame
-from src.player import Player
-from src.level import Level
+from src.inputs import InputState
+from src.interpolation import interpolated_pos
+from src.dirty_rects import DirtyRectPresenter
+from src.ui import Label, Bar, Button, stats as ui_stats
+from src.profiler import FrameProfiler, ProfilerOverlay
 from src.constants import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, WORLD_WIDTH,
-    DIFFICULTY_SETTINGS, COLOR_BACKGROUND,
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, SIM_DT, MAX_FRAME_TIME, CPROFILE_FRAMES,
+    COLOR_BACKGROUND,
     FONT_SIZE_SMALL, FONT_SIZE_MEDIUM
 )
 
+DIFFICULTIES = ["EASY", "MEDIUM", "HARD"]
+
+
+def _health_color(ratio):
+    if ratio > 0.5:
+        return (0, 200, 0)  # Green
+    elif ratio > 0.25:
+        return (255, 200, 0)  # Yellow
+    return (255, 0, 0)  # Red
+
+
 class Game:
-    def __init__(self):
+    def __init__(self, render_fps=FPS, dirty_rects=False, profile_csv=None,
+                 record_path=None, replay_path=None, seed=0, startup_trace=None):
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Platformer - Mario-like Game")
         self.clock = pygame.time.Clock()
+        self.render_fps = render_fps  # 0 renders as fast as possible
         self.font_small = pygame.font.Font(None, FONT_SIZE_SMALL)
         self.font_medium = pygame.font.Font(None, FONT_SIZE_MEDIUM)
         self.running = True
         self.game_state = "DIFFICULTY_SELECT"
         self.difficulty = None
-        self.level = None
-        self.player = None
-        self.camera_x = 0  # Camera position for side-scrolling
-        self.game_over_timer = 0  # Frames spent in GAME_OVER state
+        self.sim = None  # Headless simulation; Game only feeds input and draws
+        self.inputs = InputState()
+        # With dirty_rects only changed screen areas are presented while the
+        # camera is still; otherwise every frame is redrawn and flipped
+        self.presenter = DirtyRectPresenter(enabled=dirty_rects)
+        self._drawn_scene = None
+        self._drawn_camera_x = None
+        self.menu_buttons = self._layout_menu()
+        self._menu_hovered = None
+        self._build_ui()
+        # Per-phase timings; F3 shows the overlay, F4 runs cProfile for a while
+        self.profiler = FrameProfiler()
+        self.profiler_overlay = ProfilerOverlay(self.profiler)
+        self.profile_csv = profile_csv  # Written when the game exits
+        # Input recording, or playback of a recording in place of the player
+        self.seed = seed
+        self.recorder = None
+        self.replay_events = None
+        if replay_path:
+            from src.replay import read_header, read_events
+            self._replay_file = open(replay_path, "rb")
+            self.seed = read_header(self._replay_file)
+            self.replay_events = read_events(self._replay_file)
+        elif record_path:
+            from src.replay import InputRecorder
+            self.recorder = InputRecorder(open(record_path, "wb"), seed)
+        # Reports timings once the first frame is on screen (--trace-startup)
+        self.startup_trace = startup_trace
         
+    @property
+    def level(self):
+        return self.sim.level if self.sim else None
+    
+    @property
+    def player(self):
+        return self.sim.player if self.sim else None
+    
+    @property
+    def camera_x(self):
+        return self.sim.camera_x if self.sim else 0
+    
     def start_game(self, difficulty):
         """Initialize game with selected difficulty"""
         self.difficulty = difficulty
-        self.level = Level(difficulty)
-        self.player = Player(64, 300, difficulty)
-        self.camera_x = 0
+        if self.recorder:
+            self.recorder.start(difficulty, previous_sim=self.sim)
+        if self.sim and self.sim.difficulty == difficulty:
+            # Same difficulty: reuse the built levels rather than loading anew
+            self.sim.restart(1)
+        else:
+            # Imported on first use: the menu doesn't need levels or sprites
+            from src.simulation import Simulation
+            self.sim = Simulation(difficulty, seed=self.seed, preload=True)
+            self.sim.profiler = self.profiler
         self.game_state = "PLAYING"
     
-    def update_camera(self):
-        """Update camera to follow player"""
-        # Keep player roughly centered on screen (1/3 from left)
-        target_x = self.player.rect.centerx - SCREEN_WIDTH // 3
-        
-        # Smooth camera movement
-        self.camera_x = max(0, min(target_x, WORLD_WIDTH - SCREEN_WIDTH))
-        
-        # Update player and all objects based on camera position
-        self.level.set_camera_offset(self.camera_x)
+    def restart_level(self):
+        """Warm restart of the current level, e.g. after a game over"""
+        if self.recorder:
+            self.recorder.restart(self.sim)
+        self.sim.restart()
+        self.game_state = "PLAYING"
     
-    def draw_difficulty_menu(self):
-        """Draw difficulty selection menu"""
-        self.screen.fill(COLOR_BACKGROUND)
-        
-        title = self.font_medium.render("SELECT DIFFICULTY", True, (0, 0, 0))
-        self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 100))
-        
-        difficulties = ["EASY", "MEDIUM", "HARD"]
+    def _layout_menu(self):
+        """Difficulty buttons, in menu order"""
         button_y = 250
         button_height = 60
         button_width = 200
+        return [Button((SCREEN_WIDTH // 2 - button_width // 2,
+                        button_y + i * (button_height + 20),
+                        button_width,
+                        button_height), diff, self.font_small)
+                for i, diff in enumerate(DIFFICULTIES)]
+    
+    def _build_ui(self):
+        """Create the cached text and bar widgets; draw() only rebinds their values"""
+        small = self.font_small
+        self.menu_title = Label(self.font_medium, (SCREEN_WIDTH // 2, 100), "SELECT DIFFICULTY", center=True)
+        self.hud = {
+            "level": Label(small, (10, 10)),
+            "difficulty": Label(small, (10, 40)),
+            "ammo": Label(small, (10, 70)),
+            "hp": Label(small, (120, 100)),
+            "controls": Label(small, (10, SCREEN_HEIGHT - 30),
+                              "← → Move  | ↑ Jump  | SPACE Attack  | R Reset", (50, 50, 50)),
+            "boss_defeated": Label(small, (SCREEN_WIDTH - 320, 10),
+                                   "Boss Defeated! Find the goal!", (0, 200, 0)),
+            "boss_hp": Label(small, (SCREEN_WIDTH - 250, 10), color=(200, 0, 0)),
+        }
+        self.health_bar = Bar((10, 100, 100, 20), _health_color, (100, 0, 0))
+        self.game_over_title = Label(self.font_medium, (SCREEN_WIDTH // 2, 200), "GAME OVER",
+                                     (255, 0, 0), center=True)
+        self.game_over_text = Label(small, (SCREEN_WIDTH // 2, 300),
+                                    "Press R to Restart or SPACE to return to Menu",
+                                    (255, 255, 255), center=True)
+        self.loading_text = Label(self.font_medium, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2),
+                                  "Loading...", (255, 255, 255), center=True)
+    
+    def draw_difficulty_menu(self, full=True):
+        """Draw difficulty selection menu.
+
+        With full=False only buttons whose hover state changed are redrawn.
+        Returns the screen rects drawn to.
+        """
+        drawn = []
+        if full:
+            self.screen.fill(COLOR_BACKGROUND)
+            self.menu_title.draw(self.screen)
+            self._menu_hovered = None
         
         mouse_pos = pygame.mouse.get_pos()
+        hovered = [button.rect.collidepoint(mouse_pos) for button in self.menu_buttons]
         
-        for i, diff in enumerate(difficulties):
-            button_rect = pygame.Rect(
-                SCREEN_WIDTH // 2 - button_width // 2,
-                button_y + i * (button_height + 20),
-                button_width,
-                button_height
-            )
-            
+        for i, button in enumerate(self.menu_buttons):
             # Highlight if mouse is over
-            is_hovered = button_rect.collidepoint(mouse_pos)
-            color = (100, 150, 255) if is_hovered else (100, 100, 100)
-            
-            pygame.draw.rect(self.screen, color, button_rect)
-            pygame.draw.rect(self.screen, (255, 255, 255), button_rect, 2)
-            
-            text = self.font_small.render(diff, True, (255, 255, 255))
-            self.screen.blit(text, (button_rect.centerx - text.get_width() // 2,
-                                     button_rect.centery - text.get_height() // 2))
+            if self._menu_hovered is None or self._menu_hovered[i] != hovered[i]:
+                drawn.append(button.draw(self.screen, hovered[i]))
         
-        pygame.display.flip()
-        return difficulties, button_y, button_height, button_width
+        self._menu_hovered = hovered
+        return drawn
         
     def handle_events(self):
         """Handle user input and events"""
+        jump = attack = reset = False
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # The window contents were lost; the next frame must be complete
+                self.presenter.invalidate()
+            
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    self.profiler_overlay.toggle()
+                    self.presenter.invalidate()
+                elif event.key == pygame.K_F4:
+                    self.profiler.start_cprofile(CPROFILE_FRAMES, f"frame-profile-{int(time.time())}.prof")
+            
+            if self.replay_events is not None:
+                continue  # The recording makes every choice
             
             if self.game_state == "DIFFICULTY_SELECT":
                 if event.type == pygame.MOUSEBUTTONDOWN:
-                    difficulties, button_y, button_height, button_width = self.draw_difficulty_menu()
-                    mouse_pos = event.pos
-                    
-                    for i, diff in enumerate(difficulties):
-                        button_rect = pygame.Rect(
-                            SCREEN_WIDTH // 2 - button_width // 2,
-                            button_y + i * (button_height + 20),
-                            button_width,
-                            button_height
-                        )
-                        if button_rect.collidepoint(mouse_pos):
-                            self.start_game(diff)
+                    for button in self.menu_buttons:
+                        if button.rect.collidepoint(event.pos):
+                            self.start_game(button.text)
                             break
             
             elif self.game_state == "GAME_OVER":
@@ -109,235 +192,187 @@ class Game:
                         self.game_state = "DIFFICULTY_SELECT"
                     elif event.key == pygame.K_r:
                         # Restart same level
-                        self.start_game(self.difficulty)
+                        self.restart_level()
             
-            elif self.game_state == "PLAYING":
+            elif self.game_state in ("PLAYING", "LOADING"):
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_UP:
-                        self.player.jump()
+                        jump = True
                     if event.key == pygame.K_SPACE:
-                        self.player.attack()
+                        attack = True
                     if event.key == pygame.K_r:
-                        self.player.reset()
+                        reset = True
         
         # Continuous key checking for movement
-        if self.game_state == "PLAYING":
+        if self.game_state in ("PLAYING", "LOADING"):
             keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                self.player.move_left()
-            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                self.player.move_right()
+            # Presses stay pending until a tick consumes them, since a fast
+            # render rate can produce frames with no simulation step
+            self.inputs = InputState(
+                left=keys[pygame.K_LEFT] or keys[pygame.K_a],
+                right=keys[pygame.K_RIGHT] or keys[pygame.K_d],
+                jump=jump or self.inputs.jump,
+                attack=attack or self.inputs.attack,
+                reset=reset or self.inputs.reset,
+            )
     
     def update(self):
-        """Update game state"""
-        if self.game_state != "PLAYING":
+        """Advance the simulation by one tick with the pending input"""
+        if self.replay_events is not None:
+            self._advance_replay()
+            return
+        if self.game_state != "PLAYING" and not self._next_level_ready():
             return
         
-        self.player.update()
-        self.level.update()
-        
-        # Update boss
-        if self.level.boss:
-            self.level.boss.update()
-        
-        # Update camera
-        self.update_camera()
-        
-        # Check collisions
-        self.check_collisions()
-        
-        # Check if player fell off the map
-        if self.player.rect.top > SCREEN_HEIGHT:
-            self.player.reset()
+        self.game_state = self.sim.step(self.inputs)
+        if self.recorder:
+            self.recorder.tick(self.inputs)
+        self.inputs = self.inputs._replace(jump=False, attack=False, reset=False)
     
-    def check_collisions(self):
-        """Check collisions between player and level elements"""
-        # Check collision with platforms
-        for platform in self.level.platforms:
-            self.player.check_collision(platform)
-        
-        # Check collision with weapon pickups
-        for pickup in self.level.pickups[:]:
-            if self.player.rect.colliderect(pickup.rect):
-                self.player.weapon = "spiked_ball"
-                self.player.ammo += pickup.ammo
-                self.level.pickups.remove(pickup)
-        
-        # Check collision with checkpoints
-        for checkpoint in self.level.checkpoints:
-            if self.player.rect.colliderect(checkpoint.rect):
-                checkpoint.activate()
-        
-        # Check player attack collisions (weapon attack hit detection)
-        attack_rect = self.player.get_attack_rect()
-        if attack_rect:
-            # Check if attack hits enemies
-            for enemy in self.level.enemies[:]:
-                if attack_rect.colliderect(enemy.rect):
-                    enemy.kill()
-                    self.level.enemies.remove(enemy)
-            # Check if attack hits boss
-            if self.level.boss and not self.level.boss.is_defeated():
-                if attack_rect.colliderect(self.level.boss.rect):
-                    self.level.boss.take_damage(1)
-        
-        # Check collision with enemies
-        for enemy in self.level.enemies:
-            # Enemy detection and attack logic
-            if enemy.detect_player(self.player):
-                # Move towards player
-                if self.player.rect.centerx > enemy.rect.centerx:
-                    enemy.direction = 1
-                else:
-                    enemy.direction = -1
-                
-                # Attack if close enough
-                if abs(self.player.rect.centerx - enemy.rect.centerx) < enemy.attack_range:
-                    enemy.attack()
-            
-            # Check attack collision (melee attacks)
-            attack_rect = enemy.get_attack_rect()
-            if attack_rect and self.player.rect.colliderect(attack_rect):
-                if not self.player.is_invincible():
-                    if self.player.take_damage(1):
-                        # Player died
-                        self.game_state = "GAME_OVER"
-                        self.game_over_timer = 0
-            
-            # Check projectile collisions (ranged enemies)
-            for projectile in enemy.projectiles[:]:
-                projectile.update()
-                if self.player.rect.colliderect(projectile.rect):
-                    if not self.player.is_invincible():
-                        if self.player.take_damage(1):
-                            # Player died
-                            self.game_state = "GAME_OVER"
-                            self.game_over_timer = 0
-                        enemy.projectiles.remove(projectile)
-            
-            # Check player stomp collision (jumping on enemy)
-            if self.player.rect.colliderect(enemy.rect):
-                if self.player.velocity_y > 0 and self.player.rect.bottom < enemy.rect.centery:
-                    # Player jumped on enemy
-                    enemy.kill()
-                    self.player.velocity_y = -15
-        
-        # Check collision with boss
-        if self.level.boss and not self.level.boss.is_defeated():
-            if self.player.rect.colliderect(self.level.boss.rect):
-                if self.player.velocity_y > 0 and self.player.rect.bottom < self.level.boss.rect.centery:
-                    # Player jumped on boss
-                    boss_defeated = self.level.boss.take_damage(1)
-                    self.player.velocity_y = -15
-                    if boss_defeated:
-                        # Boss defeated!
-                        pass
-                else:
-                    # Player hit by boss
-                    if not self.player.is_invincible():
-                        if self.player.take_damage(1):
-                            # Player died
-                            self.game_state = "GAME_OVER"
-                            self.game_over_timer = 0
-        
-        # Check collision with goal (only if boss is defeated or no boss)
-        if self.level.goal and self.player.rect.colliderect(self.level.goal):
-            if not self.level.boss or self.level.boss.is_defeated():
-                if self.level.current_level < 5:
-                    self.level.load_next_level()
-                    self.player.reset()
-                else:
-                    # Game complete!
-                    self.game_state = "GAME_COMPLETE"
+    def _next_level_ready(self):
+        """True when a LOADING simulation can step without waiting for the preloader"""
+        return self.game_state == "LOADING" and self.sim.next_level_ready()
+    
+    def _advance_replay(self):
+        """Apply recorded events up to and including the next tick"""
+        if self.game_state == "LOADING" and not self.sim.next_level_ready():
+            return
+        for kind, value in self.replay_events:
+            if kind == "start":
+                self.start_game(value)
+            elif kind == "restart":
+                self.restart_level()
+            elif kind == "digest":
+                if self.sim.state_digest() != value:
+                    print(f"Replay diverged from the recording at tick {self.sim.tick}")
+            else:
+                self.game_state = self.sim.step(value)
+                return
+        print("Replay finished")
+        self.replay_events = None
+        self._replay_file.close()
     
-    def draw(self):
-        """Draw everything on screen"""
+    def draw(self, alpha=1.0):
+        """Draw everything on screen.
+
+        alpha is the fraction of a simulation tick elapsed since the last
+        step; moving entities and the camera are blended by it.
+        """
+        # Only shown if the goal was reached before the next level was preloaded
+        loading = self.game_state == "LOADING" and not self.sim.next_level_ready()
+        # A new screen, run or level always starts from a full redraw
+        scene = (self.game_state, loading, self.sim, self.level.current_level if self.sim else None)
+        if scene != self._drawn_scene:
+            self._drawn_scene = scene
+            self.presenter.invalidate()
+        drawn = []
+        ui_stats.begin_frame()
+        
         if self.game_state == "DIFFICULTY_SELECT":
-            self.draw_difficulty_menu()
+            drawn = self.draw_difficulty_menu(full=self.presenter.full)
         
-        elif self.game_state == "PLAYING":
-            self.screen.fill(COLOR_BACKGROUND)
-            
+        elif loading:
+            if self.presenter.full:
+                self.screen.fill((0, 0, 0))
+                self.loading_text.draw(self.screen)
+        
+        elif self.game_state in ("PLAYING", "LOADING"):
             # Draw with camera offset
-            self.level.draw(self.screen, camera_offset=self.camera_x)
+            camera_x = self.sim.interpolated_camera_x(alpha)
+            if camera_x != self._drawn_camera_x:
+                # Scrolling moves every pixel, so partial updates can't help
+                self._drawn_camera_x = camera_x
+                self.presenter.invalidate()
+            erase = None if self.presenter.full else self.presenter.previous
+            with self.profiler.phase("level_draw"):
+                drawn = self.level.draw(self.screen, camera_offset=camera_x, alpha=alpha, erase=erase)
             
             # Draw player with camera offset
-            player_draw_x = self.player.rect.x - self.camera_x
-            player_draw_rect = self.player.rect.copy()
-            player_draw_rect.x = player_draw_x
+            player_x, player_y = interpolated_pos(self.player, alpha)
+            player_draw_x = player_x - camera_x
             # Draw if player is on or near screen (allowing partial visibility)
             if -50 <= player_draw_x <= SCREEN_WIDTH + 50:
-                self.screen.blit(self.player.image, player_draw_rect)
-            
-            # Draw UI (no camera offset)
-            level_text = self.font_small.render(f"Level: {self.level.current_level}/5", True, (0, 0, 0))
-            difficulty_text = self.font_small.render(f"Difficulty: {self.difficulty}", True, (0, 0, 0))
-            ammo_text = self.font_small.render(f"Ammo: {self.player.ammo}", True, (100, 100, 100) if not self.player.weapon else (200, 100, 0))
-            self.screen.blit(level_text, (10, 10))
-            self.screen.blit(difficulty_text, (10, 40))
-            self.screen.blit(ammo_text, (10, 70))
-            
-            # Draw health bar
-            self._draw_health_bar(10, 100)
+                drawn.append(self.screen.blit(self.player.image, (player_draw_x, player_y)))
             
-            # Draw controls at bottom left
-            controls_text = self.font_small.render("← → Move  | ↑ Jump  | SPACE Attack  | R Reset", True, (50, 50, 50))
-            self.screen.blit(controls_text, (10, SCREEN_HEIGHT - 30))
-            
-            # Draw boss status if boss exists
-            if self.level.boss:
-                if self.level.boss.is_defeated():
-                    boss_status = self.font_small.render("Boss Defeated! Find the goal!", True, (0, 200, 0))
-                    self.screen.blit(boss_status, (SCREEN_WIDTH - 320, 10))
-                else:
-                    boss_hp = self.font_small.render(f"Boss HP: {self.level.boss.health}/{self.level.boss.max_health}", True, (200, 0, 0))
-                    self.screen.blit(boss_hp, (SCREEN_WIDTH - 250, 10))
-            
-            pygame.display.flip()
+            # Draw UI (no camera offset); labels only re-render when their value changes
+            drawn.extend(self._draw_hud())
+            drawn.extend(self.profiler_overlay.draw(self.screen, self.level.entity_counts(),
+                                                    ui_stats.last_frame))
         
         elif self.game_state == "GAME_OVER":
-            self.screen.fill((50, 50, 50))
-            
-            title = self.font_medium.render("GAME OVER", True, (255, 0, 0))
-            restart_text = self.font_small.render("Press R to Restart or SPACE to return to Menu", True, (255, 255, 255))
-            
-            self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 200))
-            self.screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, 300))
-            
-            pygame.display.flip()
-    
-    def _draw_health_bar(self, x, y):
-        """Draw player health bar"""
-        bar_width = 100
-        bar_height = 20
-        
-        # Background (dark)
-        pygame.draw.rect(self.screen, (100, 0, 0), (x, y, bar_width, bar_height))
-        
-        # Health (red to green gradient effect)
-        health_ratio = self.player.health / self.player.max_health
-        current_width = int(bar_width * health_ratio)
+            # Nothing on this screen changes after the first frame
+            if self.presenter.full:
+                self.screen.fill((50, 50, 50))
+                self.game_over_title.draw(self.screen)
+                self.game_over_text.draw(self.screen)
         
-        if health_ratio > 0.5:
-            color = (0, 200, 0)  # Green
-        elif health_ratio > 0.25:
-            color = (255, 200, 0)  # Yellow
-        else:
-            color = (255, 0, 0)  # Red
-        
-        pygame.draw.rect(self.screen, color, (x, y, current_width, bar_height))
+        with self.profiler.phase("present"):
+            self.presenter.present(drawn)
+    
+    def _draw_hud(self):
+        """Draw the in-game HUD; returns the screen rects drawn to"""
+        from src.level_loader import level_count
+        hud = self.hud
+        player = self.player
+        hud["level"].set(f"Level: {self.level.current_level}/{level_count()}")
+        hud["difficulty"].set(f"Difficulty: {self.difficulty}")
+        hud["ammo"].set(f"Ammo: {player.ammo}", (100, 100, 100) if not player.weapon else (200, 100, 0))
+        hud["hp"].set(f"HP: {player.health}/{player.max_health}")
+        self.health_bar.set(player.health, player.max_health)
         
-        # Border
-        pygame.draw.rect(self.screen, (200, 200, 200), (x, y, bar_width, bar_height), 2)
+        drawn = [hud["level"].draw(self.screen),
+                 hud["difficulty"].draw(self.screen),
+                 hud["ammo"].draw(self.screen),
+                 self.health_bar.draw(self.screen),
+                 hud["hp"].draw(self.screen),
+                 hud["controls"].draw(self.screen)]
         
-        # Text
-        health_text = self.font_small.render(f"HP: {self.player.health}/{self.player.max_health}", True, (0, 0, 0))
-        self.screen.blit(health_text, (x + bar_width + 10, y))
+        # Draw boss status if boss exists
+        boss = self.level.boss
+        if boss:
+            if boss.is_defeated():
+                drawn.append(hud["boss_defeated"].draw(self.screen))
+            else:
+                hud["boss_hp"].set(f"Boss HP: {boss.health}/{boss.max_health}")
+                drawn.append(hud["boss_hp"].draw(self.screen))
+        return drawn
     
     def run(self):
-        """Main game loop"""
+        """Main game loop.
+
+        The simulation advances in fixed SIM_DT ticks drained from an
+        accumulator of real elapsed time, so slow frames cost smoothness but
+        never game speed. Rendering runs at render_fps and interpolates
+        between the last two ticks.
+        """
+        accumulator = 0.0
+        previous = time.perf_counter()
         while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+            now = time.perf_counter()
+            # Clamp long stalls so we don't spiral trying to catch up
+            accumulator += min(now - previous, MAX_FRAME_TIME)
+            previous = now
+            
+            with self.profiler.phase("handle_events"):
+                self.handle_events()
+            while accumulator >= SIM_DT:
+                self.update()
+                accumulator -= SIM_DT
+            self.draw(accumulator / SIM_DT)
+            if self.startup_trace:
+                self.startup_trace.mark("first frame")
+                self.startup_trace.report()
+                self.startup_trace = None
+            self.profiler.end_frame(self.level.entity_count() if self.sim else 0)
+            self.clock.tick(self.render_fps)
+        
+        self.close()
+    
+    def close(self):
+        """Flush recordings and profiling output"""
+        if self.recorder:
+            self.recorder.close(self.sim)
+            self.recorder.stream.close()
+            self.recorder = None
+        if self.profile_csv:
+            self.profiler.write_csv(self.profile_csv)
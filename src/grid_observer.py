@@ -0,0 +1,135 @@
+"""
+GridObserver class - semantic multi-channel grid observations built from level state, not pixels
+"""
+import numpy as np
+import pygame
+from src.enemy_pool import TYPE_CODES
+from src.enemy import Enemy
+from src.constants import GRID_CELL, GRID_COLUMNS, GRID_ROWS
+
+# One plane per kind of thing; the static ones come first
+STATIC_CHANNELS = ("platforms", "goal")
+DYNAMIC_CHANNELS = ("melee", "ranged", "charger", "projectiles", "pickups", "boss")
+CHANNELS = STATIC_CHANNELS + DYNAMIC_CHANNELS
+_ENEMY_CHANNEL = {TYPE_CODES[t]: CHANNELS.index(t) for t in (Enemy.MELEE, Enemy.RANGED, Enemy.CHARGER)}
+
+
+class GridObserver:
+    """Rasterizes the level around the player into a (channels, rows, columns) uint8 grid.
+
+    A cell is 1 where something of its channel's kind overlaps it. The
+    window is centered on the player's cell. Platforms and the goal never
+    move, so each level's static planes are rasterized once, with a margin
+    of one window on every side, and each observation slices its window out
+    of them. Only enemies, projectiles, pickups and the boss are stamped
+    per tick. A generated level's platforms stream in and out, so for those
+    the platforms in the window are stamped per tick as well. Works as a
+    PlatformerEnv observer (see src/env.py).
+    """
+    dtype = np.uint8
+
+    def __init__(self, cell=GRID_CELL, columns=GRID_COLUMNS, rows=GRID_ROWS):
+        self.cell = cell
+        self.columns = columns
+        self.rows = rows
+        self.shape = (len(CHANNELS), rows, columns)
+        self._static = {}  # (level, difficulty) -> (platform list it was built from, origin, planes)
+        self._current = None
+
+    def _build_static(self, level):
+        """Static planes for the whole level plus a window-sized margin"""
+        c = self.cell
+        rects = [p.rect for p in level.platforms]
+        if level.goal:
+            rects.append(level.goal)
+        left = min((r.left for r in rects), default=0)
+        top = min((r.top for r in rects), default=0)
+        right = max((r.right for r in rects), default=0)
+        bottom = max((r.bottom for r in rects), default=0)
+        # Origin in cells, so window slices line up with the grid
+        gx = left // c - self.columns
+        gy = top // c - self.rows
+        width = -(-right // c) + self.columns - gx
+        height = -(-bottom // c) + self.rows - gy
+        planes = np.zeros((len(STATIC_CHANNELS), height, width), dtype=self.dtype)
+        for platform in level.platforms:
+            self._stamp(planes[0], platform.rect, gx * c, gy * c)
+        if level.goal:
+            self._stamp(planes[1], level.goal, gx * c, gy * c)
+        return level.platforms, (gx, gy), planes
+
+    def _static_for(self, level):
+        key = (level.current_level, level.difficulty)
+        entry = self._static.get(key)
+        if entry is None or entry[0] is not level.platforms:
+            entry = self._static[key] = self._build_static(level)
+        return entry
+
+    def reset(self, sim):
+        self._current = None if sim.level.stream else self._static_for(sim.level)
+
+    def _stamp(self, plane, rect, ox, oy):
+        """Mark the cells of plane that rect overlaps; (ox, oy) is plane's pixel origin"""
+        c = self.cell
+        rows, columns = plane.shape
+        x0 = max((rect[0] - ox) // c, 0)
+        y0 = max((rect[1] - oy) // c, 0)
+        x1 = min(-(-(rect[0] + rect[2] - ox) // c), columns)
+        y1 = min(-(-(rect[1] + rect[3] - oy) // c), rows)
+        if x0 < x1 and y0 < y1:
+            plane[y0:y1, x0:x1] = 1
+
+    def observe(self, sim, out):
+        level = sim.level
+        c = self.cell
+        px, py = sim.player.rect.center
+        # Window origin, in cells and in pixels
+        wx = px // c - self.columns // 2
+        wy = py // c - self.rows // 2
+        ox, oy = wx * c, wy * c
+        right, bottom = ox + self.columns * c, oy + self.rows * c
+
+        out[:] = 0
+        if level.stream:
+            window = pygame.Rect(ox, oy, right - ox, bottom - oy)
+            for platform in level.platforms_near(window):
+                self._stamp(out[0], platform.rect, ox, oy)
+            if level.goal:
+                self._stamp(out[1], level.goal, ox, oy)
+        else:
+            entry = self._current
+            if entry is None or entry[0] is not level.platforms:
+                entry = self._current = self._static_for(level)
+            _, (gx, gy), planes = entry
+            # Copy the overlap of the window with the cached static planes
+            sx0, sy0 = wx - gx, wy - gy
+            height, width = planes.shape[1:]
+            cx0, cy0 = max(0, -sx0), max(0, -sy0)
+            cx1, cy1 = min(self.columns, width - sx0), min(self.rows, height - sy0)
+            if cx0 < cx1 and cy0 < cy1:
+                out[:len(STATIC_CHANNELS), cy0:cy1, cx0:cx1] = \
+                    planes[:, sy0 + cy0:sy0 + cy1, sx0 + cx0:sx0 + cx1]
+
+        # Stamp what moves, skipping anything outside the window
+        pool = level.enemy_pool
+        if len(pool):
+            xs, ys = pool.column("x"), pool.column("y")
+            ws, hs = pool.column("width"), pool.column("height")
+            visible = np.flatnonzero((xs + ws > ox) & (xs < right) & (ys + hs > oy) & (ys < bottom))
+            codes = pool.column("type_code")
+            for i in visible:
+                self._stamp(out[_ENEMY_CHANNEL[codes[i]]], (xs[i], ys[i], ws[i], hs[i]), ox, oy)
+
+        shots = level.projectiles
+        live = shots.live_slots()
+        if len(live):
+            plane = out[CHANNELS.index("projectiles")]
+            for x, y in zip(shots.x[live], shots.y[live]):
+                self._stamp(plane, (x, y, shots.width, shots.height), ox, oy)
+
+        plane = out[CHANNELS.index("pickups")]
+        for pickup in level.pickups:
+            self._stamp(plane, pickup.rect, ox, oy)
+        if level.boss and not level.boss.is_defeated():
+            self._stamp(out[CHANNELS.index("boss")], level.boss.rect, ox, oy)
+        return out
@@ -0,0 +1,19 @@
+"""
+InputState - the player's input for one simulation tick
+"""
+from collections import namedtuple
+
+
+class InputState(namedtuple("InputState", "left right jump attack reset")):
+    """Player input for a single tick.
+
+    left/right are held keys; jump, attack and reset are presses that
+    happened since the previous tick.
+    """
+    __slots__ = ()
+
+    def __new__(cls, left=False, right=False, jump=False, attack=False, reset=False):
+        return super().__new__(cls, left, right, jump, attack, reset)
+
+
+NO_INPUT = InputState()
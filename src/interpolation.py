@@ -0,0 +1,21 @@
+"""
+Render interpolation helpers for the fixed-timestep loop
+"""
+from src.constants import INTERPOLATION_SNAP_DISTANCE
+
+
+def interpolated_pos(entity, alpha):
+    """Return the entity's top-left blended between its last two ticks.
+
+    alpha is how far the renderer is into the next tick (0..1). Entities
+    without a stored previous position, or ones that jumped further than
+    INTERPOLATION_SNAP_DISTANCE, are drawn where they are.
+    """
+    x, y = entity.rect.topleft
+    prev = getattr(entity, 'prev_pos', None)
+    if prev is None or alpha >= 1.0:
+        return x, y
+    px, py = prev
+    if abs(x - px) > INTERPOLATION_SNAP_DISTANCE or abs(y - py) > INTERPOLATION_SNAP_DISTANCE:
+        return x, y
+    return round(px + (x - px) * alpha), round(py + (y - py) * alpha)
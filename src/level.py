@@ -1,470 +1,377 @@
 """
 Level class - manages platforms, enemies, and level layout
 """
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pygame
-from src.platform import Platform
+from src.platform import Platform, material_color
 from src.enemy import Enemy
+from src.enemy_pool import EnemyPool
+from src.projectile import ProjectilePool
 from src.boss import Boss
-from src.constants import COLOR_GOAL, SCREEN_HEIGHT, WORLD_WIDTH
+from src.checkpoint import Checkpoint
+from src.weapon import WeaponPickup
+from src.spatial import SpatialHash
+from src.static_layer import StaticChunkLayer
+from src.level_loader import compile_level, level_count
+from src.procgen import ChunkGenerator, ChunkStreamer
+from src.interpolation import interpolated_pos
+from src.snapshot import capture, restore
+from src.constants import SCREEN_WIDTH, COLOR_GOAL, LEVEL_LOAD_BUDGET_MS, ACTIVITY_MARGIN
+
+# One background thread shared by every Level for building upcoming levels
+_preloader = None
+
+
+def _preload_executor():
+    global _preloader
+    if _preloader is None:
+        _preloader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-preload")
+    return _preloader
+
+
+class BuiltLevel:
+    """One level's entities as built from its spec, plus their pristine state.
+
+    Level keeps one of these per level it has loaded, so loading a level
+    again, or restarting it, resets the existing entities in place instead
+    of constructing new ones. A generated level's entities come and go with
+    the camera instead; its stream holds the chunks that are present.
+    """
+    def __init__(self, spec, platforms, enemy_pool, boss, goal, checkpoints, pickups, projectiles=None):
+        self.spec = spec
+        self.number = spec.number
+        self.name = spec.name
+        self.width = spec.width
+        self.platforms = platforms
+        self.platform_index = SpatialHash()
+        self.static_layer = StaticChunkLayer()
+        self.enemy_pool = enemy_pool
+        self.boss = boss
+        self.goal = goal
+        self.checkpoints = checkpoints
+        self.pickups = pickups
+        for platform in platforms:
+            self.platform_index.insert(platform)
+            self.static_layer.add(platform.rect, material_color(platform.material))
+        self.stream = None
+        if spec.generator:
+            generator = ChunkGenerator(spec.generator.seed, spec.difficulty, spec.width,
+                                       spec.generator.chunk_width)
+            self.stream = ChunkStreamer(generator, self, projectiles)
+            self.stream.update(0)
+        # Levels start at camera 0. This runs on the preload thread when
+        # there is one, keeping baking out of the first frame after a switch.
+        self.static_layer.prebake(0, SCREEN_WIDTH)
+        self.capture()
+    
+    def capture(self):
+        """Record the entities' current state as the one reset() returns to"""
+        self._boss = capture(self.boss) if self.boss else None
+        if self.stream:
+            return  # Streamed chunks are regenerated, not restored
+        self._enemies = self.enemy_pool.snapshot()
+        self._checkpoints = [capture(cp) for cp in self.checkpoints]
+        self._pickups = list(self.pickups)
+    
+    def reset(self):
+        """Restore positions, health, cooldowns, pickups and checkpoints in place"""
+        if self.boss:
+            restore(self.boss, self._boss)
+        if self.stream:
+            self.stream.reset()
+            return
+        self.enemy_pool.restore(self._enemies)
+        for checkpoint, state in zip(self.checkpoints, self._checkpoints):
+            restore(checkpoint, state)
+        self.pickups[:] = self._pickups
+
 
 class Level:
-    def __init__(self, difficulty="MEDIUM"):
+    def __init__(self, difficulty="MEDIUM", preload=False, activity_margin=ACTIVITY_MARGIN, fast_forward=True):
         self.platforms = []
-        self.enemies = []
+        self.platform_index = SpatialHash()
+        self.static_layer = StaticChunkLayer()
+        self.enemy_pool = EnemyPool()
+        self.projectiles = ProjectilePool()
         self.boss = None
         self.goal = None
         self.checkpoints = []
         self.pickups = []
         self.effects = []
         self.current_level = 1
+        self.name = ""
+        self.spec = None  # LevelSpec of the current level
+        self.width = 0  # Current level's width in pixels
+        self.stream = None  # ChunkStreamer of a generated level
+        self.last_load_ms = 0.0  # Wall time of the most recent load_level
         self.difficulty = difficulty
         self.camera_offset = 0
+        # Enemies and checkpoints more than activity_margin beyond the screen
+        # sleep (None keeps everything awake). With fast_forward, enemies
+        # catch up on the ticks they slept through when they wake.
+        self.activity_margin = activity_margin
+        self.fast_forward = fast_forward
+        self._window = None  # (left, right) of the activity window, None for everywhere
+        self._built = {}  # level number -> BuiltLevel
+        self._loaded_specs = set()  # Level numbers whose BuiltLevel came from load_spec
+        # With preload, the level after the current one is built on a
+        # background thread while this one is played
+        self.preload = preload
+        self._pending = {}  # level number -> Future of a BuiltLevel
         self.load_level(1)
     
+    @property
+    def enemies(self):
+        """Enemies in the level, in pool order (read-only; use add_enemy)"""
+        return self.enemy_pool.enemies
+    
+    def add_enemy(self, enemy):
+        """Add an enemy to the level's pool"""
+        enemy.projectiles = self.projectiles
+        self.enemy_pool.add(enemy)
+    
     def set_camera_offset(self, offset):
-        """Set the camera offset for rendering"""
+        """Set the camera offset, streaming a generated level's chunks to follow it"""
         self.camera_offset = offset
+        if self.stream:
+            self.stream.update(offset)
+        if self.activity_margin is not None:
+            self._window = (offset - self.activity_margin, offset + SCREEN_WIDTH + self.activity_margin)
+            self.enemy_pool.set_window(*self._window, fast_forward=self.fast_forward)
+        elif self._window is not None:
+            self._window = None
+            self.enemy_pool.wake_all()
     
     def load_level(self, level_num):
-        """Load a specific level"""
-        self.platforms.clear()
-        self.enemies.clear()
-        self.checkpoints.clear()
-        self.pickups.clear()
-        self.effects.clear()
-        self.boss = None
-        self.enemy_counter = 0  # Track enemy count for sprite variation
-        
-        if level_num == 1:
-            self.load_level_1()
-        elif level_num == 2:
-            self.load_level_2()
-        elif level_num == 3:
-            self.load_level_3()
-        elif level_num == 4:
-            self.load_level_4()
-        elif level_num == 5:
-            self.load_level_5()
+        """Load a specific level, building it from its compiled spec on first use.
+
+        Levels that were loaded before are reset in place to the state they
+        had right after they were built, which makes restarts cheap. A level
+        that is still being preloaded is waited for; check level_ready()
+        first to avoid blocking.
+        """
+        start = time.perf_counter()
+        if not 1 <= level_num <= level_count():
+            level_num = 1
+        
+        built = self._built.get(level_num)
+        if built is None or level_num in self._loaded_specs:
+            self._loaded_specs.discard(level_num)
+            future = self._pending.pop(level_num, None)
+            built = future.result() if future else self._build(level_num)
+            self._built[level_num] = built
         else:
-            self.load_level_1()
+            built.reset()
+        self._enter(built)
         
-        self.current_level = level_num
+        self.last_load_ms = (time.perf_counter() - start) * 1000
+        if self.preload and self.has_next_level():
+            self._preload(self.next_level_number())
     
-    def load_level_1(self):
-        """Level 1 - Maze with tunnels and vertical challenges"""
-        # Ground platforms
-        self.platforms.append(Platform(0, SCREEN_HEIGHT - 40, 3000, 40))
-        
-        # Entrance section - safe passage
-        self.platforms.append(Platform(100, 450, 150, 20))
-        self.platforms.append(Platform(300, 400, 150, 20))
-        self.platforms.append(Platform(500, 350, 100, 20))
-        
-        # Maze section 1 - vertical challenge
-        self.platforms.append(Platform(700, 480, 80, 20))
-        self.platforms.append(Platform(750, 400, 80, 20))
-        self.platforms.append(Platform(800, 320, 80, 20))
-        
-        # Maze section 2 - horizontal maze
-        self.platforms.append(Platform(950, 350, 120, 20))
-        self.platforms.append(Platform(1150, 300, 100, 20))
-        self.platforms.append(Platform(1300, 250, 100, 20))
-        
-        # Challenging gap section
-        self.platforms.append(Platform(1500, 320, 70, 20))
-        self.platforms.append(Platform(1650, 380, 70, 20))
-        self.platforms.append(Platform(1800, 320, 70, 20))
-        self.platforms.append(Platform(1950, 380, 70, 20))
-        
-        # Tower to boss
-        self.platforms.append(Platform(2100, 450, 100, 20))
-        self.platforms.append(Platform(2200, 350, 80, 20))
-        self.platforms.append(Platform(2300, 250, 80, 20))
-        self.platforms.append(Platform(2400, 150, 80, 20))
-        
-        # Enemies scattered throughout - mix of types for variety
-        if self.difficulty != "EASY":
-            self.enemies.append(Enemy(400, 350, patrol_left=300, patrol_right=600, difficulty=self.difficulty, 
-                                     enemy_type=self.enemy_counter, ability_type=Enemy.MELEE))
-            self.enemy_counter += 1
-            self.enemies.append(Enemy(1000, 300, patrol_left=900, patrol_right=1200, difficulty=self.difficulty, 
-                                     enemy_type=self.enemy_counter, ability_type=Enemy.RANGED))
-            self.enemy_counter += 1
-        if self.difficulty == "HARD":
-            self.enemies.append(Enemy(1700, 300, patrol_left=1600, patrol_right=1900, difficulty=self.difficulty, 
-                                     enemy_type=self.enemy_counter, ability_type=Enemy.CHARGER))
-            self.enemy_counter += 1
-        
-        # Boss at the end (after maze completion)
-        self.boss = Boss(2600, 300, level=1, difficulty=self.difficulty)
-        
-        # Goal after defeating boss
-        self.goal = pygame.Rect(2700, 250, 40, 40)
-        # Place a checkpoint near the mid maze
-        from src.checkpoint import Checkpoint
-        self.checkpoints.append(Checkpoint(600, SCREEN_HEIGHT - 104))
-        # Place a weapon pickup
-        from src.weapon import WeaponPickup
-        self.pickups.append(WeaponPickup(520, 320, filename="Spiked Ball.png", ammo=3))
+    def load_spec(self, spec):
+        """Load a level from a LevelSpec that is not one of the level files,
+        such as a generated one (see src/procgen.py).
+
+        It takes the place of the level file with the same number until a
+        different spec is loaded; reload() restarts it.
+        """
+        start = time.perf_counter()
+        built = self._built.get(spec.number)
+        if built is not None and built.spec is spec:
+            built.reset()
+        else:
+            built = self._built[spec.number] = self._build_spec(spec)
+            self._loaded_specs.add(spec.number)
+        self._enter(built)
+        self.last_load_ms = (time.perf_counter() - start) * 1000
     
-    def load_level_2(self):
-        """Level 2 - Tighter jumps with intricate pathways"""
-        # Ground
-        self.platforms.append(Platform(0, SCREEN_HEIGHT - 40, 3000, 40))
-        
-        # Opening - dual paths
-        self.platforms.append(Platform(100, 480, 100, 20))
-        self.platforms.append(Platform(100, 300, 100, 20))
-        
-        # Upper path
-        self.platforms.append(Platform(250, 420, 80, 20))
-        self.platforms.append(Platform(380, 360, 80, 20))
-        self.platforms.append(Platform(500, 300, 80, 20))
-        
-        # Lower path (alternative)
-        self.platforms.append(Platform(250, 480, 80, 20))
-        self.platforms.append(Platform(380, 460, 80, 20))
-        self.platforms.append(Platform(500, 440, 80, 20))
-        
-        # Converging path
-        self.platforms.append(Platform(700, 380, 100, 20))
-        
-        # Spiral section
-        self.platforms.append(Platform(900, 450, 90, 20))
-        self.platforms.append(Platform(1000, 380, 90, 20))
-        self.platforms.append(Platform(1100, 310, 90, 20))
-        self.platforms.append(Platform(1200, 240, 90, 20))
-        
-        # Dangerous platforming
-        self.platforms.append(Platform(1400, 350, 60, 20))
-        self.platforms.append(Platform(1500, 300, 60, 20))
-        self.platforms.append(Platform(1600, 350, 60, 20))
-        self.platforms.append(Platform(1700, 400, 60, 20))
-        
-        # Final ascent
-        self.platforms.append(Platform(1900, 350, 100, 20))
-        self.platforms.append(Platform(2050, 280, 100, 20))
-        self.platforms.append(Platform(2200, 200, 100, 20))
-        
-        # Boss area approach
-        self.platforms.append(Platform(2350, 150, 80, 20))
-        
-        # Enemies throughout maze - varied types for difficulty
-        enemy_count = 2 if self.difficulty == "EASY" else (4 if self.difficulty == "MEDIUM" else 5)
-        positions = [
-            (350, 350, 250, 450),
-            (1050, 350, 950, 1200),
-            (1550, 300, 1400, 1700),
-            (2100, 300, 2000, 2250),
-            (2300, 200, 2200, 2400)
-        ]
-        ability_types = [Enemy.MELEE, Enemy.RANGED, Enemy.CHARGER, Enemy.MELEE, Enemy.RANGED]
-        for i in range(min(enemy_count, len(positions))):
-            x, y, left, right = positions[i]
-            self.enemies.append(Enemy(x, y, patrol_left=left, patrol_right=right, difficulty=self.difficulty, 
-                                     enemy_type=self.enemy_counter, ability_type=ability_types[i]))
-            self.enemy_counter += 1
-        
-        # Boss at end of maze
-        self.boss = Boss(2600, 200, level=2, difficulty=self.difficulty)
-        
-        # Goal
-        self.goal = pygame.Rect(2700, 150, 40, 40)
-        from src.checkpoint import Checkpoint
-        from src.weapon import WeaponPickup
-        self.checkpoints.append(Checkpoint(900, SCREEN_HEIGHT - 104))
-        self.pickups.append(WeaponPickup(1200, 260, filename="Spiked Ball.png", ammo=2))
+    def reload(self):
+        """Load the current level again from its start"""
+        if self.current_level in self._loaded_specs:
+            self.load_spec(self.spec)
+        else:
+            self.load_level(self.current_level)
     
-    def load_level_3(self):
-        """Level 3 - Complex maze with precision jumps"""
-        # Ground
-        self.platforms.append(Platform(0, SCREEN_HEIGHT - 40, 3000, 40))
-        
-        # Narrow entrance corridor
-        self.platforms.append(Platform(50, 480, 120, 20))
-        self.platforms.append(Platform(200, 450, 80, 20))
-        
-        # First maze section - narrow platforms
-        self.platforms.append(Platform(350, 400, 60, 20))
-        self.platforms.append(Platform(450, 380, 60, 20))
-        self.platforms.append(Platform(550, 360, 60, 20))
-        self.platforms.append(Platform(650, 380, 60, 20))
-        self.platforms.append(Platform(750, 400, 60, 20))
-        
-        # Vertical tower
-        self.platforms.append(Platform(900, 480, 70, 20))
-        self.platforms.append(Platform(900, 380, 70, 20))
-        self.platforms.append(Platform(900, 280, 70, 20))
-        self.platforms.append(Platform(900, 180, 70, 20))
-        
-        # Horizontal precision section
-        self.platforms.append(Platform(1100, 300, 50, 20))
-        self.platforms.append(Platform(1200, 320, 50, 20))
-        self.platforms.append(Platform(1300, 300, 50, 20))
-        self.platforms.append(Platform(1400, 320, 50, 20))
-        self.platforms.append(Platform(1500, 300, 50, 20))
-        
-        # Floating platforms challenge
-        self.platforms.append(Platform(1700, 350, 60, 20))
-        self.platforms.append(Platform(1800, 280, 60, 20))
-        self.platforms.append(Platform(1900, 340, 60, 20))
-        self.platforms.append(Platform(2000, 260, 60, 20))
-        
-        # Downward path to boss
-        self.platforms.append(Platform(2150, 400, 100, 20))
-        self.platforms.append(Platform(2300, 380, 100, 20))
-        self.platforms.append(Platform(2450, 360, 100, 20))
-        
-        # More enemies in complex maze - varied types
-        enemy_count = 3 if self.difficulty == "EASY" else (5 if self.difficulty == "MEDIUM" else 6)
-        positions = [
-            (500, 350, 400, 600),
-            (1200, 300, 1100, 1400),
-            (1600, 280, 1500, 1800),
-            (1850, 320, 1750, 2000),
-            (2200, 350, 2100, 2400),
-            (2350, 350, 2250, 2500)
-        ]
-        ability_types = [Enemy.RANGED, Enemy.CHARGER, Enemy.MELEE, Enemy.RANGED, Enemy.CHARGER, Enemy.MELEE]
-        for i in range(min(enemy_count, len(positions))):
-            x, y, left, right = positions[i]
-            self.enemies.append(Enemy(x, y, patrol_left=left, patrol_right=right, difficulty=self.difficulty, 
-                                     enemy_type=self.enemy_counter, ability_type=ability_types[i]))
-            self.enemy_counter += 1
-        
-        # Boss at end
-        self.boss = Boss(2700, 280, level=3, difficulty=self.difficulty)
-        
-        # Goal
-        self.goal = pygame.Rect(2800, 230, 40, 40)
-        from src.checkpoint import Checkpoint
-        from src.weapon import WeaponPickup
-        self.checkpoints.append(Checkpoint(1100, SCREEN_HEIGHT - 104))
-        self.pickups.append(WeaponPickup(1600, 240, filename="Spiked Ball.png", ammo=2))
+    def has_next_level(self):
+        """True if the current level is a level file followed by another one"""
+        return self.current_level not in self._loaded_specs and 1 <= self.current_level < level_count()
     
-    def load_level_4(self):
-        """Level 4 - Advanced maze with multiple routes"""
-        # Ground
-        self.platforms.append(Platform(0, SCREEN_HEIGHT - 40, 3000, 40))
-        
-        # Starting platform
-        self.platforms.append(Platform(0, 480, 150, 20))
-        
-        # Route A - Upper path
-        self.platforms.append(Platform(200, 400, 100, 20))
-        self.platforms.append(Platform(350, 320, 100, 20))
-        self.platforms.append(Platform(500, 240, 100, 20))
-        
-        # Route B - Lower path
-        self.platforms.append(Platform(200, 480, 100, 20))
-        self.platforms.append(Platform(350, 460, 100, 20))
-        self.platforms.append(Platform(500, 440, 100, 20))
-        
-        # Routes merge
-        self.platforms.append(Platform(700, 350, 120, 20))
-        
-        # Twisting corridor
-        self.platforms.append(Platform(900, 300, 80, 20))
-        self.platforms.append(Platform(1000, 380, 80, 20))
-        self.platforms.append(Platform(1100, 280, 80, 20))
-        self.platforms.append(Platform(1200, 360, 80, 20))
-        
-        # Long horizontal section
-        self.platforms.append(Platform(1400, 320, 200, 20))
-        
-        # Vertical climb
-        self.platforms.append(Platform(1700, 480, 70, 20))
-        self.platforms.append(Platform(1700, 380, 70, 20))
-        self.platforms.append(Platform(1700, 280, 70, 20))
-        self.platforms.append(Platform(1700, 180, 70, 20))
-        
-        # Final gauntlet
-        self.platforms.append(Platform(1900, 300, 60, 20))
-        self.platforms.append(Platform(2000, 350, 60, 20))
-        self.platforms.append(Platform(2100, 300, 60, 20))
-        self.platforms.append(Platform(2200, 350, 60, 20))
-        
-        # Boss approach
-        self.platforms.append(Platform(2350, 250, 100, 20))
-        self.platforms.append(Platform(2500, 200, 100, 20))
-        
-        # Many enemies - balanced mix
-        enemy_count = 4 if self.difficulty == "EASY" else (6 if self.difficulty == "MEDIUM" else 7)
-        positions = [
-            (300, 350, 200, 400),
-            (600, 350, 500, 750),
-            (1050, 320, 950, 1200),
-            (1400, 280, 1300, 1600),
-            (1750, 350, 1650, 1900),
-            (2050, 300, 1950, 2150),
-            (2300, 280, 2200, 2500)
-        ]
-        ability_types = [Enemy.MELEE, Enemy.RANGED, Enemy.CHARGER, Enemy.MELEE, Enemy.RANGED, Enemy.CHARGER, Enemy.MELEE]
-        for i in range(min(enemy_count, len(positions))):
-            x, y, left, right = positions[i]
-            self.enemies.append(Enemy(x, y, patrol_left=left, patrol_right=right, difficulty=self.difficulty, 
-                                     enemy_type=self.enemy_counter, ability_type=ability_types[i]))
-            self.enemy_counter += 1
-        
-        # Boss
-        self.boss = Boss(2700, 200, level=4, difficulty=self.difficulty)
-        
-        # Goal
-        self.goal = pygame.Rect(2800, 150, 40, 40)
-        from src.checkpoint import Checkpoint
-        from src.weapon import WeaponPickup
-        self.checkpoints.append(Checkpoint(1400, SCREEN_HEIGHT - 104))
-        self.pickups.append(WeaponPickup(1800, 320, filename="Spiked Ball.png", ammo=3))
+    def next_level_number(self):
+        """The level load_next_level() goes to"""
+        return self.current_level + 1 if 1 <= self.current_level < level_count() else 1
     
-    def load_level_5(self):
-        """Level 5 - Expert maze leading to final boss"""
-        # Ground
-        self.platforms.append(Platform(0, SCREEN_HEIGHT - 40, 3000, 40))
-        
-        # Entrance - narrow passage
-        self.platforms.append(Platform(0, 500, 100, 20))
-        self.platforms.append(Platform(50, 450, 80, 20))
-        
-        # Complex winding path
-        self.platforms.append(Platform(150, 400, 70, 20))
-        self.platforms.append(Platform(250, 450, 70, 20))
-        self.platforms.append(Platform(350, 380, 70, 20))
-        self.platforms.append(Platform(450, 440, 70, 20))
-        self.platforms.append(Platform(550, 360, 70, 20))
-        
-        # Vertical sections
-        self.platforms.append(Platform(700, 500, 60, 20))
-        self.platforms.append(Platform(700, 380, 60, 20))
-        self.platforms.append(Platform(700, 260, 60, 20))
-        
-        # Precision platforming
-        self.platforms.append(Platform(850, 350, 50, 20))
-        self.platforms.append(Platform(920, 300, 50, 20))
-        self.platforms.append(Platform(990, 350, 50, 20))
-        self.platforms.append(Platform(1060, 300, 50, 20))
-        self.platforms.append(Platform(1130, 350, 50, 20))
-        
-        # Dangerous corridors
-        self.platforms.append(Platform(1300, 320, 80, 20))
-        self.platforms.append(Platform(1450, 380, 80, 20))
-        self.platforms.append(Platform(1600, 300, 80, 20))
-        self.platforms.append(Platform(1750, 360, 80, 20))
-        
-        # Tower climb
-        self.platforms.append(Platform(1950, 480, 70, 20))
-        self.platforms.append(Platform(1950, 360, 70, 20))
-        self.platforms.append(Platform(1950, 240, 70, 20))
-        self.platforms.append(Platform(1950, 120, 70, 20))
-        
-        # Final approach
-        self.platforms.append(Platform(2150, 350, 80, 20))
-        self.platforms.append(Platform(2300, 280, 80, 20))
-        self.platforms.append(Platform(2450, 200, 80, 20))
-        self.platforms.append(Platform(2600, 120, 80, 20))
-        
-        # Maximum enemies - all types used
-        enemy_count = 5 if self.difficulty == "EASY" else (7 if self.difficulty == "MEDIUM" else 8)
-        positions = [
-            (200, 380, 100, 350),
-            (450, 400, 350, 550),
-            (700, 350, 600, 850),
-            (1000, 300, 900, 1150),
-            (1500, 330, 1350, 1750),
-            (1950, 350, 1850, 2100),
-            (2250, 300, 2150, 2400),
-            (2500, 200, 2400, 2650)
-        ]
-        ability_types = [Enemy.CHARGER, Enemy.MELEE, Enemy.RANGED, Enemy.CHARGER, Enemy.MELEE, Enemy.RANGED, Enemy.CHARGER, Enemy.MELEE]
-        for i in range(min(enemy_count, len(positions))):
-            x, y, left, right = positions[i]
-            self.enemies.append(Enemy(x, y, patrol_left=left, patrol_right=right, difficulty=self.difficulty, 
-                                     enemy_type=self.enemy_counter, ability_type=ability_types[i]))
-            self.enemy_counter += 1
-        
-        # FINAL BOSS - at far end of level
-        self.boss = Boss(2800, 150, level=5, difficulty=self.difficulty)
-        
-        # Goal - only accessible after boss defeat
-        self.goal = pygame.Rect(2900, 100, 40, 40)
-        from src.checkpoint import Checkpoint
-        from src.weapon import WeaponPickup
-        self.checkpoints.append(Checkpoint(2000, SCREEN_HEIGHT - 104))
-        # Final level includes a few collectibles (reuse WeaponPickup for now as chest)
-        self.pickups.append(WeaponPickup(2300, 260, filename="Spiked Ball.png", ammo=5))
+    def _preload(self, level_num):
+        """Start building a level in the background unless it exists already"""
+        if level_num not in self._built and level_num not in self._pending:
+            self._pending[level_num] = _preload_executor().submit(self._build, level_num)
+    
+    def level_ready(self, level_num):
+        """True if load_level(level_num) would not have to wait for the preloader"""
+        future = self._pending.get(level_num)
+        return future is None or future.done()
+    
+    def _build(self, level_num):
+        """Construct a level's entities from its compiled spec"""
+        return self._build_spec(compile_level(level_num, self.difficulty))
+    
+    def _build_spec(self, spec):
+        """Construct a level's entities from a LevelSpec"""
+        enemy_pool = EnemyPool()
+        # Enemy index doubles as the sprite variation
+        for i, e in enumerate(spec.enemies):
+            enemy = Enemy(e.x, e.y, patrol_left=e.patrol_left, patrol_right=e.patrol_right,
+                          difficulty=self.difficulty, enemy_type=i, ability_type=e.ability_type)
+            enemy.projectiles = self.projectiles
+            enemy_pool.add(enemy)
+        boss = None
+        if spec.boss:
+            boss = Boss(spec.boss.x, spec.boss.y, level=spec.number, difficulty=self.difficulty)
+        return BuiltLevel(
+            spec,
+            platforms=[Platform(*p) for p in spec.platforms],
+            enemy_pool=enemy_pool,
+            boss=boss,
+            goal=pygame.Rect(spec.goal) if spec.goal else None,
+            checkpoints=[Checkpoint(x, y) for x, y in spec.checkpoints],
+            pickups=[WeaponPickup(p.x, p.y, filename=p.image, ammo=p.ammo) for p in spec.pickups],
+            projectiles=self.projectiles,
+        )
+    
+    def _enter(self, built):
+        """Make a built level the current one"""
+        if self.static_layer is not built.static_layer:
+            # Only the current level is drawn; don't keep the last one's baked chunks alive
+            self.static_layer.evict()
+            built.static_layer.prebake(0, SCREEN_WIDTH)  # Evicted if this level was left before
+        self.platforms = built.platforms
+        self.platform_index = built.platform_index
+        self.static_layer = built.static_layer
+        self.enemy_pool = built.enemy_pool
+        self.boss = built.boss
+        self.goal = built.goal
+        self.checkpoints = built.checkpoints
+        self.pickups = built.pickups
+        self.projectiles.clear()
+        self.effects.clear()
+        self._window = None  # Everything starts awake until the camera is set
+        self.current_level = built.number
+        self.name = built.name
+        self.spec = built.spec
+        self.width = built.width
+        self.stream = built.stream
+    
+    @property
+    def load_over_budget(self):
+        """True if the last load took longer than LEVEL_LOAD_BUDGET_MS"""
+        return self.last_load_ms > LEVEL_LOAD_BUDGET_MS
+    
+    def platforms_near(self, rect):
+        """Return the platforms that share a grid cell with rect, in level order"""
+        return self.platform_index.query(rect)
     
     def load_next_level(self):
         """Load the next level"""
-        next_level = self.current_level + 1
-        if next_level <= 5:
-            self.load_level(next_level)
-        else:
-            self.load_level(1)
+        self.load_level(self.next_level_number())
     
     def update(self):
-        """Update all level elements"""
-        for enemy in self.enemies:
-            enemy.update()
-        for cp in getattr(self, 'checkpoints', []):
-            cp.update()
+        """Update all level elements that are awake"""
+        self.enemy_pool.update()
+        if self._window is None:
+            for cp in self.checkpoints:
+                cp.update()
+        else:
+            # Checkpoint animations just pause while out of the window
+            left, right = self._window
+            for cp in self.checkpoints:
+                if left < cp.rect.right and cp.rect.left < right:
+                    cp.update()
         # pickups are static but could be animated in future
-        # update transient effects
-        for e in list(getattr(self, 'effects', [])):
-            e.update()
-            if not e.active:
-                try:
-                    self.effects.remove(e)
-                except ValueError:
-                    pass
+        # update transient effects, compacting out finished ones in place
+        if self.effects:
+            for e in self.effects:
+                e.update()
+            self.effects[:] = [e for e in self.effects if e.active]
     
-    def draw(self, surface, camera_offset=0):
-        """Draw all level elements with camera offset"""
-        # Always draw background
-        surface.fill((135, 206, 235))
-        
-        # Draw platforms with camera offset
-        for platform in self.platforms:
-            draw_x = platform.rect.x - camera_offset
-            
-            # Always draw ground, otherwise check visibility
-            if platform.rect.y >= SCREEN_HEIGHT - 50:  # Ground platform
-                # Draw ground even if mostly off-screen
-                if draw_x < 1100:  # At least partially on screen
-                    platform_copy = platform.rect.copy()
-                    platform_copy.x = draw_x
-                    surface.blit(platform.image, platform_copy)
-            elif -100 <= draw_x <= 1100:  # Other platforms only if visible
-                platform_copy = platform.rect.copy()
-                platform_copy.x = draw_x
-                surface.blit(platform.image, platform_copy)
-        
-        # Draw enemies with camera offset
-        for enemy in self.enemies:
-            draw_x = enemy.rect.x - camera_offset
+    def despawn_enemy(self, enemy):
+        """Stop an enemy acting now; it leaves the level at the end of the tick"""
+        self.enemy_pool.despawn(enemy)
+    
+    def remove_pickup(self, index):
+        """Swap-remove a collected pickup (pickup order doesn't matter)"""
+        pickups = self.pickups
+        pickups[index] = pickups[-1]
+        pickups.pop()
+    
+    def end_tick(self):
+        """Process removals queued during the tick"""
+        self.enemy_pool.flush_despawns()
+    
+    def entity_counts(self):
+        """Live entity counts by kind, for profiling and stress reports"""
+        return {
+            "platforms": len(self.platforms),
+            "enemies": len(self.enemy_pool),
+            "projectiles": self.projectiles.live,
+            "pickups": len(self.pickups),
+            "checkpoints": len(self.checkpoints),
+            "bosses": 1 if self.boss and not self.boss.is_defeated() else 0,
+        }
+    
+    def entity_count(self):
+        """Total number of live entities in the level"""
+        return sum(self.entity_counts().values())
+    
+    def store_previous_positions(self):
+        """Remember where moving entities are before a tick, for interpolated drawing"""
+        self.enemy_pool.store_previous_positions()
+        self.projectiles.store_previous_positions()
+        if self.boss:
+            self.boss.prev_pos = self.boss.rect.topleft
+    
+    def draw(self, surface, camera_offset=0, alpha=1.0, erase=None):
+        """Draw all level elements with camera offset.
+
+        alpha blends moving entities between their previous and current tick.
+        By default the whole background is redrawn; with erase, a list of
+        screen rects, only those areas are restored first, which is enough
+        when the camera hasn't moved since the last frame. Returns the
+        screen rects that moving and animated elements were drawn to.
+        """
+        # Background and platforms come pre-rendered in chunks
+        if erase is None:
+            self.static_layer.draw(surface, camera_offset=camera_offset)
+        else:
+            for rect in erase:
+                self.static_layer.draw(surface, camera_offset=camera_offset, area=rect)
+        drawn = []
+        
+        # Draw enemies with camera offset; sleeping ones are off screen
+        for enemy in self.enemy_pool.awake_enemies():
+            x, y = interpolated_pos(enemy, alpha)
+            draw_x = x - camera_offset
             if -50 <= draw_x <= 1050:
-                enemy_copy = enemy.rect.copy()
-                enemy_copy.x = draw_x
-                surface.blit(enemy.image, enemy_copy)
-            
-            # Draw enemy projectiles
-            for projectile in getattr(enemy, 'projectiles', []):
-                projectile.draw(surface, camera_offset=camera_offset)
+                drawn.append(surface.blit(enemy.image, (draw_x, y)))
+        
+        # Draw enemy projectiles
+        drawn.extend(self.projectiles.draw(surface, camera_offset=camera_offset, alpha=alpha))
 
         # Draw pickups
         for p in getattr(self, 'pickups', []):
-            p.draw(surface, camera_offset=camera_offset)
+            drawn.append(p.draw(surface, camera_offset=camera_offset))
 
         # Draw checkpoints
         for cp in getattr(self, 'checkpoints', []):
-            cp.update()
-            cp.draw(surface, camera_offset=camera_offset)
+            drawn.append(cp.draw(surface, camera_offset=camera_offset))
         
         # Draw boss with camera offset
         if self.boss and not self.boss.is_defeated():
-            draw_x = self.boss.rect.x - camera_offset
+            x, y = interpolated_pos(self.boss, alpha)
+            draw_x = x - camera_offset
             if -100 <= draw_x <= 1100:
                 boss_copy = self.boss.rect.copy()
-                boss_copy.x = draw_x
-                surface.blit(self.boss.image, boss_copy)
+                boss_copy.topleft = (draw_x, y)
+                drawn.append(surface.blit(self.boss.image, boss_copy))
                 
                 # Draw boss health bar
                 bar_width = 100
@@ -472,9 +379,8 @@ class Level:
                 bar_x = boss_copy.centerx - bar_width // 2
                 bar_y = boss_copy.top - 20
                 
-                import pygame
                 # Background bar
-                pygame.draw.rect(surface, (100, 100, 100), (bar_x, bar_y, bar_width, bar_height))
+                drawn.append(pygame.draw.rect(surface, (100, 100, 100), (bar_x, bar_y, bar_width, bar_height)))
                 
                 # Health bar
                 health_width = int(bar_width * self.boss.get_health_percentage() / 100)
@@ -489,6 +395,8 @@ class Level:
             if -50 <= draw_x <= 1050:
                 goal_copy = self.goal.copy()
                 goal_copy.x = draw_x
-                pygame.draw.rect(surface, COLOR_GOAL, goal_copy)
+                drawn.append(pygame.draw.rect(surface, COLOR_GOAL, goal_copy))
                 # Draw a star or flag effect
                 pygame.draw.circle(surface, (255, 255, 0), goal_copy.center, 10)
+        
+        return drawn
@@ -0,0 +1,131 @@
+"""
+Level loader - compiles declarative level files into cached, immutable specs
+
+Each level lives in levels/level<N>.json:
+
+    name         display name
+    width        level width in pixels (optional, default WORLD_WIDTH)
+    platforms    list of [x, y, width, height], optionally followed by a
+                 material name (see src/platform.py; default "plain")
+    enemies      list of {"x", "y", "patrol": [left, right], "ability"}
+    enemy_count  per-difficulty count; the first N enemies are used
+    boss         {"x", "y"} (optional)
+    goal         [x, y, width, height]
+    checkpoints  list of [x, y]
+    pickups      list of {"x", "y", "image", "ammo"}
+    variants     optional {"EASY": {...}, ...} replacing any of the keys above
+    generator    optional {"seed", "chunk_width"}: generate the level chunk by
+                 chunk (see src/procgen.py) instead of listing its layout;
+                 platforms, enemies, checkpoints and pickups may be omitted
+
+compile_level() validates a file once per (level, difficulty) and returns a
+LevelSpec made of tuples, which Level.load_level turns into entities.
+"""
+import json
+import os
+from collections import namedtuple
+from functools import lru_cache
+from src.assets import ASSET_DIR
+from src.enemy import Enemy
+from src.platform import MATERIALS, DEFAULT_MATERIAL
+from src.constants import SCREEN_HEIGHT, WORLD_WIDTH, GEN_CHUNK_WIDTH, CHUNK_WIDTH
+
+LEVEL_DIR = os.path.join(ASSET_DIR, "levels")
+DIFFICULTIES = ("EASY", "MEDIUM", "HARD")
+
+PlatformSpec = namedtuple("PlatformSpec", "x y width height material", defaults=(DEFAULT_MATERIAL,))
+EnemySpec = namedtuple("EnemySpec", "x y patrol_left patrol_right ability_type")
+BossSpec = namedtuple("BossSpec", "x y")
+PickupSpec = namedtuple("PickupSpec", "x y image ammo")
+GeneratorSpec = namedtuple("GeneratorSpec", "seed chunk_width")
+LevelSpec = namedtuple("LevelSpec", "number difficulty name platforms enemies boss goal checkpoints pickups "
+                                    "width generator", defaults=(WORLD_WIDTH, None))
+
+
+class LevelFormatError(ValueError):
+    """Raised when a level file is missing or malformed"""
+
+
+def level_path(number):
+    return os.path.join(LEVEL_DIR, f"level{number}.json")
+
+
+@lru_cache(maxsize=None)
+def level_count():
+    """Number of consecutive level files, starting from level1.json"""
+    count = 0
+    while os.path.exists(level_path(count + 1)):
+        count += 1
+    return count
+
+
+@lru_cache(maxsize=None)
+def _read_level(number):
+    try:
+        with open(level_path(number)) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise LevelFormatError(f"level {number}: {e}") from e
+
+
+@lru_cache(maxsize=None)
+def compile_level(number, difficulty="MEDIUM"):
+    """Return the immutable LevelSpec for a level at a difficulty"""
+    data = dict(_read_level(number))
+    data.update(data.pop("variants", {}).get(difficulty, {}))
+    return compile_spec(data, number, difficulty)
+
+
+def compile_spec(data, number=0, difficulty="MEDIUM"):
+    """Return the LevelSpec for level data already in memory, in the file format"""
+    try:
+        return _compile(number, difficulty, data)
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        raise LevelFormatError(f"level {number} ({difficulty}): {e!r}") from e
+
+
+def _compile(number, difficulty, data):
+    platforms = data["platforms"] if data.get("generator") is None else data.get("platforms", [])
+    for p in platforms:
+        if len(p) > 4 and p[4] not in MATERIALS:
+            raise ValueError(f"unknown platform material {p[4]!r}")
+    enemies = []
+    for entry in data.get("enemies", []):
+        ability = entry.get("ability", Enemy.MELEE)
+        if ability not in Enemy.TYPE_SETTINGS:
+            raise ValueError(f"unknown enemy ability {ability!r}")
+        left, right = entry["patrol"]
+        enemies.append(EnemySpec(entry["x"], entry["y"], left, right, ability))
+    count = data.get("enemy_count", {}).get(difficulty, len(enemies))
+
+    boss = data.get("boss")
+    width = data.get("width", WORLD_WIDTH)
+    goal = data.get("goal")
+    generator = data.get("generator")
+    if generator is not None:
+        generator = GeneratorSpec(generator.get("seed", 0), generator.get("chunk_width", GEN_CHUNK_WIDTH))
+        if generator.chunk_width % CHUNK_WIDTH:
+            raise ValueError(f"generator chunk_width must be a multiple of {CHUNK_WIDTH}")
+        # By default the goal waits on the ground near the end of the world
+        goal = goal or (width - 150, SCREEN_HEIGHT - 100, 40, 40)
+    return LevelSpec(
+        number=number,
+        difficulty=difficulty,
+        name=data.get("name", f"Level {number}"),
+        platforms=tuple(PlatformSpec(*p) for p in platforms),
+        enemies=tuple(enemies[:count]),
+        boss=BossSpec(boss["x"], boss["y"]) if boss else None,
+        goal=tuple(goal) if goal else None,
+        checkpoints=tuple(tuple(c) for c in data.get("checkpoints", [])),
+        pickups=tuple(PickupSpec(p["x"], p["y"], p.get("image", "Spiked Ball.png"), p.get("ammo", 3))
+                      for p in data.get("pickups", [])),
+        width=width,
+        generator=generator,
+    )
+
+
+def clear_cache():
+    """Forget compiled levels, e.g. after editing level files at runtime"""
+    level_count.cache_clear()
+    _read_level.cache_clear()
+    compile_level.cache_clear()
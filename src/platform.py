@@ -1,18 +1,51 @@
 """
 Platform class - represents static platforms in the level
 """
+from functools import lru_cache
 import pygame
 from src.constants import COLOR_PLATFORM
 
-class Platform(pygame.sprite.Sprite):
-    def __init__(self, x, y, width, height):
-        super().__init__()
-        self.image = pygame.Surface((width, height))
-        self.image.fill(COLOR_PLATFORM)
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
-    
+# Material name -> fill color
+MATERIALS = {
+    "plain": COLOR_PLATFORM,
+}
+DEFAULT_MATERIAL = "plain"
+# Material images kept for Platform.image; streamed levels keep producing new sizes
+MATERIAL_IMAGE_CACHE_SIZE = 64
+
+
+def material_color(material):
+    """Fill color of a material, for StaticChunkLayer.add"""
+    return MATERIALS[material]
+
+
+@lru_cache(maxsize=MATERIAL_IMAGE_CACHE_SIZE)
+def material_image(material, size):
+    """Shared Surface of a material at a size; only the most recently used are kept"""
+    image = pygame.Surface(size)
+    image.fill(material_color(material))
+    return image
+
+
+class Platform:
+    """A static platform: just a rect and the name of its material.
+
+    Platforms own no Surface. The level's StaticChunkLayer paints them
+    from their material (see material_color), so a level can hold
+    thousands of them for a few dozen bytes each. image is only for code
+    that wants to blit one directly. It is shared by platforms of the same
+    material and size, from a small cache of the most recently used.
+    """
+    __slots__ = ("rect", "material")
+
+    def __init__(self, x, y, width, height, material=DEFAULT_MATERIAL):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.material = material
+
+    @property
+    def image(self):
+        return material_image(self.material, self.rect.size)
+
     def draw(self, surface):
         """Draw platform on screen"""
         surface.blit(self.image, self.rect)
@@ -2,8 +2,8 @@
 Player class - clean implementation with sprite loading, physics and simple attack.
 """
 import pygame
-import os
-from src.constants import DIFFICULTY_SETTINGS, SCREEN_WIDTH, SCREEN_HEIGHT, COLOR_PLAYER
+from src.assets import registry
+from src.constants import DIFFICULTY_SETTINGS, SCREEN_HEIGHT, WORLD_WIDTH, COLOR_PLAYER
 
 
 class Player(pygame.sprite.Sprite):
@@ -25,12 +25,12 @@ class Player(pygame.sprite.Sprite):
         self.facing_right = True
 
         # Load sprites
-        self.idle_sheet = self._load_image("Start (Idle).png")
+        self.idle_sheet = registry.image("Start (Idle).png")
         self.moving_frames = self._load_moving_sprites("Start (Moving) (64x64).png")
-        self.small_idle = self._load_sprite_sheet("idle.png", (32, 32))
-        self.small_run = self._load_sprite_sheet("run.png", (32, 32))
-        self.small_jump = self._load_image("jump.png")
-        self.small_fall = self._load_image("fall.png")
+        self.small_idle = registry.strip("idle.png", (32, 32))
+        self.small_run = registry.strip("run.png", (32, 32))
+        self.small_jump = registry.image("jump.png")
+        self.small_fall = registry.image("fall.png")
 
         # initial image
         if self.idle_sheet:
@@ -71,41 +71,11 @@ class Player(pygame.sprite.Sprite):
         pygame.draw.rect(surf, COLOR_PLAYER, (12, 20, 20, 16))
         return surf
 
-    def _load_image(self, filename):
-        try:
-            path = os.path.join(os.path.dirname(os.path.dirname(__file__)), filename)
-            return pygame.image.load(path).convert_alpha()
-        except Exception:
-            return None
-
     def _load_moving_sprites(self, filename):
-        try:
-            path = os.path.join(os.path.dirname(os.path.dirname(__file__)), filename)
-            sheet = pygame.image.load(path).convert_alpha()
-            fw = 64
-            fh = sheet.get_height()
-            frames = []
-            for i in range(sheet.get_width() // fw):
-                f = pygame.Surface((fw, fh), pygame.SRCALPHA)
-                f.blit(sheet, (0, 0), (i * fw, 0, fw, fh))
-                frames.append(f)
-            return frames
-        except Exception:
-            return None
-
-    def _load_sprite_sheet(self, filename, frame_size):
-        try:
-            path = os.path.join(os.path.dirname(os.path.dirname(__file__)), filename)
-            sheet = pygame.image.load(path).convert_alpha()
-            fw, fh = frame_size
-            frames = []
-            for i in range(sheet.get_width() // fw):
-                f = pygame.Surface((fw, fh), pygame.SRCALPHA)
-                f.blit(sheet, (0, 0), (i * fw, 0, fw, fh))
-                frames.append(f)
-            return frames
-        except Exception:
+        sheet = registry.image(filename)
+        if not sheet:
             return None
+        return registry.strip(filename, (64, sheet.get_height()))
 
     def move_left(self):
         self.velocity_x = -self.player_speed
@@ -152,7 +122,7 @@ class Player(pygame.sprite.Sprite):
         """Check if player is currently invincible."""
         return self.invincibility_timer > 0
 
-    def update(self):
+    def update(self, world_width=WORLD_WIDTH):
         # physics
         self.velocity_y += self.gravity
         if self.velocity_y > 15:
@@ -197,7 +167,7 @@ class Player(pygame.sprite.Sprite):
 
         if img:
             if not self.facing_right:
-                img = pygame.transform.flip(img, True, False)
+                img = registry.transforms.get(img, flip=True)
             self.image = img
             # Update rect to match current image size, but preserve position
             old_bottom = self.rect.bottom
@@ -217,8 +187,8 @@ class Player(pygame.sprite.Sprite):
         # clamp
         if self.rect.left < 0:
             self.rect.left = 0
-        if self.rect.right > SCREEN_WIDTH + 2000:
-            self.rect.right = SCREEN_WIDTH + 2000
+        if self.rect.right > world_width:
+            self.rect.right = world_width
 
         # reset flags
         if self.velocity_y > 0:
@@ -0,0 +1,204 @@
+"""
+Procedural levels - seeded chunk-by-chunk generation, streamed in around the camera
+
+A generated level is a LevelSpec with a generator instead of a fixed
+layout. Its world is cut into fixed-width chunks, and ChunkGenerator
+derives each chunk's platforms, enemies, pickups and checkpoints from the
+seed and the chunk's index alone. A ChunkStreamer keeps only the chunks
+near the camera instantiated, so a world of any width costs the same
+memory and per-tick work as a few screens of it.
+"""
+import random
+from collections import namedtuple
+from src.enemy import Enemy
+from src.platform import Platform, material_color
+from src.checkpoint import Checkpoint
+from src.weapon import WeaponPickup
+from src.level_loader import compile_spec, PlatformSpec, EnemySpec, PickupSpec
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, GEN_CHUNK_WIDTH, STREAM_MARGIN
+
+GROUND_Y = SCREEN_HEIGHT - 40  # Top of the ground, as in the hand-made levels
+GROUND_HEIGHT = 40
+ENEMY_Y = 300  # Enemy sprites are tall; this stands them on the ground
+STEP_HEIGHT = 56  # Ledge rise; below the lowest jump (HARD, ~67 px)
+MAX_GAP = 96  # Widest gap; the shortest jump (HARD) clears ~120 px
+CHECKPOINT_EVERY = 8  # Chunks between checkpoints
+
+# Enemies per chunk (low, high) at each difficulty
+ENEMIES_PER_CHUNK = {"EASY": (0, 1), "MEDIUM": (1, 2), "HARD": (2, 3)}
+
+ChunkSpec = namedtuple("ChunkSpec", "platforms enemies checkpoints pickups")
+
+
+def generated_level(seed, width, difficulty="MEDIUM", number=0, name=None, chunk_width=GEN_CHUNK_WIDTH):
+    """LevelSpec for a generated world, as a level file with a generator would give"""
+    data = {"name": name or f"Generated {seed}", "width": width,
+            "generator": {"seed": seed, "chunk_width": chunk_width}}
+    return compile_spec(data, number, difficulty)
+
+
+class ChunkGenerator:
+    """Deterministic layouts for the chunks of one generated level.
+
+    Everything in a chunk lies within its own x range, so chunks can be
+    created and dropped independently. The first chunk is flat and empty,
+    for a safe start, and so is the end of the world, for a clear run at
+    the goal.
+    """
+    def __init__(self, seed, difficulty, width, chunk_width=GEN_CHUNK_WIDTH):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.width = width
+        self.chunk_width = chunk_width
+        self.chunk_count = -(-width // chunk_width)
+
+    def chunk(self, index):
+        left = index * self.chunk_width
+        right = min(left + self.chunk_width, self.width)
+        rng = random.Random(f"{self.seed}/{index}")
+        quiet = index == 0 or right > self.width - 256
+        platforms, enemies, checkpoints, pickups = [], [], [], []
+
+        # Ground: solid stretches with jumpable gaps between them
+        segments = []
+        x = left
+        while x < right:
+            end = right if quiet else min(right, x + rng.randint(256, 640))
+            if right - end < 128:
+                end = right  # No sliver of ground too short to land on
+            segments.append((x, end))
+            platforms.append(PlatformSpec(x, GROUND_Y, end - x, GROUND_HEIGHT))
+            x = end + (rng.randint(48, MAX_GAP) if rng.random() < 0.5 else 0)
+
+        if not quiet:
+            # Stairs of ledges rising from the ground, maybe with a pickup on top
+            for _ in range(rng.randint(0, 2)):
+                start, end = rng.choice(segments)
+                if end - start < 480:
+                    continue
+                x = rng.randint(start, end - 456)  # Room for three steps
+                y = GROUND_Y
+                for _ in range(rng.randint(1, 3)):
+                    y -= STEP_HEIGHT
+                    w = rng.randint(96, 128)
+                    platforms.append(PlatformSpec(x, y, w, 20))
+                    top = (x, y, w)
+                    x += w + rng.randint(0, 24)
+                if rng.random() < 0.3:
+                    x, y, w = top
+                    pickups.append(PickupSpec(x + w // 2 - 14, y - 32, "Spiked Ball.png", 3))
+
+            low, high = ENEMIES_PER_CHUNK.get(self.difficulty, ENEMIES_PER_CHUNK["MEDIUM"])
+            abilities = list(Enemy.TYPE_SETTINGS)
+            for _ in range(rng.randint(low, high)):
+                start, end = rng.choice(segments)
+                if end - start < 200:
+                    continue
+                x = rng.randint(start, end - 64)
+                enemies.append(EnemySpec(x, ENEMY_Y, start, end, rng.choice(abilities)))
+
+        if index % CHECKPOINT_EVERY == 0 and index:
+            checkpoints.append((left + 64, GROUND_Y - 64))
+        return ChunkSpec(platforms, enemies, checkpoints, pickups)
+
+
+class _LoadedChunk:
+    # enemies and pickups hold (index in the ChunkSpec, entity) pairs
+    __slots__ = ("platforms", "enemies", "checkpoints", "pickups")
+
+    def __init__(self, platforms, enemies, checkpoints, pickups):
+        self.platforms = platforms
+        self.enemies = enemies
+        self.checkpoints = checkpoints
+        self.pickups = pickups
+
+
+class ChunkStreamer:
+    """Keeps a generated level's chunks near the camera instantiated.
+
+    Chunks within STREAM_MARGIN of the screen are built into the level's
+    platform list, spatial index, static layer, enemy pool, checkpoints and
+    pickups; chunks further away are removed again. A chunk that is
+    streamed back in is regenerated from its seed, minus the enemies killed
+    and pickups collected there before, until the level is reset.
+    """
+    def __init__(self, generator, built, projectiles, margin=STREAM_MARGIN):
+        self.generator = generator
+        self.built = built
+        self.projectiles = projectiles
+        self.margin = margin
+        self.loaded = {}  # chunk index -> _LoadedChunk
+        self.cleared = {}  # chunk index -> (killed enemy indices, collected pickup indices)
+        self._window = None
+
+    def update(self, camera_x):
+        """Load and drop chunks so the ones around camera_x are present"""
+        size = self.generator.chunk_width
+        first = max(0, (camera_x - self.margin) // size)
+        last = min(self.generator.chunk_count - 1, (camera_x + SCREEN_WIDTH + self.margin) // size)
+        if (first, last) == self._window:
+            return
+        self._window = (first, last)
+        for index in [i for i in self.loaded if not first <= i <= last]:
+            self._unload(index)
+        for index in range(first, last + 1):
+            if index not in self.loaded:
+                self._load(index)
+
+    def reset(self):
+        """Drop every chunk and stream in the start of the level again"""
+        for index in list(self.loaded):
+            self._unload(index)
+        self.cleared.clear()
+        self._window = None
+        self.update(0)
+
+    def _load(self, index):
+        spec = self.generator.chunk(index)
+        built = self.built
+        platforms = [Platform(*p) for p in spec.platforms]
+        for platform in platforms:
+            built.platforms.append(platform)
+            built.platform_index.insert(platform)
+            built.static_layer.add(platform.rect, material_color(platform.material))
+        killed, collected = self.cleared.get(index, ((), ()))
+        enemies = []
+        for i, e in enumerate(spec.enemies):
+            if i in killed:
+                continue
+            enemy = Enemy(e.x, e.y, patrol_left=e.patrol_left, patrol_right=e.patrol_right,
+                          difficulty=self.generator.difficulty, enemy_type=index * 7 + i,
+                          ability_type=e.ability_type)
+            enemy.projectiles = self.projectiles
+            built.enemy_pool.add(enemy)
+            enemies.append((i, enemy))
+        checkpoints = [Checkpoint(x, y) for x, y in spec.checkpoints]
+        built.checkpoints.extend(checkpoints)
+        pickups = [(i, WeaponPickup(p.x, p.y, filename=p.image, ammo=p.ammo))
+                   for i, p in enumerate(spec.pickups) if i not in collected]
+        built.pickups.extend(pickup for _, pickup in pickups)
+        self.loaded[index] = _LoadedChunk(platforms, enemies, checkpoints, pickups)
+
+    def _unload(self, index):
+        chunk = self.loaded.pop(index)
+        built = self.built
+        for platform in chunk.platforms:
+            built.platforms.remove(platform)
+            built.platform_index.remove(platform)
+            built.static_layer.remove(platform.rect)
+        killed, collected = self.cleared.get(index) or (set(), set())
+        pool = built.enemy_pool
+        for i, enemy in chunk.enemies:
+            if enemy.pool is pool:
+                pool.remove(enemy)
+            else:
+                killed.add(i)
+        for checkpoint in chunk.checkpoints:
+            built.checkpoints.remove(checkpoint)
+        for i, pickup in chunk.pickups:
+            if pickup in built.pickups:
+                built.pickups.remove(pickup)
+            else:
+                collected.add(i)
+        if killed or collected:  # Untouched chunks cost nothing to remember
+            self.cleared[index] = (killed, collected)
@@ -0,0 +1,208 @@
+"""
+FrameProfiler class - per-phase frame timings in a ring buffer, with an overlay and CSV export
+"""
+import csv
+import time
+import numpy as np
+import pygame
+from src.constants import PROFILE_HISTORY, SCREEN_WIDTH
+from src.ui import render_text
+
+# Instrumented phases, in the order they run within a frame
+PHASES = ("handle_events", "player_update", "level_update", "boss_update",
+          "check_collisions", "level_draw", "present")
+
+
+class _PhaseTimer:
+    """Context manager adding elapsed time to one phase of the current frame"""
+    __slots__ = ("profiler", "column", "start")
+
+    def __init__(self, profiler, column):
+        self.profiler = profiler
+        self.column = column
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.current[self.column] += time.perf_counter() - self.start
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+class NullProfiler:
+    """Stands in when nothing is being measured, e.g. a bare headless Simulation"""
+    _timer = _NullTimer()
+
+    def phase(self, name):
+        return self._timer
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class FrameProfiler:
+    """Times the phases of each frame and keeps the last `capacity` frames.
+
+    Wrap work in `with profiler.phase(name):`; a phase that runs several
+    times in one frame (a tick catching up) accumulates. end_frame() commits
+    the frame to the ring buffer along with the level's entity count.
+    """
+    def __init__(self, capacity=PROFILE_HISTORY):
+        self.capacity = capacity
+        self.times = np.zeros((capacity, len(PHASES)))  # Seconds per phase
+        self.frame_times = np.zeros(capacity)  # Wall time of the whole frame
+        self.entities = np.zeros(capacity, dtype=np.int64)
+        self.frames = 0  # Frames recorded in total; the ring holds the latest
+        self.current = [0.0] * len(PHASES)
+        self._timers = {name: _PhaseTimer(self, i) for i, name in enumerate(PHASES)}
+        self._frame_start = time.perf_counter()
+        self._cprofile = None
+        self._cprofile_frames = 0
+
+    def phase(self, name):
+        return self._timers[name]
+
+    def end_frame(self, entity_count=0):
+        now = time.perf_counter()
+        row = self.frames % self.capacity
+        self.times[row] = self.current
+        self.frame_times[row] = now - self._frame_start
+        self.entities[row] = entity_count
+        self.frames += 1
+        self.current = [0.0] * len(PHASES)
+        self._frame_start = now
+
+        if self._cprofile:
+            self._cprofile_frames -= 1
+            if self._cprofile_frames <= 0:
+                self._finish_cprofile()
+
+    def _recorded(self):
+        """Row indices of the recorded frames, oldest first"""
+        count = min(self.frames, self.capacity)
+        start = self.frames - count
+        return np.arange(start, self.frames) % self.capacity
+
+    def percentiles(self, q=(50, 95, 99)):
+        """{phase: [ms at each percentile]}, plus "frame" for whole frames"""
+        rows = self._recorded()
+        if len(rows) == 0:
+            return {}
+        result = {}
+        for i, name in enumerate(PHASES):
+            result[name] = np.percentile(self.times[rows, i], q).tolist()
+        result["frame"] = np.percentile(self.frame_times[rows], q).tolist()
+        return {name: [v * 1000 for v in values] for name, values in result.items()}
+
+    def summary_lines(self):
+        """Overlay text: one line per phase with p50/p95/p99 in milliseconds"""
+        lines = [f"{'phase':<17}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name, (p50, p95, p99) in self.percentiles().items():
+            lines.append(f"{name:<17}{p50:7.2f}{p95:7.2f}{p99:7.2f}")
+        return lines
+
+    def write_csv(self, path):
+        """Dump the recorded frames, oldest first, with times in milliseconds"""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", *PHASES, "frame_ms", "entities"])
+            first = self.frames - len(self._recorded())
+            for n, row in enumerate(self._recorded(), start=first):
+                writer.writerow([n, *(f"{t * 1000:.4f}" for t in self.times[row]),
+                                 f"{self.frame_times[row] * 1000:.4f}", self.entities[row]])
+
+    @property
+    def cprofiling(self):
+        return self._cprofile is not None
+
+    def start_cprofile(self, frames, path):
+        """Run cProfile over the next `frames` frames, then save stats to path"""
+        if self._cprofile:
+            return
+        import cProfile  # Rarely used, so kept out of startup
+        self._cprofile = cProfile.Profile()
+        self._cprofile_frames = frames
+        self._cprofile_path = path
+        self._cprofile.enable()
+
+    def _finish_cprofile(self):
+        import io
+        import pstats
+        profile = self._cprofile
+        profile.disable()
+        self._cprofile = None
+        profile.dump_stats(self._cprofile_path)
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(20)
+        print(f"cProfile stats written to {self._cprofile_path}")
+        print(out.getvalue())
+
+
+class StartupTrace:
+    """Wall-clock marks from process start to the first frame, for --trace-startup"""
+    def __init__(self, start):
+        self.start = start  # perf_counter() taken before the first import
+        self.marks = []  # (name, seconds since start)
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter() - self.start))
+
+    def report(self):
+        previous = 0.0
+        for name, at in self.marks:
+            print(f"{name:<16}{(at - previous) * 1000:8.1f} ms  (total {at * 1000:7.1f} ms)")
+            previous = at
+
+
+class ProfilerOverlay:
+    """Translucent panel with the profiler's percentiles and live entity counts.
+
+    The panel is rebuilt every `refresh` frames rather than every frame, so
+    showing it barely disturbs what it measures.
+    """
+    def __init__(self, profiler, refresh=30):
+        self.profiler = profiler
+        self.refresh = refresh
+        self.visible = False
+        self._font = None  # Created on first show
+        self._panel = None
+        self._age = 0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._panel = None
+
+    def _build(self, counts, glyph_renders):
+        if self._font is None:
+            self._font = pygame.font.SysFont("monospace", 14)
+        lines = self.profiler.summary_lines()
+        lines.append(" ".join(f"{k}:{v}" for k, v in counts.items()))
+        lines.append(f"glyph renders/frame: {glyph_renders}")
+        rendered = [render_text(self._font, line, (255, 255, 255)) for line in lines]
+        height = self._font.get_linesize()
+        width = max(r.get_width() for r in rendered)
+        panel = pygame.Surface((width + 12, height * len(rendered) + 12), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, r in enumerate(rendered):
+            panel.blit(r, (6, 6 + i * height))
+        return panel
+
+    def draw(self, surface, counts, glyph_renders=0):
+        """Draw the panel if visible; returns the screen rects drawn to"""
+        if not self.visible:
+            return []
+        self._age += 1
+        if self._panel is None or self._age >= self.refresh:
+            self._panel = self._build(counts, glyph_renders)
+            self._age = 0
+        return [surface.blit(self._panel, (SCREEN_WIDTH - self._panel.get_width() - 10, 40))]
@@ -1,52 +1,131 @@
 """
-Projectile class - represents projectiles fired by ranged enemies
+ProjectilePool class - level-wide pooled storage for enemy projectiles
 """
+import numpy as np
 import pygame
-import os
-from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT
-
-
-class Projectile(pygame.sprite.Sprite):
-    def __init__(self, x, y, direction=1, speed=5):
-        super().__init__()
-        
-        # Try to load sprite, fall back to circle
-        self.image = self._load_image()
-        if not self.image:
-            self.image = pygame.Surface((8, 8), pygame.SRCALPHA)
-            pygame.draw.circle(self.image, (255, 200, 0), (4, 4), 4)
-        
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
-        
-        self.direction = direction
-        self.speed = speed
-        self.lifetime = 300  # Frames before projectile disappears
-    
-    def _load_image(self):
-        """Try to load projectile sprite from file"""
-        try:
-            # Try different projectile image names
-            for filename in ["fireball.png", "projectile.png", "shot.png"]:
-                path = os.path.join(os.path.dirname(os.path.dirname(__file__)), filename)
-                if os.path.exists(path):
-                    return pygame.image.load(path).convert_alpha()
-        except Exception:
-            pass
-        return None
-    
-    def update(self):
-        """Update projectile position"""
-        self.rect.x += self.speed * self.direction
-        self.lifetime -= 1
-        
-        # Remove if off-screen or lifetime expired
-        if self.lifetime <= 0 or self.rect.left > SCREEN_WIDTH + 200 or self.rect.right < -200:
-            self.kill()
-    
-    def draw(self, surface, camera_offset=0):
-        """Draw projectile on screen with camera offset"""
-        draw_x = self.rect.x - camera_offset
-        if -50 <= draw_x <= SCREEN_WIDTH + 50:
-            surface.blit(self.image, (draw_x, self.rect.y))
+from src.assets import registry
+from src.constants import (
+    SCREEN_WIDTH, MAX_PROJECTILES, PROJECTILE_LIFETIME, PROJECTILE_CULL_MARGIN,
+    INTERPOLATION_SNAP_DISTANCE
+)
+
+
+def _create_fallback_sprite():
+    image = pygame.Surface((8, 8), pygame.SRCALPHA)
+    pygame.draw.circle(image, (255, 200, 0), (4, 4), 4)
+    return image
+
+
+def projectile_image():
+    """Shared projectile sprite: the first projectile image found, else a circle"""
+    # Try different projectile image names
+    image = registry.first_image(["fireball.png", "projectile.png", "shot.png"])
+    return image or registry.generated("projectile", _create_fallback_sprite)
+
+
+class ProjectilePool:
+    """Every live projectile in a level, in fixed-capacity parallel arrays.
+
+    Ranged enemies spawn into a free slot; a slot is released when its
+    projectile's lifetime runs out, it leaves the camera window by more than
+    PROJECTILE_CULL_MARGIN, it hits a platform, or it hits the player. When
+    the pool is full new shots are dropped, so a long session can never grow
+    it. live and peak report current and highest occupancy.
+    """
+    def __init__(self, capacity=MAX_PROJECTILES):
+        self.capacity = capacity
+        self.image = projectile_image()
+        self.width, self.height = self.image.get_size()
+        self.x = np.zeros(capacity, dtype=np.int64)
+        self.prev_x = np.zeros(capacity, dtype=np.int64)
+        self.y = np.zeros(capacity, dtype=np.int64)
+        self.velocity = np.zeros(capacity, dtype=np.int64)  # speed * direction
+        self.lifetime = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self._free = list(range(capacity - 1, -1, -1))  # Stack of free slots
+        self.peak = 0
+        self.dropped = 0  # Shots lost because the pool was full
+
+    @property
+    def live(self):
+        return self.capacity - len(self._free)
+
+    def spawn(self, x, y, direction=1, speed=5):
+        """Start a projectile with its top-left at (x, y); returns its slot or None if full"""
+        if not self._free:
+            self.dropped += 1
+            return None
+        slot = self._free.pop()
+        self.x[slot] = self.prev_x[slot] = x
+        self.y[slot] = y
+        self.velocity[slot] = speed * direction
+        self.lifetime[slot] = PROJECTILE_LIFETIME
+        self.alive[slot] = True
+        self.peak = max(self.peak, self.live)
+        return slot
+
+    def free(self, slot):
+        if self.alive[slot]:
+            self.alive[slot] = False
+            self._free.append(slot)
+
+    def clear(self):
+        self.alive[:] = False
+        self._free[:] = range(self.capacity - 1, -1, -1)
+
+    def live_slots(self):
+        return np.flatnonzero(self.alive)
+
+    def store_previous_positions(self):
+        np.copyto(self.prev_x, self.x)
+
+    def update(self, camera_x, platform_index=None):
+        """Move every projectile, then free the expired, culled and blocked ones"""
+        alive = self.alive
+        if not alive.any():
+            return
+        self.x[alive] += self.velocity[alive]
+        self.lifetime[alive] -= 1
+
+        # Camera-relative culling: anything well outside the view is gone for good
+        left = camera_x - PROJECTILE_CULL_MARGIN
+        right = camera_x + SCREEN_WIDTH + PROJECTILE_CULL_MARGIN
+        expired = alive & ((self.lifetime <= 0) | (self.x > right) | (self.x + self.width < left))
+        for slot in np.flatnonzero(expired).tolist():
+            self.free(slot)
+
+        if platform_index is not None:
+            rect = pygame.Rect(0, 0, self.width, self.height)
+            for slot in self.live_slots().tolist():
+                rect.topleft = (self.x[slot], self.y[slot])
+                for platform in platform_index.query(rect):
+                    if rect.colliderect(platform.rect):
+                        self.free(slot)
+                        break
+
+    def hits(self, rect):
+        """Slots of live projectiles overlapping rect, in slot order"""
+        x, y = self.x, self.y
+        mask = (self.alive & (x < rect.right) & (x + self.width > rect.left)
+                & (y < rect.bottom) & (y + self.height > rect.top))
+        return np.flatnonzero(mask).tolist()
+
+    def draw(self, surface, camera_offset=0, alpha=1.0):
+        """Draw live projectiles near the camera, blended between ticks.
+
+        Returns the screen rects drawn to.
+        """
+        drawn = []
+        slots = np.flatnonzero(self.alive & (self.x - camera_offset >= -50)
+                               & (self.x - camera_offset <= SCREEN_WIDTH + 50))
+        for slot in slots.tolist():
+            x = self.x[slot].item()
+            prev_x = self.prev_x[slot].item()
+            if alpha < 1.0 and abs(x - prev_x) <= INTERPOLATION_SNAP_DISTANCE:
+                x = round(prev_x + (x - prev_x) * alpha)
+            drawn.append(surface.blit(self.image, (x - camera_offset, self.y[slot].item())))
+        return drawn
+
+    def stats(self):
+        return {"live": self.live, "peak": self.peak, "capacity": self.capacity,
+                "dropped": self.dropped}
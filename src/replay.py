@@ -0,0 +1,190 @@
+"""
+Input recording and replay - compact, stream-decodable logs of what the player did
+
+A recording is a header followed by records, all byte-aligned:
+
+    header   b"PREC", version byte, seed (uvarint)
+    0x00-7F  run of ticks with the same input: bits 0-4 are the input mask
+             (left, right, jump, attack, reset), bits 5-6 the run length
+             1-3, or 0 for a longer run followed by uvarint(ticks - 4)
+    0x80-82  start: the player picked a difficulty (index into DIFFICULTIES)
+    0x88     restart: the current level was restarted (Simulation.restart)
+    0x90     digest: crc32 of the simulation so far, 4 bytes little endian
+    0xFF     end of recording
+
+Held keys form long runs and presses short ones of a byte each, so a
+typical second of play costs a few bytes.
+
+Records are decoded one at a time from any readable binary stream, so a
+recording can be replayed, or inspected, while it is still being written.
+"""
+import struct
+from src.simulation import Simulation
+from src.inputs import InputState
+
+MAGIC = b"PREC"
+VERSION = 1
+DIFFICULTIES = ("EASY", "MEDIUM", "HARD")
+
+START = 0x80
+RESTART = 0x88
+DIGEST = 0x90
+END = 0xFF
+_MASK_BITS = 0x1F
+_SHORT_RUN = 3  # Longest run stored in the record byte itself
+
+
+class ReplayError(ValueError):
+    """Raised for a malformed recording, or a replay that diverges from it"""
+
+
+def pack_inputs(inputs):
+    """InputState -> 5-bit mask"""
+    return (inputs.left | inputs.right << 1 | inputs.jump << 2
+            | inputs.attack << 3 | inputs.reset << 4)
+
+
+def unpack_inputs(mask):
+    """5-bit mask -> InputState"""
+    return InputState(*(bool(mask >> bit & 1) for bit in range(5)))
+
+
+def _write_uvarint(f, value):
+    while value >= 0x80:
+        f.write(bytes((value & 0x7F | 0x80,)))
+        value >>= 7
+    f.write(bytes((value,)))
+
+
+def _read_byte(f):
+    b = f.read(1)
+    if not b:
+        raise ReplayError("recording ends without an end record")
+    return b[0]
+
+
+def _read_uvarint(f):
+    value = shift = 0
+    while True:
+        b = _read_byte(f)
+        value |= (b & 0x7F) << shift
+        if b < 0x80:
+            return value
+        shift += 7
+
+
+class InputRecorder:
+    """Writes the inputs of every tick, run-length encoded, to a binary stream.
+
+    Call start() whenever a game starts, tick() with the InputState of every
+    simulation step and close() at the end. Passing the Simulation to
+    start() and close() stores digests that replays are checked against.
+    """
+    def __init__(self, stream, seed=0):
+        self.stream = stream
+        self.seed = seed
+        self.ticks = 0
+        self._mask = None
+        self._run = 0
+        stream.write(MAGIC + bytes((VERSION,)))
+        _write_uvarint(stream, seed)
+
+    def _flush_run(self):
+        if self._run <= 0:
+            return
+        if self._run <= _SHORT_RUN:
+            self.stream.write(bytes((self._mask | self._run << 5,)))
+        else:
+            self.stream.write(bytes((self._mask,)))
+            _write_uvarint(self.stream, self._run - _SHORT_RUN - 1)
+        self._run = 0
+
+    def _write_digest(self, sim):
+        self._flush_run()
+        self.stream.write(bytes((DIGEST,)) + struct.pack("<I", sim.state_digest()))
+
+    def start(self, difficulty, previous_sim=None):
+        if previous_sim is not None:
+            self._write_digest(previous_sim)
+        self._flush_run()
+        self.stream.write(bytes((START | DIFFICULTIES.index(difficulty),)))
+
+    def restart(self, sim):
+        self._write_digest(sim)
+        self.stream.write(bytes((RESTART,)))
+
+    def tick(self, inputs):
+        mask = pack_inputs(inputs)
+        if mask != self._mask:
+            self._flush_run()
+            self._mask = mask
+        self._run += 1
+        self.ticks += 1
+
+    def close(self, sim=None):
+        if sim is not None:
+            self._write_digest(sim)
+        self._flush_run()
+        self.stream.write(bytes((END,)))
+        self.stream.flush()
+
+
+def read_header(stream):
+    """Check the header and return the recording's seed"""
+    if stream.read(4) != MAGIC:
+        raise ReplayError("not an input recording")
+    version = _read_byte(stream)
+    if version != VERSION:
+        raise ReplayError(f"unsupported recording version {version}")
+    return _read_uvarint(stream)
+
+
+def read_events(stream):
+    """Yield ("start", difficulty), ("restart", None), ("tick", InputState) or
+    ("digest", crc) in order.
+
+    Call read_header() first. Runs are expanded into one event per tick.
+    """
+    while True:
+        code = _read_byte(stream)
+        if code < START:
+            inputs = unpack_inputs(code & _MASK_BITS)
+            run = code >> 5 or _read_uvarint(stream) + _SHORT_RUN + 1
+            for _ in range(run):
+                yield "tick", inputs
+        elif START <= code < START + len(DIFFICULTIES):
+            yield "start", DIFFICULTIES[code - START]
+        elif code == RESTART:
+            yield "restart", None
+        elif code == DIGEST:
+            data = stream.read(4)
+            if len(data) != 4:
+                raise ReplayError("truncated digest")
+            yield "digest", struct.unpack("<I", data)[0]
+        elif code == END:
+            return
+        else:
+            raise ReplayError(f"unknown record 0x{code:02x}")
+
+
+def replay(stream):
+    """Re-run a recording headlessly; returns the final Simulation.
+
+    Raises ReplayError if the simulation ever disagrees with a stored digest.
+    """
+    seed = read_header(stream)
+    sim = None
+    for kind, value in read_events(stream):
+        if kind == "start":
+            sim = Simulation(value, seed=seed, preload=False)
+        elif kind == "restart":
+            if sim is None:
+                raise ReplayError("restart before any game was started")
+            sim.restart()
+        elif kind == "tick":
+            if sim is None:
+                raise ReplayError("input before any game was started")
+            sim.step(value)
+        elif sim is None or sim.state_digest() != value:
+            raise ReplayError(f"replay diverged at tick {sim.tick if sim else 0}")
+    return sim
@@ -0,0 +1,239 @@
+"""
+Simulation class - headless game logic advanced one tick at a time
+"""
+import struct
+import zlib
+from src.inputs import NO_INPUT
+from src.player import Player
+from src.enemy import Enemy
+from src.level import Level
+from src.profiler import NULL_PROFILER
+from src.snapshot import capture, restore
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, INTERPOLATION_SNAP_DISTANCE
+
+
+class Simulation:
+    """Game rules for one playthrough, with no window, clock or fonts.
+
+    step() advances exactly one tick from an explicit InputState, so the
+    game can run uncapped for tests, bots and benchmarks, while Game only
+    polls input and draws the result.
+    """
+    def __init__(self, difficulty="MEDIUM", seed=0, preload=False):
+        self.difficulty = difficulty
+        self.seed = seed  # Only recorded, e.g. in replay headers: game logic has no randomness
+        self.level = Level(difficulty, preload=preload)
+        self.player = Player(64, 300, difficulty)
+        self._pristine_player = capture(self.player)
+        self.camera_x = 0  # Camera position for side-scrolling
+        self.prev_camera_x = 0  # Camera position before the last tick, for interpolation
+        self.state = "PLAYING"  # PLAYING, LOADING, GAME_OVER or GAME_COMPLETE
+        self.tick = 0
+        self.death_cause = None  # Ability type of the enemy that dealt the final hit, or "boss"
+        self.profiler = NULL_PROFILER  # Game swaps in its FrameProfiler
+
+    def step(self, inputs=NO_INPUT):
+        """Advance the game by one tick and return the resulting state.
+
+        Reaching the goal leaves the state LOADING until the next step, which
+        first switches to the next level. Callers that must not block can
+        wait for next_level_ready() before stepping.
+        """
+        if self.state == "LOADING":
+            self.enter_next_level()
+        elif self.state != "PLAYING":
+            return self.state
+
+        self.store_previous_positions()
+
+        if inputs.jump:
+            self.player.jump()
+        if inputs.attack:
+            self.player.attack()
+        if inputs.reset:
+            self.player.reset()
+        if inputs.left:
+            self.player.move_left()
+        if inputs.right:
+            self.player.move_right()
+
+        profiler = self.profiler
+        with profiler.phase("player_update"):
+            self.player.update(self.level.width)
+        with profiler.phase("level_update"):
+            self.level.update()
+
+        # Update boss
+        if self.level.boss:
+            with profiler.phase("boss_update"):
+                self.level.boss.update()
+
+        # Update camera
+        self.update_camera()
+
+        # Check collisions
+        with profiler.phase("check_collisions"):
+            self.check_collisions()
+
+        # Check if player fell off the map
+        if self.player.rect.top > SCREEN_HEIGHT:
+            self.player.reset()
+
+        # Drop entities that died this tick
+        self.level.end_tick()
+
+        self.tick += 1
+        return self.state
+
+    def restart(self, level_num=None):
+        """Warm restart from the start of a level (default: the current one).
+
+        The level's entities and the player are reset in place to their
+        freshly built state, so this is equivalent to a new Simulation that
+        has reached that level, without constructing or loading anything.
+        """
+        if level_num:
+            self.level.load_level(level_num)
+        else:
+            self.level.reload()
+        restore(self.player, self._pristine_player)
+        self.camera_x = 0
+        self.level.set_camera_offset(0)
+        self.state = "PLAYING"
+        self.tick = 0
+        self.death_cause = None
+        self.store_previous_positions()
+
+    def next_level_ready(self):
+        """True if the next level has been built, so switching to it won't stall"""
+        return self.level.level_ready(self.level.next_level_number())
+
+    def enter_next_level(self):
+        """Swap in the next level, waiting for the preloader if it is still building it"""
+        self.level.load_next_level()
+        self.player.reset()
+        self.state = "PLAYING"
+
+    def store_previous_positions(self):
+        """Remember pre-tick positions so the renderer can blend between ticks"""
+        self.prev_camera_x = self.camera_x
+        self.player.prev_pos = self.player.rect.topleft
+        self.level.store_previous_positions()
+
+    def state_digest(self):
+        """CRC32 of the state that matters for determinism, for replay checks"""
+        player = self.player
+        level = self.level
+        level.enemy_pool.wake_all()  # Bring sleeping enemies up to date
+        digest = zlib.crc32(struct.pack(
+            "<qqqdqqqqq", self.tick, level.current_level, player.rect.x, player.velocity_y,
+            player.rect.y, player.health, player.ammo, len(level.enemy_pool), level.projectiles.live))
+        digest = zlib.crc32(level.enemy_pool.column("x").tobytes(), digest)
+        return zlib.crc32(level.projectiles.x[level.projectiles.alive].tobytes(), digest)
+
+    def interpolated_camera_x(self, alpha):
+        """Camera position blended between the last two ticks"""
+        if abs(self.camera_x - self.prev_camera_x) > INTERPOLATION_SNAP_DISTANCE:
+            return self.camera_x
+        return round(self.prev_camera_x + (self.camera_x - self.prev_camera_x) * alpha)
+
+    def update_camera(self):
+        """Update camera to follow player"""
+        # Keep player roughly centered on screen (1/3 from left)
+        target_x = self.player.rect.centerx - SCREEN_WIDTH // 3
+
+        # Smooth camera movement
+        self.camera_x = max(0, min(target_x, self.level.width - SCREEN_WIDTH))
+
+        # Update player and all objects based on camera position
+        self.level.set_camera_offset(self.camera_x)
+
+    def _damage_player(self, source):
+        """Apply one point of damage and end the game if the player died"""
+        if self.player.take_damage(1):
+            self.state = "GAME_OVER"
+            self.death_cause = source
+
+    def check_collisions(self):
+        """Check collisions between player and level elements"""
+        # Check collision with platforms near the player. Resolving one overlap can
+        # push the player by up to its own size, so widen the query to cover that.
+        player_rect = self.player.rect
+        nearby = player_rect.inflate(player_rect.width * 2, player_rect.height * 2)
+        for platform in self.level.platforms_near(nearby):
+            self.player.check_collision(platform)
+
+        # Check collision with weapon pickups
+        pickups = self.level.pickups
+        for i in range(len(pickups) - 1, -1, -1):
+            pickup = pickups[i]
+            if self.player.rect.colliderect(pickup.rect):
+                self.player.weapon = "spiked_ball"
+                self.player.ammo += pickup.ammo
+                self.level.remove_pickup(i)
+
+        # Check collision with checkpoints
+        for checkpoint in self.level.checkpoints:
+            if self.player.rect.colliderect(checkpoint.rect):
+                checkpoint.activate()
+
+        # Check player attack collisions (weapon attack hit detection)
+        pool = self.level.enemy_pool
+        attack_rect = self.player.get_attack_rect()
+        if attack_rect:
+            # Check if attack hits enemies
+            for i in pool.body_hits(attack_rect):
+                self.level.despawn_enemy(pool[i])
+            # Check if attack hits boss
+            if self.level.boss and not self.level.boss.is_defeated():
+                if attack_rect.colliderect(self.level.boss.rect):
+                    self.level.boss.take_damage(1)
+
+        # Enemy detection and attack logic, batched over the whole pool
+        player_rect = self.player.rect
+        pool.steer_and_attack(player_rect)
+
+        # Check attack collision (melee attacks)
+        hits = pool.melee_hits(player_rect)
+        if hits.any() and not self.player.is_invincible():
+            self._damage_player(pool[int(hits.argmax())].ability_type)
+
+        # Move projectiles, dropping expired, off-camera and blocked ones
+        projectiles = self.level.projectiles
+        projectiles.update(self.camera_x, self.level.platform_index)
+
+        # Check projectile collisions (ranged enemies)
+        for slot in projectiles.hits(player_rect):
+            if not self.player.is_invincible():
+                self._damage_player(Enemy.RANGED)  # Only ranged enemies shoot
+                projectiles.free(slot)
+
+        # Check player stomp collision (jumping on enemy)
+        for i in pool.body_hits(player_rect):
+            enemy = pool[i]
+            if self.player.velocity_y > 0 and self.player.rect.bottom < enemy.rect.centery:
+                # Player jumped on enemy
+                self.level.despawn_enemy(enemy)
+                self.player.velocity_y = -15
+
+        # Check collision with boss
+        if self.level.boss and not self.level.boss.is_defeated():
+            if self.player.rect.colliderect(self.level.boss.rect):
+                if self.player.velocity_y > 0 and self.player.rect.bottom < self.level.boss.rect.centery:
+                    # Player jumped on boss
+                    self.level.boss.take_damage(1)
+                    self.player.velocity_y = -15
+                else:
+                    # Player hit by boss
+                    if not self.player.is_invincible():
+                        self._damage_player("boss")
+
+        # Check collision with goal (only if boss is defeated or no boss)
+        if self.level.goal and self.player.rect.colliderect(self.level.goal):
+            if not self.level.boss or self.level.boss.is_defeated():
+                if self.level.has_next_level():
+                    # Switched at the start of the next step, once it is built
+                    self.state = "LOADING"
+                else:
+                    # Game complete!
+                    self.state = "GAME_COMPLETE"
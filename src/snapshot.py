@@ -0,0 +1,26 @@
+"""
+Snapshot helpers - capture an entity's attributes once and restore them in place
+"""
+import pygame
+
+
+def capture(obj):
+    """Copy of obj's instance attributes.
+
+    Rects are copied; everything else (numbers, flags, shared frames) is
+    kept by reference, so objects whose attributes are mutated in place
+    other than through a Rect need their own handling.
+    """
+    return {name: value.copy() if isinstance(value, pygame.Rect) else value
+            for name, value in vars(obj).items() if not name.startswith("_Sprite__")}
+
+
+def restore(obj, state):
+    """Return obj to a captured state, updating its Rects in place"""
+    attrs = vars(obj)
+    for name, value in state.items():
+        current = attrs.get(name)
+        if isinstance(value, pygame.Rect) and isinstance(current, pygame.Rect):
+            current.update(value)
+        else:
+            attrs[name] = value
@@ -0,0 +1,83 @@
+"""
+Spatial hash - uniform grid index used as a collision broadphase
+"""
+
+# Grid cell size in pixels; roughly the size of a typical ledge
+CELL_SIZE = 128
+
+
+class SpatialHash:
+    """Uniform grid of cells, each listing the items whose rect overlaps it.
+
+    Queries only look at the cells a rect covers, so their cost depends on
+    how crowded that neighbourhood is rather than on the size of the level.
+    Results come back in insertion order so collision resolution stays the
+    same as a linear scan over the original list.
+    """
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = {}   # (cx, cy) -> list of (order, item)
+        self._order = {}   # id(item) -> insertion order
+        self._next_order = 0
+
+    def __len__(self):
+        return len(self._order)
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, (rect.right - 1) // size,
+                rect.top // size, (rect.bottom - 1) // size)
+
+    def insert(self, item, rect=None):
+        """Add item to every cell its rect (item.rect by default) overlaps."""
+        if rect is None:
+            rect = item.rect
+        order = self._next_order
+        self._next_order += 1
+        self._order[id(item)] = order
+        x0, x1, y0, y1 = self._cell_range(rect)
+        cells = self._cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [(order, item)]
+                else:
+                    bucket.append((order, item))
+
+    def remove(self, item, rect=None):
+        """Remove item from the cells covered by rect (item.rect by default)."""
+        if rect is None:
+            rect = item.rect
+        if self._order.pop(id(item), None) is None:
+            return
+        x0, x1, y0, y1 = self._cell_range(rect)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                bucket[:] = [entry for entry in bucket if entry[1] is not item]
+                if not bucket:
+                    del self._cells[(cx, cy)]
+
+    def query(self, rect):
+        """Return the items in every cell rect overlaps, in insertion order."""
+        x0, x1, y0, y1 = self._cell_range(rect)
+        cells = self._cells
+        if x0 == x1 and y0 == y1:
+            bucket = cells.get((x0, y0))
+            return [item for _, item in bucket] if bucket else []
+        found = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    for order, item in bucket:
+                        found[order] = item
+        return [found[order] for order in sorted(found)]
+
+    def clear(self):
+        self._cells.clear()
+        self._order.clear()
+        self._next_order = 0
@@ -0,0 +1,140 @@
+"""
+StaticChunkLayer class - level background and static geometry baked into chunks
+"""
+import pygame
+from src.constants import SCREEN_HEIGHT, COLOR_BACKGROUND, CHUNK_WIDTH, DIRECT_FILL_PIECES
+
+
+class StaticChunkLayer:
+    """Pre-rendered, fixed-width strips of the level's static scenery.
+
+    Static pieces (platforms now, tileset terrain later) are registered
+    with the chunks they overlap when a level loads. Each chunk is rendered
+    once, the first time the camera reaches it, onto a surface that already
+    has the background in it. Drawing a frame then costs one or two blits
+    however many ledges the level has. The chunks of a level's first screen
+    are baked by prebake() while the level is built; the rest wait for the
+    first draw. Nothing is baked without a display, so headless simulations
+    never pay for it. A chunk of only a few
+    plain color pieces is never baked: filling them straight onto the
+    screen is cheaper than blitting a whole strip.
+    """
+    def __init__(self, chunk_width=CHUNK_WIDTH, height=SCREEN_HEIGHT, background=COLOR_BACKGROUND):
+        self.chunk_width = chunk_width
+        self.height = height
+        self.background = background
+        self._pieces = {}  # chunk index -> list of (rect, image, tiled)
+        self._chunks = {}  # chunk index -> baked Surface
+
+    def clear(self):
+        self._pieces.clear()
+        self._chunks.clear()
+
+    def add(self, rect, image, tiled=False):
+        """Register a static piece; a tiled image repeats to fill rect, and a
+        color instead of an image fills it"""
+        rect = pygame.Rect(rect)
+        first = rect.left // self.chunk_width
+        last = (rect.right - 1) // self.chunk_width
+        for index in range(first, last + 1):
+            self._pieces.setdefault(index, []).append((rect, image, tiled))
+            # Anything already baked for this chunk is now stale
+            self._chunks.pop(index, None)
+
+    def evict(self):
+        """Drop the baked chunks but keep the pieces, so they are rebaked on the next draw"""
+        self._chunks.clear()
+
+    def remove(self, rect):
+        """Unregister the pieces added with rect, for levels that stream their geometry"""
+        rect = pygame.Rect(rect)
+        first = rect.left // self.chunk_width
+        last = (rect.right - 1) // self.chunk_width
+        for index in range(first, last + 1):
+            pieces = self._pieces.get(index)
+            if pieces is None:
+                continue
+            pieces[:] = [piece for piece in pieces if piece[0] != rect]
+            if not pieces:
+                del self._pieces[index]
+            self._chunks.pop(index, None)
+    
+    def prebake(self, left, right):
+        """Bake the chunks that drawing between left and right will need, so the
+        first frame there doesn't pay for them. Without a display this does
+        nothing, so headless simulations still never bake."""
+        if not (pygame.display.get_init() and pygame.display.get_surface() is not None):
+            return
+        for index in range(left // self.chunk_width, (right - 1) // self.chunk_width + 1):
+            if index not in self._chunks and not self._direct(index):
+                self._bake(index)
+
+    def _direct(self, index):
+        """True if the chunk is cheaper to fill piece by piece than to bake"""
+        pieces = self._pieces.get(index, ())
+        return (len(pieces) <= DIRECT_FILL_PIECES
+                and not any(isinstance(image, pygame.Surface) for _, image, _ in pieces))
+
+    def _bake(self, index):
+        chunk = pygame.Surface((self.chunk_width, self.height))
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            chunk = chunk.convert()
+        chunk.fill(self.background)
+        origin_x = index * self.chunk_width
+        for rect, image, tiled in self._pieces.get(index, ()):
+            local = rect.move(-origin_x, 0)
+            if not isinstance(image, pygame.Surface):
+                # fill() shifts, rather than clips, rects that start left of 0
+                chunk.fill(image, local.clip(chunk.get_rect()))
+                continue
+            if not tiled:
+                chunk.blit(image, local)
+                continue
+            # Clip to the piece so partial tiles at its edges don't spill over
+            chunk.set_clip(local)
+            tile_w, tile_h = image.get_size()
+            for y in range(local.top, local.bottom, tile_h):
+                for x in range(local.left, local.right, tile_w):
+                    chunk.blit(image, (x, y))
+            chunk.set_clip(None)
+        self._chunks[index] = chunk
+        return chunk
+
+    def draw(self, surface, camera_offset=0, area=None):
+        """Blit the chunks that intersect the camera, baking any not yet built.
+
+        area limits drawing to one screen rect, for restoring the background
+        behind something that moved.
+        """
+        # fill() shifts, rather than clips, rects that start outside the surface
+        area = surface.get_rect() if area is None else area.clip(surface.get_rect())
+        first = (camera_offset + area.left) // self.chunk_width
+        last = (camera_offset + area.right - 1) // self.chunk_width
+        runs = []  # [screen rect, {id(rect): piece}] of neighbouring chunks to fill directly
+        for index in range(first, last + 1):
+            chunk_x = index * self.chunk_width - camera_offset
+            piece = area.clip(chunk_x, 0, self.chunk_width, self.height)
+            if not piece:
+                continue
+            chunk = self._chunks.get(index)
+            if chunk is None and self._direct(index):
+                # One background fill per run: narrow fills cost more per pixel
+                if runs and runs[-1][0].right == piece.left:
+                    runs[-1][0].union_ip(piece)
+                else:
+                    runs.append([piece, {}])
+                for entry in self._pieces.get(index, ()):
+                    # A piece across several chunks shares one rect between them
+                    runs[-1][1].setdefault(id(entry[0]), entry)
+                continue
+            chunk = chunk or self._bake(index)
+            surface.blit(chunk, piece.topleft, piece.move(-chunk_x, 0))
+        for run, pieces in runs:
+            surface.fill(self.background, run)
+            for rect, color, _ in pieces.values():
+                part = run.clip(rect.move(-camera_offset, 0))
+                if part:
+                    surface.fill(color, part)
+
+    def baked_chunks(self):
+        return len(self._chunks)
@@ -0,0 +1,133 @@
+"""
+Retained-mode UI widgets - labels, bars and buttons that cache their rendered surfaces
+"""
+import pygame
+
+
+class RenderStats:
+    """Counts text renders (font.render calls), per frame and in total"""
+    def __init__(self):
+        self.glyph_renders = 0  # This frame
+        self.last_frame = 0  # Previous frame, complete
+        self.total = 0
+
+    def begin_frame(self):
+        self.last_frame = self.glyph_renders
+        self.glyph_renders = 0
+
+    def count(self):
+        self.glyph_renders += 1
+        self.total += 1
+
+
+# Process-wide counter shared by every widget
+stats = RenderStats()
+
+
+def render_text(font, text, color):
+    """font.render with antialiasing, counted in stats"""
+    stats.count()
+    return font.render(text, True, color)
+
+
+class Label:
+    """A line of text that is only re-rendered when its text or color changes.
+
+    pos is the top-left corner, or the top-center with center=True.
+    """
+    def __init__(self, font, pos, text="", color=(0, 0, 0), center=False):
+        self.font = font
+        self.pos = pos
+        self.center = center
+        self.text = text
+        self.color = color
+        self._surface = None
+
+    def set(self, text, color=None):
+        """Bind a new value; re-rendering waits until the next draw"""
+        color = self.color if color is None else color
+        if text != self.text or color != self.color:
+            self.text = text
+            self.color = color
+            self._surface = None
+
+    @property
+    def surface(self):
+        if self._surface is None:
+            self._surface = render_text(self.font, self.text, self.color)
+        return self._surface
+
+    def draw(self, surface):
+        """Blit the cached text; returns the screen rect drawn to"""
+        image = self.surface
+        x, y = self.pos
+        if self.center:
+            x -= image.get_width() // 2
+        return surface.blit(image, (x, y))
+
+
+class Bar:
+    """A bordered fill bar cached for its current (value, maximum).
+
+    color is a fixed fill color or a function of the fill ratio.
+    """
+    def __init__(self, rect, color, background, border=(200, 200, 200), border_width=2):
+        self.rect = pygame.Rect(rect)
+        self.color = color
+        self.background = background
+        self.border = border
+        self.border_width = border_width
+        self._value = None
+        self._surface = None
+
+    def set(self, value, maximum):
+        if (value, maximum) != self._value:
+            self._value = (value, maximum)
+            self._surface = None
+
+    def _render(self):
+        value, maximum = self._value
+        ratio = value / maximum
+        color = self.color(ratio) if callable(self.color) else self.color
+        image = pygame.Surface(self.rect.size)
+        image.fill(self.background)
+        local = image.get_rect()
+        pygame.draw.rect(image, color, (0, 0, int(local.width * ratio), local.height))
+        pygame.draw.rect(image, self.border, local, self.border_width)
+        return image
+
+    def draw(self, surface):
+        """Blit the cached bar; returns the screen rect drawn to"""
+        if self._surface is None:
+            self._surface = self._render()
+        return surface.blit(self._surface, self.rect)
+
+
+class Button:
+    """A labelled button with one cached surface per hover state"""
+    def __init__(self, rect, text, font, color=(100, 100, 100), hover_color=(100, 150, 255),
+                 text_color=(255, 255, 255), border=(255, 255, 255)):
+        self.rect = pygame.Rect(rect)
+        self.text = text
+        self.font = font
+        self.colors = {False: color, True: hover_color}
+        self.text_color = text_color
+        self.border = border
+        self._surfaces = {}
+
+    def _render(self, hovered):
+        image = pygame.Surface(self.rect.size)
+        local = image.get_rect()
+        image.fill(self.colors[hovered])
+        pygame.draw.rect(image, self.border, local, 2)
+        text = render_text(self.font, self.text, self.text_color)
+        image.blit(text, (local.centerx - text.get_width() // 2,
+                          local.centery - text.get_height() // 2))
+        return image
+
+    def draw(self, surface, hovered=False):
+        """Blit the button in its hover state; returns the screen rect drawn to"""
+        image = self._surfaces.get(hovered)
+        if image is None:
+            image = self._surfaces[hovered] = self._render(hovered)
+        return surface.blit(image, self.rect)